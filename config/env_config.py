@@ -1,3 +1,5 @@
-BASE_URL = "https://staging.orderwithinfi.com/kiosk-shopping-api"
-REALM_ID = "dev-realm"
-APPZ_ID = "kiosk-self-ordering"
+import os
+
+BASE_URL = os.getenv("BASE_URL", "https://staging.orderwithinfi.com/kiosk-shopping-api")
+REALM_ID = os.getenv("REALM_ID", "dev-realm")
+APPZ_ID = os.getenv("APPZ_ID", "kiosk-self-ordering")
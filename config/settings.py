@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import Dict, Any
 
 class Settings:
@@ -9,9 +10,95 @@ class Settings:
     REALM_ID = os.getenv("REALM_ID", "dev-realm")
     APPZ_ID = os.getenv("APPZ_ID", "kiosk-self-ordering")
     
+    # 监控配置：逗号分隔，一个监控进程覆盖多个环境、realm和门店
+    MONITOR_BASE_URLS = [u.strip() for u in os.getenv("MONITOR_BASE_URLS", BASE_URL).split(",") if u.strip()]
+    MONITOR_REALM_IDS = [r.strip() for r in os.getenv("MONITOR_REALM_IDS", REALM_ID).split(",") if r.strip()]
+    MONITOR_LOCATION_IDS = [l.strip() for l in os.getenv("MONITOR_LOCATION_IDS", "5382410a-d2d7-4271-a29c-385a38ebbca9").split(",") if l.strip()]
+    MONITOR_PROBE_CONCURRENCY = int(os.getenv("MONITOR_PROBE_CONCURRENCY", "100"))
+    MONITOR_PER_HOST_LIMIT = int(os.getenv("MONITOR_PER_HOST_LIMIT", "20"))
+    MONITOR_PROBE_TIMEOUT = float(os.getenv("MONITOR_PROBE_TIMEOUT", "10"))
+    # 状态检查历史的环形缓冲区容量和报告统计周期；容量为0（默认）时按最短检查间隔
+    # （MONITOR_STATUS_INTERVAL 与 MONITOR_DEGRADED_MIN_INTERVAL 中较小者）计算，保证故障期间也能覆盖整个周期
+    MONITOR_HISTORY_SIZE = int(os.getenv("MONITOR_HISTORY_SIZE", "0"))
+    MONITOR_REPORT_PERIOD_HOURS = int(os.getenv("MONITOR_REPORT_PERIOD_HOURS", "24"))
+    # 监控任务调度（秒）：各任务在线程池中并发执行，每次触发随机延迟不超过间隔的 MONITOR_JITTER_RATIO
+    MONITOR_STATUS_INTERVAL = float(os.getenv("MONITOR_STATUS_INTERVAL", "15"))
+    # 状态检查的自适应间隔：健康时每连续 MONITOR_STATUS_HEALTHY_STREAK 次正常间隔翻倍，最多到 MONITOR_STATUS_MAX_INTERVAL；
+    # 异常时从 MONITOR_DEGRADED_MIN_INTERVAL 开始快速探测，指数退避到 MONITOR_DEGRADED_MAX_INTERVAL
+    MONITOR_STATUS_MAX_INTERVAL = float(os.getenv("MONITOR_STATUS_MAX_INTERVAL", "120"))
+    MONITOR_STATUS_HEALTHY_STREAK = int(os.getenv("MONITOR_STATUS_HEALTHY_STREAK", "4"))
+    MONITOR_DEGRADED_MIN_INTERVAL = float(os.getenv("MONITOR_DEGRADED_MIN_INTERVAL", "2"))
+    MONITOR_DEGRADED_MAX_INTERVAL = float(os.getenv("MONITOR_DEGRADED_MAX_INTERVAL", "30"))
+    MONITOR_FLEET_INTERVAL = float(os.getenv("MONITOR_FLEET_INTERVAL", "300"))
+    MONITOR_TEST_INTERVAL = float(os.getenv("MONITOR_TEST_INTERVAL", "3600"))
+    # 两次完整运行之间只重跑失败和不稳定测试的间隔，0 表示关闭
+    MONITOR_RERUN_INTERVAL = float(os.getenv("MONITOR_RERUN_INTERVAL", "300"))
+    # 端点探测发现端点可用状态变化，或延迟变化超过 MONITOR_LATENCY_CHANGE_RATIO 倍且至少
+    # MONITOR_LATENCY_CHANGE_MIN_MS 毫秒时，只运行请求这些端点的测试
+    MONITOR_IMPACT_TESTS = os.getenv("MONITOR_IMPACT_TESTS", "true").lower() == "true"
+    MONITOR_LATENCY_CHANGE_RATIO = float(os.getenv("MONITOR_LATENCY_CHANGE_RATIO", "2"))
+    MONITOR_LATENCY_CHANGE_MIN_MS = float(os.getenv("MONITOR_LATENCY_CHANGE_MIN_MS", "100"))
+    # 测试在常驻的预热pytest进程中运行（每次运行fork一个子进程），false 时每次启动 python -m pytest；
+    # 开启时监控中的测试串行运行，忽略 TEST_WORKERS
+    MONITOR_WARM_RUNNER = os.getenv("MONITOR_WARM_RUNNER", "true").lower() == "true"
+    MONITOR_REPORT_TIME = os.getenv("MONITOR_REPORT_TIME", "09:00")
+    MONITOR_JITTER_RATIO = float(os.getenv("MONITOR_JITTER_RATIO", "0.1"))
+    MONITOR_SCHEDULER_WORKERS = int(os.getenv("MONITOR_SCHEDULER_WORKERS", "4"))
+    # 监控进程的HTTP接口（状态页和 /metrics），端口为0时不启动
+    MONITOR_WEB_HOST = os.getenv("MONITOR_WEB_HOST", "0.0.0.0")
+    MONITOR_WEB_PORT = int(os.getenv("MONITOR_WEB_PORT", "8080"))
+    # 状态页自动刷新间隔（秒）；状态未变化时刷新只得到304
+    MONITOR_STATUS_PAGE_REFRESH = int(os.getenv("MONITOR_STATUS_PAGE_REFRESH", "10"))
+    # 存活检查 /healthz：调度线程心跳超过该秒数视为卡住；
+    # 就绪检查 /readyz：最近一次完成的API状态检查超过该秒数视为未就绪（与API是否可用无关）；
+    # 状态检查的当前间隔较长时阈值自动放宽到两个间隔（含随机延迟）加检查超时
+    MONITOR_HEALTH_MAX_HEARTBEAT_AGE = float(os.getenv("MONITOR_HEALTH_MAX_HEARTBEAT_AGE", "30"))
+    MONITOR_READY_MAX_PROBE_AGE = float(os.getenv("MONITOR_READY_MAX_PROBE_AGE", "300"))
+    
+    # 监控进程的持久化数据目录（容器中挂载为卷）；不能放在 reports 下，reports 由nginx对外提供
+    MONITOR_DATA_DIR = os.getenv("MONITOR_DATA_DIR", os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+    # 监控历史持久化：sqlite（默认，写入数据目录）、redis 或 none
+    HISTORY_BACKEND = os.getenv("HISTORY_BACKEND", "sqlite")
+    HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", os.path.join(MONITOR_DATA_DIR, "monitor_history.db"))
+    HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "90"))
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    
     # 测试配置
+    # 每个测试最近 TEST_OUTCOME_WINDOW 次运行结果的持久化文件，用于失败重跑
+    TEST_OUTCOMES_FILE = os.getenv("TEST_OUTCOMES_FILE", os.path.join(MONITOR_DATA_DIR, "test_outcomes.json"))
+    TEST_OUTCOME_WINDOW = int(os.getenv("TEST_OUTCOME_WINDOW", "5"))
+    # 测试收集缓存：源码未修改时 pytest --collect-only 直接读取；与 config.cache.mkdir 相同放在 .pytest_cache/d 下，
+    # 不放在nginx提供的reports目录
+    TEST_COLLECTION_CACHE = os.getenv("TEST_COLLECTION_CACHE", os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".pytest_cache", "d", "kiosk", "collection_cache.json"))
     TEST_TIMEOUT = int(os.getenv("TEST_TIMEOUT", "30"))
     TEST_RETRY_COUNT = int(os.getenv("TEST_RETRY_COUNT", "3"))
+    # 并行测试worker数量（pytest-xdist的 -n 参数），"0" 表示串行；监控开启 MONITOR_WARM_RUNNER 时不使用
+    TEST_WORKERS = os.getenv("TEST_WORKERS", "auto")
+    
+    # HTTP连接池配置
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    # HTTP录制回放：off（默认）、record（请求API并录制到卡带）、replay（只从卡带回放，不访问网络）
+    # 卡带不放在 reports 目录：reports 由nginx对外提供
+    HTTP_CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "off").lower()
+    HTTP_CASSETTE_PATH = os.getenv("HTTP_CASSETTE_PATH", os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "cassettes", "kiosk_api.db"))
+    
+    # API可用性缓存配置（秒），同一TTL窗口内所有线程和xdist worker共享一次探测结果
+    API_AVAILABILITY_TTL = int(os.getenv("API_AVAILABILITY_TTL", "60"))
+    API_AVAILABILITY_CACHE_DIR = os.getenv("API_AVAILABILITY_CACHE_DIR", tempfile.gettempdir())
+    
+    # 端点发现的总截止时间（秒），并发探测所有候选端点
+    ENDPOINT_DISCOVERY_DEADLINE = float(os.getenv("ENDPOINT_DISCOVERY_DEADLINE", "10"))
+    
+    # 测试账号登录token缓存：每个账号只登录一次，过期前 TOKEN_REFRESH_MARGIN 秒由后台线程刷新
+    TOKEN_CACHE_FILE = os.getenv("TOKEN_CACHE_FILE", os.path.join(tempfile.gettempdir(), "kiosk_api_tokens.json"))
+    TOKEN_DEFAULT_TTL = int(os.getenv("TOKEN_DEFAULT_TTL", "3600"))
+    TOKEN_REFRESH_MARGIN = int(os.getenv("TOKEN_REFRESH_MARGIN", "300"))
+    TOKEN_REFRESH_INTERVAL = int(os.getenv("TOKEN_REFRESH_INTERVAL", "60"))
+    # 登录失败后多久内不再重试（秒），避免触发认证限流
+    TOKEN_LOGIN_RETRY_AFTER = int(os.getenv("TOKEN_LOGIN_RETRY_AFTER", "60"))
     
     # 测试数据配置
     TEST_EMAILS = [
@@ -26,6 +113,10 @@ class Settings:
         "+13124029007"
     ]
     
+    # 测试账号的登录凭据
+    TEST_PASSWORD = os.getenv("TEST_PASSWORD", "123123")
+    TEST_VERIFICATION_CODE = os.getenv("TEST_VERIFICATION_CODE", "123456")
+    
     TEST_LOCATION_ID = "5382410a-d2d7-4271-a29c-385a38ebbca9"
     
     # 支付配置
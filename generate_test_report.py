@@ -3,10 +3,12 @@
 测试报告生成器 - 分析API状态和测试结果
 """
 
+import os
 import subprocess
 import sys
 from datetime import datetime
 from utils.api_validator import get_api_validator
+from utils.result_stream import ResultStreamReader, summarize_results
 
 def run_api_diagnosis():
     """运行API诊断"""
@@ -30,8 +32,10 @@ def run_api_diagnosis():
     else:
         print(f"📋 可用端点: {len(status['available_endpoints'])}")
         if status['available_endpoints']:
+            latencies = status.get('endpoint_latencies', {})
             for endpoint in status['available_endpoints']:
-                print(f"   - {endpoint}")
+                latency = latencies.get(endpoint)
+                print(f"   - {endpoint}" + (f" ({latency:.0f}ms)" if latency is not None else ""))
         else:
             print("   - 未找到可用的端点")
         
@@ -46,24 +50,45 @@ def run_tests_with_analysis():
     print("\n🧪 运行测试套件")
     print("=" * 60)
     
+    results_path = "test_results.jsonl"
     try:
-        # 运行测试并捕获输出
+        # 删除上一次的结果：pytest在打开结果文件之前崩溃时，不能把旧结果当作本次的结果
+        if os.path.exists(results_path):
+            os.remove(results_path)
+        
+        # pytest的输出直接打印到控制台，结果从结构化结果文件读取
         result = subprocess.run([
             sys.executable, "-m", "pytest", 
             "--tb=short", 
-            "-v",
-            "--disable-warnings"
-        ], capture_output=True, text=True, timeout=300)
+            "-q",
+            "--disable-warnings",
+            f"--results-jsonl={results_path}"
+        ], timeout=300)
         
-        print("📊 测试执行结果:")
-        print(result.stdout)
+        records = ResultStreamReader(results_path).poll()
+        if not records:
+            print(f"❌ pytest没有生成测试结果 (返回码 {result.returncode})")
+            return False
+        summary = summarize_results(records)
+        print("\n📊 测试执行结果:")
+        print(f"   总数: {summary['total_tests']}")
+        print(f"   ✅ 通过: {summary['passed']}")
+        print(f"   ❌ 失败: {summary['failed']}")
+        print(f"   💥 错误: {summary['errors']}")
+        print(f"   ⏭️  跳过: {summary['skipped']}")
+        if summary["duration_seconds"] is not None:
+            print(f"   ⏱️  耗时: {summary['duration_seconds']}秒")
         
-        if result.stderr:
-            print("⚠️  错误信息:")
-            print(result.stderr)
+        if summary["failures"]:
+            print("\n❌ 失败的测试:")
+            for failure in summary["failures"]:
+                endpoints = ", ".join(failure["endpoints"])
+                print(f"   - {failure['nodeid']}" + (f" [{endpoints}]" if endpoints else ""))
+                if failure["message"]:
+                    print(f"     {failure['message']}")
         
         return result.returncode == 0
-        
+    
     except subprocess.TimeoutExpired:
         print("⏰ 测试执行超时")
         return False
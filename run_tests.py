@@ -34,9 +34,9 @@ def run_pytest(tests_path: str = "tests",
     if verbose:
         cmd.append("-v")
     
-    # 添加并行运行
+    # 添加并行运行（pytest-xdist），同一模块目录的测试分到同一个worker
     if parallel:
-        cmd.extend(["-n", "auto"])
+        cmd.extend(["-n", "auto", "--dist", "loadgroup"])
     
     # 添加测试标记
     if markers:
@@ -36,8 +36,10 @@ def check_api_status():
     else:
         print(f"📋 可用端点: {len(status['available_endpoints'])}")
         if status['available_endpoints']:
+            latencies = status.get('endpoint_latencies', {})
             for endpoint in status['available_endpoints']:
-                print(f"   - {endpoint}")
+                latency = latencies.get(endpoint)
+                print(f"   - {endpoint}" + (f" ({latency:.0f}ms)" if latency is not None else ""))
         else:
             print("   - 未找到可用的端点")
         return True
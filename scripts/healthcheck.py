@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+容器健康检查 - 只依赖标准库，每次检查都是新的解释器，启动开销要尽量小
+
+开启监控接口时请求本地的 /readyz，由监控进程按调度心跳和最近一次状态检查时间回答；
+关闭监控接口（MONITOR_WEB_PORT=0）时没有内存状态可问，改为读取监控进程留下的状态检查时间：
+优先查SQLite历史中最近一次API状态检查（kind='api'），其次用共享可用性缓存的探测时间，
+超过 ready_max_probe_age() 秒视为不健康。
+两种方式都不访问staging，也不取决于API是否可用。健康时退出码为0，否则为1。
+
+    python scripts/healthcheck.py
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import time
+from typing import Optional
+
+from config.settings import settings
+from utils.api_validator import APIValidator, last_availability_check
+
+def readyz(port: int, timeout: float = 3) -> bool:
+    """请求本地监控接口的 /readyz，返回200视为健康"""
+    from urllib import error, request
+    
+    host = settings.MONITOR_WEB_HOST
+    if host in ("", "0.0.0.0", "::"):
+        host = "127.0.0.1"
+    try:
+        with request.urlopen(f"http://{host}:{port}/readyz", timeout=timeout) as response:
+            return response.status == 200
+    except (error.URLError, OSError, ValueError):
+        return False
+
+def ready_max_probe_age() -> float:
+    """
+    允许的状态检查间隔，与监控进程的 _ready_max_probe_age 规则相同
+    
+    外部看不到当前的自适应间隔，按可能的最长间隔计算。
+    """
+    interval = max(settings.MONITOR_STATUS_MAX_INTERVAL, settings.MONITOR_DEGRADED_MAX_INTERVAL)
+    return max(settings.MONITOR_READY_MAX_PROBE_AGE,
+               2 * interval * (1 + settings.MONITOR_JITTER_RATIO) + APIValidator.AVAILABILITY_TIMEOUT)
+
+def last_history_check(path: Optional[str] = None) -> Optional[float]:
+    """SQLite历史中最近一次API状态检查的时间戳，没有历史库或记录时返回None"""
+    import sqlite3
+    
+    path = path or settings.HISTORY_DB_PATH
+    if settings.HISTORY_BACKEND.lower() != "sqlite" or not os.path.exists(path):
+        return None
+    try:
+        # 只读打开，历史库不存在或打不开时不创建文件
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=2)
+        try:
+            row = conn.execute("SELECT MAX(timestamp) FROM probes WHERE kind = 'api'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return row[0] if row and row[0] is not None else None
+
+def main() -> int:
+    if settings.MONITOR_WEB_PORT:
+        return 0 if readyz(settings.MONITOR_WEB_PORT) else 1
+    last_check = last_history_check()
+    if last_check is None:
+        last_check = last_availability_check()
+    if last_check is None:
+        return 1
+    return 0 if time.time() - last_check <= ready_max_probe_age() else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
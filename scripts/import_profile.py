@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+入口脚本导入耗时分析
+用 python -X importtime 测量监控、健康检查等入口的启动开销，与 scripts/importtime_baseline.json 比较
+
+    python scripts/import_profile.py
+    python scripts/import_profile.py --entry healthcheck --top 30
+    python scripts/import_profile.py --update-baseline
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import argparse
+import json
+
+from utils.import_profile import ENTRY_POINTS, format_profile, load_baseline, profile_entry
+
+BASELINE_PATH = os.path.join(project_root, "scripts", "importtime_baseline.json")
+
+def main():
+    parser = argparse.ArgumentParser(description="入口脚本导入耗时分析")
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS), help="只测量指定入口（可重复）")
+    parser.add_argument("--repeat", type=int, default=5, help="每个入口运行次数，取最快的一次")
+    parser.add_argument("--top", type=int, default=15, help="列出累计耗时最多的顶层导入数量")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="基线文件")
+    parser.add_argument("--update-baseline", action="store_true", help="把本次结果写入基线文件")
+    args = parser.parse_args()
+    
+    baseline = load_baseline(args.baseline) or {}
+    results = {}
+    for name in args.entry or ENTRY_POINTS:
+        results[name] = profile_entry(ENTRY_POINTS[name], project_root, args.repeat, args.top)
+        print("\n".join(format_profile(name, results[name], baseline.get("entries", {}).get(name))))
+        print()
+    
+    if args.update_baseline:
+        entries = {**baseline.get("entries", {}), **results}
+        data = {"python": sys.version.split()[0], "entries": entries}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"基线已更新: {args.baseline}")
+
+if __name__ == "__main__":
+    main()
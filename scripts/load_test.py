@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Kiosk API 压测
+复用测试用例里的下单、支付、登录请求数据，按恒定速率或爬坡曲线施压，
+输出每个端点的吞吐、错误率和延迟百分位
+
+    python scripts/load_test.py --rps 50 --duration 60
+    python scripts/load_test.py --profile ramp --start-rps 10 --end-rps 300 --duration 300 --kiosks 500
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import argparse
+import json
+from datetime import datetime
+
+from config.env_config import BASE_URL
+from utils.load_generator import LoadGenerator, constant_profile, make_scenario, ramp_profile
+from utils.token_manager import get_auth_headers
+from tests.login.test_login_email import LOGIN_EMAIL_ENDPOINT, LOGIN_EMAIL_PAYLOAD
+from tests.order.test_create_order import CREATE_ORDER_ENDPOINT, CREATE_ORDER_PAYLOAD
+from tests.payment.test_payment_methods import PROCESS_PAYMENT_ENDPOINT, PROCESS_PAYMENT_PAYLOAD
+
+# 午高峰的大致流量构成：下单 > 支付 > 登录
+DEFAULT_SCENARIOS = [
+    make_scenario("create_order", "POST", CREATE_ORDER_ENDPOINT, CREATE_ORDER_PAYLOAD, weight=3),
+    make_scenario("process_payment", "POST", PROCESS_PAYMENT_ENDPOINT, PROCESS_PAYMENT_PAYLOAD, weight=2),
+    make_scenario("login_email", "POST", LOGIN_EMAIL_ENDPOINT, LOGIN_EMAIL_PAYLOAD, weight=1)
+]
+
+def print_report(report):
+    """打印压测结果"""
+    total = report["total"]
+    print(f"\n压测完成: {report['duration_seconds']}s, {report['kiosks']} 台虚拟kiosk")
+    print(f"总计: {total['requests']} 个请求, {total['throughput_rps']} req/s, "
+          f"错误率 {total['error_rate'] * 100:.2f}%, p99 {total['latency_ms']['p99']}ms")
+    
+    print(f"\n{'端点':<36} {'请求数':>8} {'req/s':>8} {'错误率':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for name, stats in report["endpoints"].items():
+        latency = stats["latency_ms"]
+        label = f"{stats['method']} {stats['endpoint']}"
+        print(f"{label:<36} {stats['requests']:>8} {stats['throughput_rps']:>8} "
+              f"{stats['error_rate'] * 100:>7.2f}% {latency['p50']:>9} {latency['p90']:>9} "
+              f"{latency['p99']:>9} {latency['max']:>9}")
+    
+    print(f"\n{'时间(s)':>8} {'目标req/s':>10} {'实际req/s':>10} {'错误率':>8} {'p99(ms)':>10}")
+    for window in report["timeline"]:
+        print(f"{window['start_seconds']:>8} {window['target_rps']:>10} {window['throughput_rps']:>10} "
+              f"{window['error_rate'] * 100:>7.2f}% {window['p99_ms']:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiosk API 压测")
+    parser.add_argument("--base-url", default=BASE_URL, help="被测API地址")
+    parser.add_argument("--profile", choices=["constant", "ramp"], default="constant", help="速率曲线")
+    parser.add_argument("--rps", type=float, default=20, help="恒定速率（constant）")
+    parser.add_argument("--start-rps", type=float, default=5, help="起始速率（ramp）")
+    parser.add_argument("--end-rps", type=float, default=200, help="结束速率（ramp）")
+    parser.add_argument("--duration", type=float, default=60, help="压测时长（秒）")
+    parser.add_argument("--kiosks", type=int, default=100, help="虚拟kiosk数量，即最大并发请求数")
+    parser.add_argument("--timeout", type=float, default=10, help="单个请求超时（秒）")
+    parser.add_argument("--poisson", action="store_true", help="按泊松过程随机到达，而非均匀间隔")
+    parser.add_argument("--window", type=float, default=5, help="时间线统计窗口（秒）")
+    parser.add_argument("--scenario", action="append", choices=[s["name"] for s in DEFAULT_SCENARIOS],
+                        help="只压测指定场景，可重复")
+    parser.add_argument("--seed", type=int, default=None, help="随机数种子，便于复现")
+    parser.add_argument("--output", help="把结果保存为JSON文件")
+    args = parser.parse_args()
+    
+    scenarios = [s for s in DEFAULT_SCENARIOS if not args.scenario or s["name"] in args.scenario]
+    if args.profile == "ramp":
+        profile = ramp_profile(args.start_rps, args.end_rps, args.duration)
+        description = f"{args.start_rps} -> {args.end_rps} req/s"
+    else:
+        profile = constant_profile(args.rps)
+        description = f"{args.rps} req/s"
+    
+    print(f"[{datetime.now()}] 开始压测 {args.base_url}: {description}, {args.duration}s, "
+          f"场景 {', '.join(s['name'] for s in scenarios)}")
+    
+    generator = LoadGenerator(
+        args.base_url,
+        scenarios,
+        profile,
+        args.duration,
+        kiosks=args.kiosks,
+        headers=get_auth_headers(),
+        timeout=args.timeout,
+        poisson=args.poisson,
+        window=args.window,
+        seed=args.seed
+    )
+    report = generator.run()
+    print_report(report)
+    
+    if args.output:
+        report["timestamp"] = datetime.now().isoformat()
+        report["base_url"] = args.base_url
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n结果已保存到: {args.output}")
+    
+    # 错误率超过1%视为未达标，便于在CI中使用
+    return 0 if report["total"]["error_rate"] <= 0.01 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
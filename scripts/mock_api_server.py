@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+本地Kiosk API模拟服务
+用于离线、确定性的测试运行以及压测/基准测试
+
+    python scripts/mock_api_server.py --port 8081 --latency-ms 20 --error-rate 0.01
+    BASE_URL=http://127.0.0.1:8081 python -m pytest
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import argparse
+
+from utils.mock_server import MockConfig, create_mock_app
+
+def main():
+    parser = argparse.ArgumentParser(description="Kiosk API 本地模拟服务")
+    parser.add_argument("--host", default=os.getenv("MOCK_HOST", "127.0.0.1"), help="监听地址")
+    parser.add_argument("--port", type=int, default=int(os.getenv("MOCK_PORT", "8081")), help="监听端口")
+    parser.add_argument("--base-path", default=os.getenv("MOCK_BASE_PATH", ""), help="路由前缀，例如 /kiosk-shopping-api")
+    parser.add_argument("--latency-ms", type=float, default=float(os.getenv("MOCK_LATENCY_MS", "0")), help="每个请求的固定延迟（毫秒）")
+    parser.add_argument("--jitter-ms", type=float, default=float(os.getenv("MOCK_JITTER_MS", "0")), help="额外的随机延迟上限（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=float(os.getenv("MOCK_ERROR_RATE", "0")), help="随机返回错误的比例 (0-1)")
+    parser.add_argument("--error-status", type=int, default=int(os.getenv("MOCK_ERROR_STATUS", "503")), help="注入错误时的状态码")
+    parser.add_argument("--seed", type=int, default=None, help="随机数种子，便于复现")
+    args = parser.parse_args()
+    
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed
+    )
+    app = create_mock_app(config, base_path=args.base_path)
+    
+    print(f"🧪 模拟Kiosk API: http://{args.host}:{args.port}{args.base_path}")
+    print(f"   延迟: {args.latency_ms}ms (+0~{args.jitter_ms}ms), 错误率: {args.error_rate:.1%}")
+    print(f"💡 运行测试: BASE_URL=http://{args.host}:{args.port}{args.base_path} python -m pytest")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+if __name__ == "__main__":
+    main()
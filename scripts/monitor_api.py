@@ -2,6 +2,9 @@
 """
 API自动监控脚本
 实时监控API状态，自动运行测试，发送通知
+
+只在用到时才导入的模块（见 scripts/import_profile.py）：端点探测（httpx）、监控接口（Flask）、
+收集缓存（pytest）、邮件通知（smtplib）和测试子进程（subprocess）。
 """
 
 import sys
@@ -12,68 +15,409 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 import time
-import schedule
-import subprocess
-import smtplib
-import requests
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
 from datetime import datetime
+from functools import cached_property
 import json
 
 from utils.api_validator import is_api_available, get_api_validator
+from config.settings import settings
+from utils.latency_histogram import latency_registry
+from utils.probe_history import ProbeHistory, capacity_for
+from utils.result_stream import ResultStreamReader, collapse_results, summarize_results
+from utils.history_store import create_history_store, probe_row
+from utils.scheduler import AdaptiveInterval, Scheduler
+from utils.metrics import monitor_metrics
+from utils.status_page import StatusCache
+from utils.outcome_history import OutcomeHistory
+from utils.endpoint_index import EndpointIndex, changed_endpoints, down_endpoints, endpoint_health
+from utils.warm_runner import WarmTestRunner
 
 class APIMonitor:
     def __init__(self):
         self.api_validator = get_api_validator()
         self.last_status = None
         self.notification_sent = False
-        
+        self.last_fleet_failures = None
+        self.last_fleet_summary = None
+        self.history = ProbeHistory(settings.MONITOR_HISTORY_SIZE or capacity_for(
+            settings.MONITOR_REPORT_PERIOD_HOURS * 3600,
+            min(settings.MONITOR_STATUS_INTERVAL, settings.MONITOR_DEGRADED_MIN_INTERVAL)))
+        self.last_test_results = None
+        # 最近一次部分运行的结果：rerun（失败重跑）、impact（端点变化触发）
+        self.last_partial_runs = {}
+        self.outcomes = OutcomeHistory()
+        # 完整运行和部分运行共用结果文件，不能同时运行
+        self._test_lock = threading.Lock()
+        self.test_runner = WarmTestRunner(project_root, enabled=settings.MONITOR_WARM_RUNNER)
+        # 端点-测试索引和最近一轮端点探测的健康状态
+        self.endpoint_index = EndpointIndex.scan(os.path.join(project_root, "tests"), project_root)
+        self.endpoint_health = None
+        self.down_endpoints = []
+        self.impact_job = None
+        self._pending_impact = set()
+        self._pending_lock = threading.Lock()
+        self.store = create_history_store()
+        # 状态快照中包含任务和测试运行器的状态，任务开始和结束时都要让缓存失效
+        self.scheduler = Scheduler(settings.MONITOR_SCHEDULER_WORKERS, on_change=lambda: self.status_cache.invalidate())
+        self.status_job = None
+        self.status_interval = AdaptiveInterval(
+            settings.MONITOR_STATUS_INTERVAL, settings.MONITOR_STATUS_MAX_INTERVAL,
+            settings.MONITOR_DEGRADED_MIN_INTERVAL, settings.MONITOR_DEGRADED_MAX_INTERVAL,
+            settings.MONITOR_STATUS_HEALTHY_STREAK
+        )
+        self.metrics = monitor_metrics
+        self.metrics.add_collector(self._scheduler_metric_families)
+        self.web_server = None
+        self.status_cache = StatusCache(self.status_snapshot, settings.MONITOR_STATUS_PAGE_REFRESH)
+        self._restore_history()
+    
+    @cached_property
+    def probe_engine(self):
+        """端点探测引擎，第一次探测时才导入httpx"""
+        from utils.async_probe import AsyncProbeEngine
+        return AsyncProbeEngine()
+    
+    def _restore_history(self):
+        """从持久化存储恢复报告周期内的状态检查，重启后可用率统计不丢失"""
+        if self.store is None:
+            return
+        try:
+            since = time.time() - settings.MONITOR_REPORT_PERIOD_HOURS * 3600
+            for row in self.store.query_probes(since=since, kind="api")[-self.history.capacity:]:
+                self.history.record(bool(row["ok"]), row["latency_ms"], timestamp=row["timestamp"])
+        except Exception as e:
+            print(f"[{datetime.now()}] 恢复监控历史失败: {e}")
+    
+    def _store(self, method, *args):
+        """写入历史存储，存储出错不影响监控"""
+        if self.store is None:
+            return
+        try:
+            getattr(self.store, method)(*args)
+        except Exception as e:
+            print(f"[{datetime.now()}] 写入监控历史失败: {e}")
+    
     def check_api_status(self):
         """检查API状态"""
         try:
-            status = self.api_validator.get_api_status()
-            current_status = status['is_available']
+            # 每次都重新探测（get_api_status只在首次调用时探测）
+            current_status = self.api_validator.check_api_availability()
+            self.history.record(current_status, self.api_validator.last_latency_ms)
+            self._adapt_status_interval(current_status)
+            self._record_probe_metrics("api", {
+                "base_url": self.api_validator.base_url,
+                "realm_id": settings.REALM_ID,
+                "location_id": "",
+                "endpoint": "/"
+            }, current_status, self.api_validator.last_latency_ms)
+            self.metrics.set("kiosk_api_up", 1 if current_status else 0, {"base_url": self.api_validator.base_url})
+            self._store("record_probes", [probe_row({
+                "base_url": self.api_validator.base_url,
+                "realm_id": settings.REALM_ID,
+                "endpoint": "/",
+                "method": "GET",
+                "status_code": self.api_validator.last_status_code,
+                "ok": current_status,
+                "latency_ms": self.api_validator.last_latency_ms,
+                "error": "" if current_status else self.api_validator.error_message
+            }, kind="api")])
             
             print(f"[{datetime.now()}] API状态: {'✅ 可用' if current_status else '❌ 不可用'}")
             
-            # 状态变化时发送通知
+            # 状态变化时发送通知，附带切换的精确时间和上一状态持续时长
             if self.last_status is not None and self.last_status != current_status:
-                self.send_notification(f"API状态变化: {'可用' if current_status else '不可用'}")
+                transition = self.status_interval.transitions[-1]
+                self.metrics.inc("kiosk_api_state_transitions_total", {"state": transition["state"]})
+                self.send_notification(
+                    f"API状态变化: {'可用' if current_status else '不可用'} "
+                    f"(于 {transition['timestamp']}，此前持续 {transition['previous_state_seconds']:.0f} 秒)"
+                )
                 self.notification_sent = True
             
             self.last_status = current_status
+            self.status_cache.invalidate()
             return current_status
-            
+        
         except Exception as e:
             print(f"[{datetime.now()}] 检查API状态时出错: {e}")
             return False
     
-    def run_tests(self):
-        """运行测试套件"""
+    def _adapt_status_interval(self, healthy):
+        """按本次检查结果调整状态检查的间隔：健康时逐步放慢，异常时快速探测"""
+        previous = self.status_interval.interval
+        interval = self.status_interval.update(healthy)
+        self.metrics.set("kiosk_status_check_interval_seconds", interval)
+        if self.status_job is not None and interval != previous:
+            self.scheduler.reschedule(self.status_job, interval, jitter=interval * settings.MONITOR_JITTER_RATIO)
+            print(f"[{datetime.now()}] ⏱️ 状态检查间隔调整为 {interval:g} 秒")
+    
+    def _record_probe_metrics(self, kind, target, ok, latency_ms):
+        """累加一次探测的次数和耗时指标"""
+        labels = {
+            "kind": kind,
+            "base_url": target["base_url"],
+            "realm_id": target["realm_id"],
+            "location_id": target["location_id"] or "",
+            "endpoint": target["endpoint"]
+        }
+        self.metrics.inc("kiosk_probe_total", {**labels, "result": "ok" if ok else "fail"})
+        if latency_ms is not None:
+            self.metrics.observe("kiosk_probe_duration_seconds", latency_ms / 1000, labels)
+    
+    def _scheduler_metric_families(self):
+        """导出时从调度器读取各任务的运行次数、跳过次数和失败次数"""
+        jobs = self.scheduler.status()
+        return [
+            (f"kiosk_scheduler_job_{field}", kind, help_text,
+             [("", {"job": job["name"]}, float(job[key])) for job in jobs])
+            for field, key, kind, help_text in (
+                ("runs_total", "runs", "counter", "定时任务完成的次数"),
+                ("skipped_total", "skipped", "counter", "因上一次尚未结束而跳过的次数"),
+                ("failures_total", "failures", "counter", "定时任务执行出错的次数"),
+                ("running", "running", "gauge", "定时任务是否正在执行 (1/0)")
+            )
+        ]
+    
+    def check_fleet_status(self):
+        """并发探测所有环境、realm和门店的端点"""
+        from utils.async_probe import build_probe_targets, summarize_probe_results
+        
+        try:
+            targets = build_probe_targets()
+            start = time.perf_counter()
+            results = self.probe_engine.run(targets)
+            duration = time.perf_counter() - start
+            summary = summarize_probe_results(results)
+            self._store("record_probes", [probe_row(r) for r in results])
+            for r in results:
+                self._record_probe_metrics("fleet", r, r["ok"], r["latency_ms"])
+            self.metrics.observe("kiosk_fleet_probe_run_seconds", duration)
+            
+            print(f"[{datetime.now()}] 端点探测: {summary['ok']}/{summary['total']} 正常, 耗时 {duration:.2f}秒")
+            for name, group in summary["by_realm"].items():
+                print(f"   - {name}: {group['ok']}/{group['total']}")
+            
+            # 失败端点集合变化时发送通知
+            failures = sorted(
+                f"{r['method']} {r['base_url']}{r['endpoint']} [{r['realm_id']}]"
+                + (f" location={r['location_id']}" if r['location_id'] else "")
+                for r in summary["failed"]
+            )
+            if self.last_fleet_failures is not None and failures != self.last_fleet_failures:
+                detail = "\n".join(failures) if failures else "全部恢复正常"
+                self.send_notification(f"端点探测结果变化 ({len(failures)} 个失败):\n{detail}")
+            self.last_fleet_failures = failures
+            self.last_fleet_summary = {**summary, "finished_at": datetime.now().isoformat()}
+            self._update_endpoint_health(results)
+            self.status_cache.invalidate()
+            return results
+        
+        except Exception as e:
+            print(f"[{datetime.now()}] 端点探测时出错: {e}")
+            return []
+    
+    def _update_endpoint_health(self, results):
+        """
+        根据一轮端点探测更新测试目标环境中各端点的健康状态
+        
+        可用状态或延迟明显变化的端点，把请求它们的测试加入待运行列表并立即触发运行。
+        """
+        health = endpoint_health(results, self.api_validator.base_url)
+        previous = self.endpoint_health
+        self.endpoint_health = health
+        self.down_endpoints = down_endpoints(health)
+        if previous is None or not settings.MONITOR_IMPACT_TESTS:
+            return
+        
+        changed = changed_endpoints(previous, health, settings.MONITOR_LATENCY_CHANGE_RATIO,
+                                    settings.MONITOR_LATENCY_CHANGE_MIN_MS)
+        nodeids = self.endpoint_index.tests_for(changed)
+        if not nodeids:
+            return
+        print(f"[{datetime.now()}] 🎯 端点变化: {', '.join(changed)}，{len(nodeids)} 个相关测试待运行")
+        with self._pending_lock:
+            self._pending_impact.update(nodeids)
+        if self.impact_job is not None:
+            self.scheduler.trigger(self.impact_job)
+    
+    def run_tests(self, nodeids=None, mode=None):
+        """
+        运行测试套件，边运行边读取结构化结果
+        
+        nodeids 不为空时只运行这些测试（mode 默认为 rerun）；完整运行正在进行时跳过部分运行，
+        完整运行则等待部分运行结束。已知不可用端点的测试在收集阶段直接跳过。
+        """
+        mode = mode or ("rerun" if nodeids else "full")
+        if not self._test_lock.acquire(blocking=mode == "full"):
+            print(f"[{datetime.now()}] 完整测试正在运行，跳过本次{'失败重跑' if mode == 'rerun' else '相关测试运行'}")
+            return
+        try:
+            self._run_tests(nodeids, mode)
+        finally:
+            self._test_lock.release()
+    
+    def _existing_tests(self, nodeids):
+        """
+        测试已删除或改名时pytest会拒绝整次运行，这些测试留给下一次完整运行清理
+        
+        收集缓存有效时按缓存中的nodeid判断，否则只检查测试文件是否存在。
+        """
+        from utils.collection_cache import collected_nodeids
+        
+        collected = collected_nodeids(project_root)
+        if collected is not None:
+            return [nodeid for nodeid in nodeids if nodeid in collected]
+        return [nodeid for nodeid in nodeids
+                if os.path.exists(os.path.join(project_root, nodeid.split("::", 1)[0]))]
+    
+    def rerun_failed_tests(self):
+        """只重跑上次失败和最近不稳定的测试，没有需要重跑的测试时什么也不做"""
+        nodeids = self._existing_tests(self.outcomes.rerun_candidates())
+        if nodeids:
+            self.run_tests(nodeids, "rerun")
+    
+    def run_impacted_tests(self):
+        """运行端点探测发现变化的端点相关的测试，没有待运行的测试时什么也不做"""
+        with self._pending_lock:
+            nodeids = sorted(self._pending_impact)
+            self._pending_impact.clear()
+        nodeids = self._existing_tests(nodeids)
+        if nodeids:
+            self.run_tests(nodeids, "impact")
+    
+    def _pytest_args(self, nodeids, mode, results_path):
+        """
+        一次测试运行的pytest参数（不含 python -m pytest）
+        
+        部分运行单独生成HTML报告（test_report_rerun.html 等），不覆盖完整运行的报告，也不写入Allure结果；
+        tests/utils 下的单元测试不属于API测试，不计入结果和通知。
+        常驻运行器开启时忽略 TEST_WORKERS 串行运行：xdist的worker是新启动的解释器，
+        会重新导入pytest、插件和所有测试模块，预热和fork省下的开销全部浪费。
+        """
+        partial = mode != "full"
+        cmd = [
+            f'--html=test_report_{mode}.html' if partial else '--html=test_report.html',
+            '--self-contained-html',
+            f'--results-jsonl={results_path}',
+            '-m', 'not unit'
+        ]
+        if not partial:
+            cmd.append('--alluredir=allure-results')
+        if self.down_endpoints:
+            cmd.append(f"--down-endpoints={','.join(self.down_endpoints)}")
+        if settings.TEST_WORKERS != "0" and not self.test_runner.enabled:
+            cmd.extend(['-n', settings.TEST_WORKERS, '--dist', 'loadgroup'])
+        if partial:
+            cmd.extend(nodeids)
+        return cmd
+    
+    def _run_tests(self, nodeids, mode):
+        import subprocess
+        
+        partial = mode != "full"
         try:
-            print(f"[{datetime.now()}] 开始运行API测试...")
-            
-            # 运行测试并生成报告
-            result = subprocess.run([
-                'python', '-m', 'pytest',
-                '--html=test_report.html',
-                '--self-contained-html',
-                '--alluredir=allure-results',
-                '-v'
-            ], capture_output=True, text=True, cwd=project_root)
-            
-            if result.returncode == 0:
-                print(f"[{datetime.now()}] ✅ 所有测试通过")
-                self.send_notification("✅ API测试全部通过")
+            if mode == "rerun":
+                print(f"[{datetime.now()}] 开始重跑 {len(nodeids)} 个失败或不稳定的测试...")
+            elif mode == "impact":
+                print(f"[{datetime.now()}] 开始运行 {len(nodeids)} 个端点变化相关的测试...")
             else:
-                print(f"[{datetime.now()}] ❌ 测试失败")
-                self.send_notification(f"❌ API测试失败\n{result.stdout}")
-                
+                print(f"[{datetime.now()}] 开始运行API测试...")
+            
+            results_path = os.path.join(project_root, "test_results.jsonl")
+            log_path = os.path.join(project_root, "test_output.log")
+            # 删除上一次的结果，避免在pytest重新创建文件之前读到旧数据
+            if os.path.exists(results_path):
+                os.remove(results_path)
+            
+            # 运行测试并生成报告；控制台输出写入日志文件，不在内存中缓冲
+            cmd = self._pytest_args(nodeids, mode, results_path)
+            previously_failing = set(self.outcomes.failing())
+            
+            reader = ResultStreamReader(results_path)
+            records = []
+            start = time.perf_counter()
+            process = self.test_runner.popen(cmd, log_path)
+            while True:
+                try:
+                    process.wait(timeout=1)
+                    break
+                except subprocess.TimeoutExpired:
+                    records.extend(self._consume_test_results(reader.poll()))
+            records.extend(self._consume_test_results(reader.poll()))
+            self._store("record_test_results", records)
+            self.outcomes.update(records, full_run=not partial, selected=nodeids)
+            if not partial:
+                self.endpoint_index.refresh(os.path.join(project_root, "tests"), project_root)
+            self.endpoint_index.observe(records)
+            
+            summary = summarize_results(records)
+            summary["mode"] = mode
+            summary["finished_at"] = datetime.now().isoformat()
+            if partial:
+                self.last_partial_runs[mode] = summary
+            else:
+                self.last_test_results = summary
+            self.status_cache.invalidate()
+            self._record_test_metrics(summary, process.returncode == 0, time.perf_counter() - start, mode)
+            counts = f"{summary['passed']} 通过, {summary['failed']} 失败, {summary['errors']} 错误, {summary['skipped']} 跳过"
+            
+            if partial:
+                self._notify_partial_run(mode, summary, collapse_results(records), previously_failing, counts)
+            elif process.returncode == 0:
+                print(f"[{datetime.now()}] ✅ 所有测试通过 ({counts})")
+                self.send_notification(f"✅ API测试全部通过 ({counts})")
+            else:
+                print(f"[{datetime.now()}] ❌ 测试失败 ({counts})")
+                failures = "\n".join(
+                    f"- {f['nodeid']} [{', '.join(f['endpoints'])}] {f['message']}"
+                    for f in summary["failures"][:20]
+                )
+                if len(summary["failures"]) > 20:
+                    failures += f"\n... 共 {len(summary['failures'])} 个失败"
+                if not summary["finished"]:
+                    failures += f"\n测试进程异常退出 (返回码 {process.returncode})，详见 {log_path}"
+                self.send_notification(f"❌ API测试失败 ({counts})\n{failures}")
+        
         except Exception as e:
             print(f"[{datetime.now()}] 运行测试时出错: {e}")
             self.send_notification(f"❌ 运行测试时出错: {e}")
     
+    def _notify_partial_run(self, mode, summary, results, previously_failing, counts):
+        """部分运行只通知恢复的和新失败的测试，仍然失败的测试已在之前的运行中通知过"""
+        recovered = sorted(nodeid for nodeid in previously_failing
+                           if results.get(nodeid, {}).get("outcome") == "passed")
+        new_failures = [f for f in summary["failures"] if f["nodeid"] not in previously_failing]
+        title = "失败重跑" if mode == "rerun" else "端点变化相关测试"
+        print(f"[{datetime.now()}] 🔁 {title}完成 ({counts})")
+        
+        lines = []
+        if recovered:
+            lines.append(f"✅ {len(recovered)} 个测试已恢复:")
+            lines.extend(f"- {nodeid}" for nodeid in recovered[:20])
+        if new_failures:
+            lines.append(f"❌ {len(new_failures)} 个测试新失败:")
+            lines.extend(f"- {f['nodeid']} [{', '.join(f['endpoints'])}] {f['message']}" for f in new_failures[:20])
+        if lines:
+            self.send_notification(f"{title} ({counts})\n" + "\n".join(lines))
+    
+    def _record_test_metrics(self, summary, passed, duration, mode):
+        """累加测试结果和运行耗时指标，按完整运行(full)、失败重跑(rerun)和端点变化触发(impact)区分"""
+        for outcome in ("passed", "failed", "errors", "skipped", "xfailed", "xpassed"):
+            self.metrics.inc("kiosk_test_results_total", {"mode": mode, "outcome": outcome}, summary[outcome])
+            self.metrics.set("kiosk_test_last_run", summary[outcome], {"mode": mode, "outcome": outcome})
+        self.metrics.inc("kiosk_test_runs_total", {"mode": mode, "result": "passed" if passed else "failed"})
+        self.metrics.observe("kiosk_test_run_duration_seconds", duration, {"mode": mode})
+        self.metrics.set("kiosk_test_last_run_timestamp_seconds", time.time(), {"mode": mode})
+    
+    def _consume_test_results(self, records):
+        """处理新读到的测试结果，失败的测试即时输出"""
+        for record in records:
+            if record.get("event") == "test" and record["outcome"] in ("failed", "error"):
+                endpoints = ", ".join(record.get("endpoints", []))
+                print(f"[{datetime.now()}] ❌ {record['nodeid']} [{endpoints}] {record.get('message', '')}")
+        return records
+    
     def send_notification(self, message):
         """发送通知"""
         try:
@@ -91,12 +435,16 @@ class APIMonitor:
             # self.send_wechat_notification(message)
             
             print(f"[{datetime.now()}] 📧 通知已发送: {message}")
-            
+        
         except Exception as e:
             print(f"[{datetime.now()}] 发送通知失败: {e}")
     
     def send_email_notification(self, message):
         """发送邮件通知"""
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
         # 配置邮件设置
         smtp_server = "smtp.gmail.com"
         smtp_port = 587
@@ -126,23 +474,143 @@ class APIMonitor:
         server.send_message(msg)
         server.quit()
     
+    def _test_results_summary(self):
+        """最近一次测试运行的统计，尚未运行过测试时为None"""
+        if self.last_test_results is None:
+            return None
+        return {key: value for key, value in self.last_test_results.items() if key != "failures"}
+    
+    def _history_summary(self, since):
+        """报告周期内按小时降采样的可用率和延迟，以及失败过的测试；没有历史存储时为None"""
+        if self.store is None:
+            return None
+        try:
+            failed_tests = {}
+            for row in self.store.query_test_results(since=since):
+                if row["outcome"] in ("failed", "error"):
+                    failed_tests[row["nodeid"]] = failed_tests.get(row["nodeid"], 0) + 1
+            return {
+                "api_hourly": self.store.downsample(since, kind="api"),
+                "fleet_hourly": self.store.downsample(since, kind="fleet"),
+                "failed_tests": failed_tests
+            }
+        except Exception as e:
+            print(f"[{datetime.now()}] 查询监控历史失败: {e}")
+            return None
+    
+    def prune_history(self):
+        """删除超过保留期的历史记录"""
+        if self.store is None:
+            return
+        try:
+            deleted = self.store.prune(time.time() - settings.HISTORY_RETENTION_DAYS * 86400)
+            print(f"[{datetime.now()}] 🧹 已清理 {deleted} 条过期监控历史")
+        except Exception as e:
+            print(f"[{datetime.now()}] 清理监控历史失败: {e}")
+    
+    def health_status(self):
+        """
+        存活和就绪状态，供 /healthz 和 /readyz 使用
+        
+        只读取调度线程心跳和最近一次状态检查的完成时间，不发起探测，也不取决于API是否可用：
+        staging变慢或不可用时监控进程本身仍然健康。
+        """
+        heartbeat_age = self.scheduler.heartbeat_age()
+        live = heartbeat_age is not None and heartbeat_age <= settings.MONITOR_HEALTH_MAX_HEARTBEAT_AGE
+        last_check = self.status_job.last_finished if self.status_job is not None else None
+        check_age = time.time() - last_check if last_check is not None else None
+        ready = live and check_age is not None and check_age <= self._ready_max_probe_age()
+        return {
+            "live": live,
+            "ready": ready,
+            "scheduler_heartbeat_age_seconds": round(heartbeat_age, 1) if heartbeat_age is not None else None,
+            "last_status_check": datetime.fromtimestamp(last_check).isoformat() if last_check is not None else None,
+            "last_status_check_age_seconds": round(check_age, 1) if check_age is not None else None,
+            "ready_max_probe_age_seconds": round(self._ready_max_probe_age(), 1),
+            "api_available": self.last_status
+        }
+    
+    def _ready_max_probe_age(self):
+        """
+        就绪检查允许的状态检查间隔：至少 MONITOR_READY_MAX_PROBE_AGE 秒
+        
+        状态检查的间隔是自适应的，调大 MONITOR_STATUS_MAX_INTERVAL 或 MONITOR_DEGRADED_MAX_INTERVAL 后
+        两次检查之间可能超过固定阈值；按当前间隔（含随机延迟）放宽到允许错过一次检查，再加上检查本身的超时。
+        """
+        interval = self.status_interval.interval * (1 + settings.MONITOR_JITTER_RATIO)
+        return max(settings.MONITOR_READY_MAX_PROBE_AGE, 2 * interval + self.api_validator.AVAILABILITY_TIMEOUT)
+    
+    def status_snapshot(self):
+        """当前监控状态，只读取内存中的聚合数据，供状态页和 /api/status 使用"""
+        now = time.time()
+        probing = self.status_interval.status()
+        fleet = self.last_fleet_summary
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "api": {
+                "base_url": self.api_validator.base_url,
+                "available": self.last_status,
+                "last_latency_ms": round(self.api_validator.last_latency_ms, 1) if self.api_validator.last_latency_ms is not None else None,
+                "interval_seconds": probing["interval_seconds"],
+                "since": probing["since"],
+                "transitions": probing["transitions"][-20:]
+            },
+            "availability": {
+                "1h": self.history.stats(since=now - 3600, until=now),
+                f"{settings.MONITOR_REPORT_PERIOD_HOURS}h": self.history.stats(
+                    since=now - settings.MONITOR_REPORT_PERIOD_HOURS * 3600, until=now)
+            },
+            "fleet": {
+                "total": fleet["total"],
+                "ok": fleet["ok"],
+                "by_realm": fleet["by_realm"],
+                "failed": [
+                    {key: r[key] for key in ("method", "base_url", "endpoint", "realm_id", "location_id", "status_code", "error")}
+                    for r in fleet["failed"]
+                ],
+                "finished_at": fleet["finished_at"]
+            } if fleet else None,
+            "tests": {**self.last_test_results, "failures": self.last_test_results["failures"][:50]} if self.last_test_results else None,
+            "partial_runs": {
+                mode: {key: value for key, value in summary.items() if key != "failures"}
+                for mode, summary in self.last_partial_runs.items()
+            },
+            "flaky_tests": self.outcomes.flaky(),
+            "down_endpoints": self.down_endpoints,
+            "jobs": self.scheduler.status(),
+            "test_runner": self.test_runner.status()
+        }
+    
     def generate_report(self):
         """生成监控报告"""
         try:
             status = self.api_validator.get_api_status()
+            period_start = time.time() - settings.MONITOR_REPORT_PERIOD_HOURS * 3600
+            availability = self.history.stats(since=period_start)
             
             report = {
                 "timestamp": datetime.now().isoformat(),
                 "api_status": status,
-                "test_results": {
-                    "total_tests": 148,
-                    "passed": 148,  # 这里可以从测试结果中获取
-                    "failed": 0
+                "test_results": self._test_results_summary(),
+                "test_outcomes": {
+                    "failing": self.outcomes.failing(),
+                    "flaky": self.outcomes.flaky()
                 },
                 "monitoring": {
-                    "uptime": "99.9%",
-                    "response_time": "200ms"
-                }
+                    "period_hours": settings.MONITOR_REPORT_PERIOD_HOURS,
+                    "period_start": availability["period_start"],
+                    "period_end": availability["period_end"],
+                    "checks": availability["checks"],
+                    "uptime": f"{availability['uptime_percent']}%" if availability["uptime_percent"] is not None else None,
+                    "response_time": {
+                        "mean_ms": availability["latency_mean_ms"],
+                        "p95_ms": availability["latency_p95_ms"]
+                    },
+                    "outages": availability["outages"],
+                    "latency_ms": latency_registry.snapshot()
+                },
+                "status_probing": self.status_interval.status(),
+                "history": self._history_summary(period_start)
             }
             
             # 保存报告
@@ -151,7 +619,7 @@ class APIMonitor:
                 json.dump(report, f, indent=2, ensure_ascii=False)
             
             print(f"[{datetime.now()}] 📊 监控报告已生成: {report_path}")
-            
+        
         except Exception as e:
             print(f"[{datetime.now()}] 生成报告失败: {e}")
     
@@ -160,24 +628,58 @@ class APIMonitor:
         print("🚀 启动API自动监控...")
         print(f"📁 项目路径: {project_root}")
         
-        # 设置定时任务
-        schedule.every(5).minutes.do(self.check_api_status)  # 每5分钟检查API状态
-        schedule.every().hour.do(self.run_tests)  # 每小时运行测试
-        schedule.every().day.at("09:00").do(self.generate_report)  # 每天9点生成报告
-        
-        # 立即运行一次
-        self.check_api_status()
+        # 设置定时任务：各任务在线程池中并发执行，慢任务不会阻塞状态检查
+        jitter_ratio = settings.MONITOR_JITTER_RATIO
+        self.status_job = self.scheduler.every(settings.MONITOR_STATUS_INTERVAL, self.check_api_status,
+                                               jitter=settings.MONITOR_STATUS_INTERVAL * jitter_ratio, run_now=True)
+        self.scheduler.every(settings.MONITOR_FLEET_INTERVAL, self.check_fleet_status,
+                             jitter=settings.MONITOR_FLEET_INTERVAL * jitter_ratio)
+        self.scheduler.every(settings.MONITOR_TEST_INTERVAL, self.run_tests,
+                             jitter=settings.MONITOR_TEST_INTERVAL * jitter_ratio)
+        if settings.MONITOR_RERUN_INTERVAL > 0:
+            self.scheduler.every(settings.MONITOR_RERUN_INTERVAL, self.rerun_failed_tests,
+                                 jitter=settings.MONITOR_RERUN_INTERVAL * jitter_ratio)
+        if settings.MONITOR_IMPACT_TESTS:
+            # 由端点探测触发，定时执行只是兜底
+            self.impact_job = self.scheduler.every(settings.MONITOR_FLEET_INTERVAL, self.run_impacted_tests)
+        self.scheduler.daily(settings.MONITOR_REPORT_TIME, self.generate_report)
+        self.scheduler.daily("03:00", self.prune_history)
         
         print("⏰ 定时任务已设置:")
-        print("   - 每5分钟检查API状态")
-        print("   - 每小时运行测试")
-        print("   - 每天9点生成报告")
+        print(f"   - 每{settings.MONITOR_STATUS_INTERVAL:g}~{settings.MONITOR_STATUS_MAX_INTERVAL:g}秒检查API状态，异常时每{settings.MONITOR_DEGRADED_MIN_INTERVAL:g}~{settings.MONITOR_DEGRADED_MAX_INTERVAL:g}秒")
+        print(f"   - 每{settings.MONITOR_FLEET_INTERVAL:g}秒探测端点 ({len(settings.MONITOR_BASE_URLS)} 个环境, {len(settings.MONITOR_REALM_IDS)} 个realm, {len(settings.MONITOR_LOCATION_IDS)} 个门店)")
+        print(f"   - 每{settings.MONITOR_TEST_INTERVAL:g}秒运行完整测试")
+        if settings.MONITOR_RERUN_INTERVAL > 0:
+            print(f"   - 每{settings.MONITOR_RERUN_INTERVAL:g}秒重跑失败和不稳定的测试")
+        if settings.MONITOR_IMPACT_TESTS:
+            print(f"   - 端点可用状态或延迟变化时运行相关测试 (索引了 {len(self.endpoint_index.tests)} 个测试)")
+        print(f"   - 每天{settings.MONITOR_REPORT_TIME}生成报告")
+        if self.store is not None:
+            print(f"   - 监控历史保存在 {type(self.store).__name__}，保留 {settings.HISTORY_RETENTION_DAYS} 天")
         print("🔄 开始监控循环...")
         
-        # 持续监控
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # 每分钟检查一次
+        self.start_web_server()
+        # 在后台预热测试运行器，第一次测试运行时不再等待导入和收集
+        self.test_runner.start()
+        
+        # 持续监控，直到 Ctrl+C
+        try:
+            self.scheduler.run_forever()
+        finally:
+            self.test_runner.stop()
+    
+    def start_web_server(self):
+        """在后台线程中提供状态页和 /metrics 接口，MONITOR_WEB_PORT 为0时不启动"""
+        if settings.MONITOR_WEB_PORT <= 0:
+            return
+        from utils.monitor_web import MonitorWebServer, create_monitor_app
+        
+        try:
+            self.web_server = MonitorWebServer(create_monitor_app(self.metrics, self.status_cache, self.health_status),
+                                               settings.MONITOR_WEB_HOST, settings.MONITOR_WEB_PORT)
+            self.web_server.start()
+        except OSError as e:
+            print(f"[{datetime.now()}] 启动监控接口失败: {e}")
 
 def main():
     monitor = APIMonitor()
@@ -13,8 +13,6 @@ import os
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-import time
-import schedule
 import subprocess
 import smtplib
 import requests
@@ -25,6 +23,8 @@ import json
 import logging
 
 from utils.api_validator import is_api_available, get_api_validator
+from config.settings import settings
+from utils.scheduler import AdaptiveInterval, Scheduler
 
 # 配置双语日志
 def setup_bilingual_logging():
@@ -45,19 +45,27 @@ class BilingualAPIMonitor:
         self.last_status = None
         self.notification_sent = False
         self.logger = setup_bilingual_logging()
-        
+        self.scheduler = Scheduler(settings.MONITOR_SCHEDULER_WORKERS)
+        self.status_job = None
+        self.status_interval = AdaptiveInterval(
+            settings.MONITOR_STATUS_INTERVAL, settings.MONITOR_STATUS_MAX_INTERVAL,
+            settings.MONITOR_DEGRADED_MIN_INTERVAL, settings.MONITOR_DEGRADED_MAX_INTERVAL,
+            settings.MONITOR_STATUS_HEALTHY_STREAK
+        )
+    
     def log_bilingual(self, message_cn, message_en, icon="📊"):
         """记录双语日志"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S,%f')[:-3]
         log_message = f"{timestamp} - INFO - {icon} {message_cn} | {message_en}"
         self.logger.info(log_message)
         print(log_message)
-        
+    
     def check_api_status(self):
         """检查API状态 | Check API Status"""
         try:
-            status = self.api_validator.get_api_status()
-            current_status = status['is_available']
+            # 每次都重新探测（get_api_status只在首次调用时探测）
+            current_status = self.api_validator.check_api_availability()
+            self._adapt_status_interval(current_status)
             
             if current_status:
                 self.log_bilingual(
@@ -81,13 +89,25 @@ class BilingualAPIMonitor:
             
             self.last_status = current_status
             return current_status
-            
+        
         except Exception as e:
             error_msg_cn = f"检查API状态时出错: {e}"
             error_msg_en = f"Error checking API status: {e}"
             self.log_bilingual(error_msg_cn, error_msg_en, "⚠️")
             return False
     
+    def _adapt_status_interval(self, healthy):
+        """按本次检查结果调整状态检查的间隔 | Adapt status check interval to current health"""
+        previous = self.status_interval.interval
+        interval = self.status_interval.update(healthy)
+        if self.status_job is not None and interval != previous:
+            self.scheduler.reschedule(self.status_job, interval, jitter=interval * settings.MONITOR_JITTER_RATIO)
+            self.log_bilingual(
+                f"状态检查间隔调整为 {interval:g} 秒",
+                f"Status check interval adjusted to {interval:g} seconds",
+                "⏱️"
+            )
+    
     def run_tests(self):
         """运行测试套件 | Run Test Suite"""
         try:
@@ -103,6 +123,7 @@ class BilingualAPIMonitor:
                 '--html=test_report.html',
                 '--self-contained-html',
                 '--alluredir=allure-results',
+                '-m', 'not unit',
                 '-v'
             ], capture_output=True, text=True, cwd=project_root)
             
@@ -120,7 +141,7 @@ class BilingualAPIMonitor:
                     "❌"
                 )
                 self.send_notification(f"❌ API测试失败\n{result.stdout}", f"❌ API tests failed\n{result.stdout}")
-                
+        
         except Exception as e:
             error_msg_cn = f"运行测试时出错: {e}"
             error_msg_en = f"Error running tests: {e}"
@@ -148,7 +169,7 @@ class BilingualAPIMonitor:
                 f"📧 Notification sent: {message_en}",
                 "📧"
             )
-            
+        
         except Exception as e:
             error_msg_cn = f"发送通知失败: {e}"
             error_msg_en = f"Failed to send notification: {e}"
@@ -183,7 +204,7 @@ class BilingualAPIMonitor:
                 f"📊 Monitoring report generated: {report_path}",
                 "📊"
             )
-            
+        
         except Exception as e:
             error_msg_cn = f"生成报告失败: {e}"
             error_msg_en = f"Failed to generate report: {e}"
@@ -202,13 +223,13 @@ class BilingualAPIMonitor:
             "📁"
         )
         
-        # 设置定时任务
-        schedule.every(5).minutes.do(self.check_api_status)  # 每5分钟检查API状态
-        schedule.every().hour.do(self.run_tests)  # 每小时运行测试
-        schedule.every().day.at("09:00").do(self.generate_report)  # 每天9点生成报告
-        
-        # 立即运行一次
-        self.check_api_status()
+        # 设置定时任务：各任务在线程池中并发执行，慢任务不会阻塞状态检查
+        jitter_ratio = settings.MONITOR_JITTER_RATIO
+        self.status_job = self.scheduler.every(settings.MONITOR_STATUS_INTERVAL, self.check_api_status,
+                                               jitter=settings.MONITOR_STATUS_INTERVAL * jitter_ratio, run_now=True)
+        self.scheduler.every(settings.MONITOR_TEST_INTERVAL, self.run_tests,
+                             jitter=settings.MONITOR_TEST_INTERVAL * jitter_ratio)
+        self.scheduler.daily(settings.MONITOR_REPORT_TIME, self.generate_report)
         
         self.log_bilingual(
             "⏰ 定时任务已设置:",
@@ -216,18 +237,18 @@ class BilingualAPIMonitor:
             "⏰"
         )
         self.log_bilingual(
-            "   - 每5分钟检查API状态",
-            "   - Check API status every 5 minutes",
+            f"   - 每{settings.MONITOR_STATUS_INTERVAL:g}~{settings.MONITOR_STATUS_MAX_INTERVAL:g}秒检查API状态，异常时每{settings.MONITOR_DEGRADED_MIN_INTERVAL:g}~{settings.MONITOR_DEGRADED_MAX_INTERVAL:g}秒",
+            f"   - Check API status every {settings.MONITOR_STATUS_INTERVAL:g}-{settings.MONITOR_STATUS_MAX_INTERVAL:g}s, every {settings.MONITOR_DEGRADED_MIN_INTERVAL:g}-{settings.MONITOR_DEGRADED_MAX_INTERVAL:g}s when degraded",
             "   ⏰"
         )
         self.log_bilingual(
-            "   - 每小时运行测试",
-            "   - Run tests every hour",
+            f"   - 每{settings.MONITOR_TEST_INTERVAL:g}秒运行测试",
+            f"   - Run tests every {settings.MONITOR_TEST_INTERVAL:g} seconds",
             "   ⏰"
         )
         self.log_bilingual(
-            "   - 每天9点生成报告",
-            "   - Generate report daily at 9:00",
+            f"   - 每天{settings.MONITOR_REPORT_TIME}生成报告",
+            f"   - Generate report daily at {settings.MONITOR_REPORT_TIME}",
             "   ⏰"
         )
         self.log_bilingual(
@@ -236,10 +257,8 @@ class BilingualAPIMonitor:
             "🔄"
         )
         
-        # 持续监控
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # 每分钟检查一次
+        # 持续监控，直到 Ctrl+C
+        self.scheduler.run_forever()
 
 def main():
     monitor = BilingualAPIMonitor()
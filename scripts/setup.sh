@@ -213,7 +213,7 @@ verify_installation() {
     log_step "验证安装..."
     
     # 检查Python包
-    python3 -c "import pytest, requests, schedule; print('✅ 核心依赖检查通过')"
+    python3 -c "import pytest, requests; print('✅ 核心依赖检查通过')"
     
     # 检查项目结构
     if [ -f "README.md" ] && [ -d "tests" ] && [ -d "utils" ]; then
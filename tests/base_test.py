@@ -5,11 +5,11 @@
 
 import pytest
 import requests
-import json
-from typing import Dict, Any, Optional
+from typing import Dict, List, Mapping, Optional, Union
 from config.env_config import BASE_URL
+from utils.request_handler import APIResult, RequestHandler
 from utils.token_manager import get_auth_headers
-from utils.api_validator import is_api_available
+from utils.api_validator import is_api_available, invalidate_api_availability
 
 class BaseAPITest:
     """API测试基类"""
@@ -20,72 +20,48 @@ class BaseAPITest:
     
     @property
     def headers(self):
+        # 预先构建的只读请求头，每次访问只是一次缓存查找
         return get_auth_headers()
     
     def make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, 
-                    headers: Optional[Dict] = None, expected_status: Optional[int] = None) -> Dict[str, Any]:
+                    headers: Optional[Mapping[str, str]] = None, expected_status: Union[int, List[int], None] = None,
+                    params: Optional[Dict] = None) -> APIResult:
         """
         发送API请求并返回结果
         
         Args:
-            method: HTTP方法 (GET, POST, PUT, DELETE)
+            method: HTTP方法 (GET, POST, PUT, DELETE, PATCH)
             endpoint: API端点
             data: 请求数据
             headers: 请求头
-            expected_status: 期望的状态码
-            
+            expected_status: 期望的状态码，可以是单个状态码或列表
+            params: 查询参数
+        
         Returns:
-            包含响应信息的字典
+            APIResult，响应体在访问 json 时才解析；请求和响应体只在测试失败时输出
         """
         if not is_api_available():
             pytest.skip("API不可用")
         
-        url = f"{self.base_url}{endpoint}"
-        request_headers = headers or self.headers
-        
         try:
-            if method.upper() == "GET":
-                response = requests.get(url, headers=request_headers, timeout=10)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=request_headers, json=data, timeout=10)
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=request_headers, json=data, timeout=10)
-            elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=request_headers, timeout=10)
-            elif method.upper() == "PATCH":
-                response = requests.patch(url, headers=request_headers, json=data, timeout=10)
-            else:
-                raise ValueError(f"不支持的HTTP方法: {method}")
-            
-            # 尝试解析JSON响应
-            json_data = None
-            json_error = None
-            try:
-                json_data = response.json()
-            except (json.JSONDecodeError, requests.exceptions.JSONDecodeError) as e:
-                json_error = str(e)
-            
-            result = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "text": response.text,
-                "json": json_data,
-                "json_error": json_error,
-                "url": url,
-                "method": method.upper()
-            }
-            
-            # 如果指定了期望状态码，进行断言
-            if expected_status is not None:
-                assert response.status_code == expected_status, \
-                    f"期望状态码 {expected_status}，实际状态码 {response.status_code}"
-            
-            return result
-            
+            result = RequestHandler(self.base_url).request(
+                method, endpoint, data=data, params=params, headers=headers or self.headers
+            )
         except requests.exceptions.RequestException as e:
+            if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                # 连接异常说明缓存的可用性结果可能已过时
+                invalidate_api_availability()
             pytest.fail(f"请求失败: {e}")
+        
+        # 如果指定了期望状态码，进行断言
+        if expected_status is not None:
+            expected = expected_status if isinstance(expected_status, (list, tuple)) else [expected_status]
+            assert result.status_code in expected, \
+                f"期望状态码 {expected_status}，实际状态码 {result.status_code}"
+        
+        return result
     
-    def assert_json_response(self, response: Dict[str, Any], expected_keys: Optional[list] = None):
+    def assert_json_response(self, response: APIResult, expected_keys: Optional[list] = None):
         """断言响应是有效的JSON格式"""
         assert response["json_error"] is None, f"JSON解析失败: {response['json_error']}"
         
@@ -94,7 +70,7 @@ class BaseAPITest:
             for key in expected_keys:
                 assert key in response["json"], f"响应中缺少键: {key}"
     
-    def assert_error_response(self, response: Dict[str, Any], expected_error_code: Optional[str] = None):
+    def assert_error_response(self, response: APIResult, expected_error_code: Optional[str] = None):
         """断言错误响应"""
         if response["json_error"] is None and response["json"]:
             # 如果响应是JSON格式，检查错误代码
@@ -116,7 +92,7 @@ class BaseAPITest:
 class TestBaseAPI:
     """基础API测试类"""
     
-    def test_api_connectivity(self):
+    def test_api_connectivity(self, http_session):
         """测试API连接性"""
         if not is_api_available():
             pytest.skip("API不可用")
@@ -125,7 +101,7 @@ class TestBaseAPI:
         headers = get_auth_headers()
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_session.get(url, headers=headers, timeout=10)
             # 即使返回404，也说明服务器是可访问的
             assert response.status_code in [200, 404], \
                 f"意外的状态码: {response.status_code}"
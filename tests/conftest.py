@@ -3,24 +3,125 @@
 Pytest配置文件 - 添加API可用性检查和跳过机制
 """
 
+import os
 import pytest
-from utils.api_validator import get_api_validator, is_api_available
+from utils.api_validator import (
+    get_api_validator, is_api_available, seed_api_availability, get_cached_api_availability
+)
+from utils.http_client import get_http_session, close_http_session, request_journal
+from utils.token_manager import get_token_manager
+from utils.result_stream import ResultStreamPlugin
+from utils.endpoint_index import item_endpoints
+from utils.collection_cache import CollectionCachePlugin
+from utils.cassette import MODES as CASSETTE_MODES, close_cassette
+from config.settings import settings
 
-# 全局API验证器
-api_validator = get_api_validator()
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# 工具模块的单元测试，标记为 unit；监控和CI的API测试用 -m "not unit" 排除
+UNIT_TESTS_DIR = os.path.join(TESTS_DIR, "utils")
 
 @pytest.fixture(scope="session")
 def api_status():
     """获取API状态信息"""
-    return api_validator.get_api_status()
+    return get_api_validator().get_api_status()
 
 @pytest.fixture(scope="session") 
 def api_available():
     """检查API是否可用的fixture"""
     return is_api_available()
 
+@pytest.fixture(scope="session")
+def http_session():
+    """共享的连接池HTTP会话，所有测试通过它发送请求（keep-alive复用连接）"""
+    session = get_http_session()
+    yield session
+    close_http_session()
+
+@pytest.fixture(scope="session")
+def token_manager():
+    """共享的token管理器，测试期间后台刷新即将过期的token"""
+    manager = get_token_manager()
+    manager.start_refresher()
+    yield manager
+    manager.stop_refresher()
+
+@pytest.fixture(scope="session")
+def auth_token(token_manager):
+    """默认测试账号的登录token（整个运行只登录一次），API不可用或登录失败时为None"""
+    if not is_api_available():
+        return None
+    return token_manager.get_token()
+
+class XdistControllerPlugin:
+    """xdist controller插件：只在controller进程探测一次API可用性，并下发给所有worker"""
+    
+    def __init__(self):
+        self.verdict = None
+    
+    def pytest_configure_node(self, node):
+        if self.verdict is None:
+            self.verdict = get_cached_api_availability()
+        node.workerinput["api_available"] = self.verdict[0]
+        node.workerinput["api_checked_at"] = self.verdict[1]
+
+def is_xdist_worker(config) -> bool:
+    """当前进程是否为xdist worker"""
+    return hasattr(config, "workerinput")
+
+def pytest_addoption(parser):
+    """自定义命令行参数"""
+    parser.addoption(
+        "--results-jsonl", default=None,
+        help="每个测试结束时把结果（状态、耗时、请求的端点）追加写入该JSON Lines文件，供监控增量读取"
+    )
+    parser.addoption(
+        "--down-endpoints", default="",
+        help="已知不可用的端点模板（逗号分隔，例如 /v1/orders,/v1/orders/{id}），请求这些端点的测试在收集阶段直接跳过"
+    )
+    parser.addoption(
+        "--no-collection-cache", action="store_true", default=False,
+        help="不读写测试收集缓存（--collect-only 总是导入测试模块）"
+    )
+    parser.addoption(
+        "--cassette", choices=CASSETTE_MODES, default=None,
+        help="HTTP录制回放：record 请求API并录制，replay 只从卡带回放不访问网络（默认取 HTTP_CASSETTE_MODE）"
+    )
+    parser.addoption(
+        "--cassette-path", default=None,
+        help="卡带文件路径（默认取 HTTP_CASSETTE_PATH）"
+    )
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
     """pytest配置"""
+    # 录制回放在创建任何HTTP会话之前设置；xdist worker收到同样的命令行参数
+    if config.getoption("--cassette"):
+        settings.HTTP_CASSETTE_MODE = config.getoption("--cassette")
+    if config.getoption("--cassette-path"):
+        settings.HTTP_CASSETTE_PATH = config.getoption("--cassette-path")
+    
+    if is_xdist_worker(config):
+        # 使用controller的探测结果，不再各自探测
+        if "api_available" in config.workerinput:
+            seed_api_availability(config.workerinput["api_available"], config.workerinput["api_checked_at"])
+        # allure结果目录只由controller清理一次，避免worker之间互相删除结果文件
+        if hasattr(config.option, "clean_alluredir"):
+            config.option.clean_alluredir = False
+    elif config.pluginmanager.hasplugin("xdist"):
+        config.pluginmanager.register(XdistControllerPlugin(), "kiosk-xdist-controller")
+    
+    # 记录每个测试发出的请求，失败时输出请求和响应体
+    request_journal.enabled = True
+    
+    # 结果流只由controller（或非并行运行的进程）写入
+    results_path = config.getoption("--results-jsonl")
+    if results_path and not is_xdist_worker(config):
+        config.pluginmanager.register(ResultStreamPlugin(results_path), "kiosk-result-stream")
+    
+    # 源码未修改时 --collect-only 直接使用上一次完整收集的结果
+    if not config.getoption("--no-collection-cache"):
+        config.pluginmanager.register(CollectionCachePlugin(config), "kiosk-collection-cache")
+    
     # 添加自定义标记
     config.addinivalue_line(
         "markers", "api_required: 标记需要API可用的测试"
@@ -28,24 +129,63 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "skip_if_api_unavailable: 如果API不可用则跳过测试"
     )
+    config.addinivalue_line(
+        "markers", "unit: tests/utils 下的工具模块单元测试，不访问API"
+    )
 
 def pytest_collection_modifyitems(config, items):
-    """修改测试收集，根据API可用性跳过测试"""
-    api_available = is_api_available()
+    """修改测试收集：标记单元测试、按模块分组、跳过已知不可用端点的测试；不探测API，收集阶段不访问网络"""
+    group_by_module = config.pluginmanager.hasplugin("xdist")
+    down = {endpoint.strip() for endpoint in config.getoption("--down-endpoints").split(",") if endpoint.strip()}
     
     for item in items:
-        # 如果API不可用，跳过标记为api_required的测试
-        if not api_available and "api_required" in item.keywords:
-            item.add_marker(pytest.mark.skip(reason="API不可用"))
+        if str(item.path).startswith(UNIT_TESTS_DIR + os.sep):
+            item.add_marker(pytest.mark.unit)
         
-        # 如果API不可用，跳过标记为skip_if_api_unavailable的测试
-        if not api_available and "skip_if_api_unavailable" in item.keywords:
-            item.add_marker(pytest.mark.skip(reason="API不可用"))
+        # 按测试模块目录分组（tests/order、tests/payment...），配合 --dist loadgroup 每组在同一个worker上运行
+        if group_by_module:
+            relative = os.path.relpath(str(item.path), TESTS_DIR)
+            group = relative.split(os.sep)[0] if os.sep in relative else "root"
+            item.add_marker(pytest.mark.xdist_group(name=group))
+        
+        # 请求了已知不可用端点的测试直接跳过，不发出请求
+        if down:
+            unavailable = sorted(down.intersection(item_endpoints(item.path, item.nodeid)))
+            if unavailable:
+                item.add_marker(pytest.mark.skip(reason=f"端点不可用: {', '.join(unavailable)}"))
+
 
 def pytest_runtest_setup(item):
     """测试运行前的设置"""
-    # 检查是否有自定义标记
+    request_journal.clear()
+    
+    # 检查是否有自定义标记：API可用性在运行阶段才探测（结果有缓存），收集阶段不访问网络
     if hasattr(item, 'funcargs'):
         # 如果测试需要API但API不可用，跳过测试
-        if "api_required" in item.keywords and not is_api_available():
-            pytest.skip("API不可用，跳过测试") 
\ No newline at end of file
+        if ("api_required" in item.keywords or "skip_if_api_unavailable" in item.keywords) and not is_api_available():
+            pytest.skip("API不可用，跳过测试") 
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """记录测试请求过的端点；测试失败时附上请求和响应体，通过的测试不解析也不打印响应体"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "call":
+        # 写入 user_properties 以便xdist把端点信息传回controller
+        report.user_properties.append(("endpoints", request_journal.endpoints()))
+    if report.failed and len(request_journal):
+        report.sections.append(("API请求", request_journal.format()))
+
+def pytest_terminal_summary(terminalreporter):
+    """输出共享连接池和HTTP卡带的使用情况"""
+    stats = close_http_session()
+    if stats["requests"]:
+        terminalreporter.write_line(
+            f"HTTP连接池: {stats['requests']} 个请求复用了 {stats['connections']} 个连接"
+        )
+    cassette = close_cassette()
+    if cassette is not None:
+        terminalreporter.write_line(
+            f"HTTP卡带({settings.HTTP_CASSETTE_MODE}): 回放 {cassette['hits']} 个, "
+            f"未命中 {cassette['misses']} 个, 录制 {cassette['recorded']} 个"
+        )
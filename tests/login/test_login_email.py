@@ -1,12 +1,19 @@
 import requests
 import pytest
-import json
 from utils.token_manager import get_auth_headers
 from config.env_config import BASE_URL
+from tests.base_test import BaseAPITest
 from utils.api_validator import is_api_available
 
+# 典型的kiosk邮箱登录请求，压测（scripts/load_test.py）复用同一份数据
+LOGIN_EMAIL_ENDPOINT = "/auth/login/email"
+LOGIN_EMAIL_PAYLOAD = {
+    "email": "test002@infi.us",
+    "password": "123123"
+}
+
 @pytest.mark.skip_if_api_unavailable
-class TestEmailLogin:
+class TestEmailLogin(BaseAPITest):
     """邮箱登录测试类"""
     
     def setup_method(self):
@@ -14,35 +21,9 @@ class TestEmailLogin:
         if not is_api_available():
             pytest.skip("API不可用")
     
-    def make_request(self, payload, expected_status=None):
-        """发送登录请求"""
-        url = f"{BASE_URL}/auth/login/email"
-        headers = get_auth_headers()
-        
-        try:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
-            
-            # 尝试解析JSON响应
-            try:
-                json_data = response.json()
-                print(f"Response: {response.status_code}, {json_data}")
-            except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-                print(f"Response: {response.status_code}, {response.text[:100]}...")
-            
-            if expected_status:
-                assert response.status_code == expected_status
-            return response
-            
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"请求失败: {e}")
-    
     def test_login_with_email_success(self):
         """测试邮箱登录成功"""
-        payload = {
-            "email": "test002@infi.us",
-            "password": "123123"
-        }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_EMAIL_ENDPOINT, LOGIN_EMAIL_PAYLOAD)
         assert response.status_code in [200, 401, 404]  # 404表示端点不存在
     
     def test_login_with_email_invalid_credentials(self):
@@ -51,7 +32,7 @@ class TestEmailLogin:
             "email": "invalid@infi.us",
             "password": "wrongpassword"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_EMAIL_ENDPOINT, payload)
         assert response.status_code in [401, 404]  # 404表示端点不存在
     
     @pytest.mark.parametrize("email,password", [
@@ -65,7 +46,7 @@ class TestEmailLogin:
             "email": email,
             "password": password
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_EMAIL_ENDPOINT, payload)
         assert response.status_code in [200, 401, 404]  # 404表示端点不存在
     
     def test_login_with_email_missing_password(self):
@@ -73,7 +54,7 @@ class TestEmailLogin:
         payload = {
             "email": "test002@infi.us"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_EMAIL_ENDPOINT, payload)
         assert response.status_code in [400, 404]  # 404表示端点不存在
     
     def test_login_with_email_missing_email(self):
@@ -81,39 +62,29 @@ class TestEmailLogin:
         payload = {
             "password": "123123"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_EMAIL_ENDPOINT, payload)
         assert response.status_code in [400, 404]  # 404表示端点不存在
 
 # 保持向后兼容的旧测试函数
-def test_login_with_email():
+def test_login_with_email(http_session):
     """测试邮箱登录（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
     
-    url = f"{BASE_URL}/auth/login/email"
-    payload = {
-        "email": "test002@infi.us",
-        "password": "123123"
-    }
+    url = f"{BASE_URL}{LOGIN_EMAIL_ENDPOINT}"
+    payload = LOGIN_EMAIL_PAYLOAD
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with email: {response.status_code}")
         
-        # 尝试解析JSON
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [200, 401, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_login_with_email_invalid_credentials():
+def test_login_with_email_invalid_credentials(http_session):
     """测试邮箱登录无效凭据（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -126,15 +97,9 @@ def test_login_with_email_invalid_credentials():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with invalid email: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [401, 404]
         
     except requests.exceptions.RequestException as e:
@@ -145,7 +110,7 @@ def test_login_with_email_invalid_credentials():
     ("test002@infi.us", "123123"),
     ("test003@infi.us", "123123")
 ])
-def test_login_with_multiple_emails(email, password):
+def test_login_with_multiple_emails(http_session, email, password):
     """测试多个邮箱登录（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -158,14 +123,14 @@ def test_login_with_multiple_emails(email, password):
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with {email}: {response.status_code}")
         assert response.status_code in [200, 401, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_login_with_email_missing_password():
+def test_login_with_email_missing_password(http_session):
     """测试邮箱登录缺少密码（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -177,21 +142,15 @@ def test_login_with_email_missing_password():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with missing password: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [400, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_login_with_email_missing_email():
+def test_login_with_email_missing_email(http_session):
     """测试邮箱登录缺少邮箱（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -203,15 +162,9 @@ def test_login_with_email_missing_email():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with missing email: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [400, 404]
         
     except requests.exceptions.RequestException as e:
@@ -1,12 +1,14 @@
 import requests
 import pytest
-import json
 from utils.token_manager import get_auth_headers
 from config.env_config import BASE_URL
+from tests.base_test import BaseAPITest
 from utils.api_validator import is_api_available
 
+LOGIN_PHONE_ENDPOINT = "/auth/login/phone"
+
 @pytest.mark.skip_if_api_unavailable
-class TestPhoneLogin:
+class TestPhoneLogin(BaseAPITest):
     """手机登录测试类"""
     
     def setup_method(self):
@@ -14,35 +16,13 @@ class TestPhoneLogin:
         if not is_api_available():
             pytest.skip("API不可用")
     
-    def make_request(self, payload, expected_status=None):
-        """发送登录请求"""
-        url = f"{BASE_URL}/auth/login/phone"
-        headers = get_auth_headers()
-        
-        try:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
-            
-            # 尝试解析JSON响应
-            try:
-                json_data = response.json()
-                print(f"Response: {response.status_code}, {json_data}")
-            except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-                print(f"Response: {response.status_code}, {response.text[:100]}...")
-            
-            if expected_status:
-                assert response.status_code == expected_status
-            return response
-            
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"请求失败: {e}")
-    
     def test_login_with_phone_success(self):
         """测试手机登录成功"""
         payload = {
             "phone": "1234567890",
             "verificationCode": "123456"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_PHONE_ENDPOINT, payload)
         assert response.status_code in [200, 401, 404]  # 404表示端点不存在
     
     def test_login_with_phone_invalid_code(self):
@@ -51,7 +31,7 @@ class TestPhoneLogin:
             "phone": "1234567890",
             "verificationCode": "000000"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_PHONE_ENDPOINT, payload)
         assert response.status_code in [401, 404]  # 404表示端点不存在
     
     def test_login_with_phone_invalid_number(self):
@@ -60,7 +40,7 @@ class TestPhoneLogin:
             "phone": "0000000000",
             "verificationCode": "123456"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_PHONE_ENDPOINT, payload)
         assert response.status_code in [401, 404]  # 404表示端点不存在
     
     @pytest.mark.parametrize("phone,code", [
@@ -74,7 +54,7 @@ class TestPhoneLogin:
             "phone": phone,
             "verificationCode": code
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_PHONE_ENDPOINT, payload)
         assert response.status_code in [200, 401, 404]  # 404表示端点不存在
     
     def test_login_with_phone_missing_code(self):
@@ -82,7 +62,7 @@ class TestPhoneLogin:
         payload = {
             "phone": "1234567890"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_PHONE_ENDPOINT, payload)
         assert response.status_code in [400, 404]  # 404表示端点不存在
     
     def test_login_with_phone_missing_number(self):
@@ -90,7 +70,7 @@ class TestPhoneLogin:
         payload = {
             "verificationCode": "123456"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_PHONE_ENDPOINT, payload)
         assert response.status_code in [400, 404]  # 404表示端点不存在
     
     def test_login_with_phone_location_specific(self):
@@ -100,11 +80,11 @@ class TestPhoneLogin:
             "verificationCode": "123456",
             "locationId": "location-001"
         }
-        response = self.make_request(payload)
+        response = self.make_request("POST", LOGIN_PHONE_ENDPOINT, payload)
         assert response.status_code in [200, 401, 404]  # 404表示端点不存在
 
 # 保持向后兼容的旧测试函数
-def test_login_with_phone():
+def test_login_with_phone(http_session):
     """测试手机登录（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -117,22 +97,15 @@ def test_login_with_phone():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with phone: {response.status_code}")
         
-        # 尝试解析JSON
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [200, 401, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_login_with_phone_invalid_code():
+def test_login_with_phone_invalid_code(http_session):
     """测试手机登录无效验证码（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -145,21 +118,15 @@ def test_login_with_phone_invalid_code():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with invalid code: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [401, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_login_with_phone_invalid_number():
+def test_login_with_phone_invalid_number(http_session):
     """测试手机登录无效号码（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -172,15 +139,9 @@ def test_login_with_phone_invalid_number():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with invalid number: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [401, 404]
         
     except requests.exceptions.RequestException as e:
@@ -191,7 +152,7 @@ def test_login_with_phone_invalid_number():
     ("9876543210", "654321"),
     ("5555555555", "111111")
 ])
-def test_login_with_multiple_phones(phone, code):
+def test_login_with_multiple_phones(http_session, phone, code):
     """测试多个手机号登录（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -204,14 +165,14 @@ def test_login_with_multiple_phones(phone, code):
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with {phone}: {response.status_code}")
         assert response.status_code in [200, 401, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_login_with_phone_missing_code():
+def test_login_with_phone_missing_code(http_session):
     """测试手机登录缺少验证码（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -223,21 +184,15 @@ def test_login_with_phone_missing_code():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with missing code: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [400, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_login_with_phone_missing_number():
+def test_login_with_phone_missing_number(http_session):
     """测试手机登录缺少手机号（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -249,15 +204,9 @@ def test_login_with_phone_missing_number():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Login with missing number: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [400, 404]
         
     except requests.exceptions.RequestException as e:
@@ -1,10 +1,8 @@
-import requests
 from utils.token_manager import get_auth_headers
 from config.env_config import BASE_URL
 
-def test_sign_in_with_phone():
-    token = "your_token_here"  # Replace with a valid token
-    headers = get_auth_headers(token)
+def test_sign_in_with_phone(http_session, auth_token):
+    headers = get_auth_headers(auth_token)
     url = f"{BASE_URL}/v1/auth/sign-in-with-phone-numbe"
     params = {
         "merchant-id": "your_merchant_id",
@@ -14,6 +12,5 @@ def test_sign_in_with_phone():
         "phone_number": "+13124029005",
         "verification_code": "684570"
     }
-    response = requests.post(url, headers=headers, params=params, json=payload)
-    print(response.status_code, response.json())
+    response = http_session.post(url, headers=headers, params=params, json=payload)
     assert response.status_code in [200, 401]
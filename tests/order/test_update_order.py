@@ -4,52 +4,7 @@ from utils.token_manager import get_auth_headers
 from utils.api_validator import is_api_available
 from config.env_config import BASE_URL
 
-class TestOrderUpdateAPI:
-    """订单更新API测试类"""
-    
-    def setup_method(self):
-        """每个测试方法执行前的设置"""
-        if not is_api_available():
-            pytest.skip("API不可用")
-    
-    def make_request(self, method: str, endpoint: str, data: dict = None, 
-                    headers: dict = None, params: dict = None, expected_status: list = None):
-        """统一的请求处理方法"""
-        if not headers:
-            headers = get_auth_headers()
-        
-        url = f"{BASE_URL}{endpoint}"
-        
-        try:
-            if method.upper() == "GET":
-                response = requests.get(url, headers=headers, params=params, timeout=10)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=10)
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=headers, json=data, timeout=10)
-            elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=10)
-            else:
-                raise ValueError(f"不支持的HTTP方法: {method}")
-            
-            # 尝试解析JSON响应
-            try:
-                response_data = response.json()
-                print(f"{method} {endpoint}: {response.status_code}, {response_data}")
-            except requests.exceptions.JSONDecodeError:
-                print(f"{method} {endpoint}: {response.status_code}, 非JSON响应: {response.text}")
-                response_data = {"error": "Non-JSON response", "text": response.text}
-            
-            # 验证状态码
-            if expected_status:
-                assert response.status_code in expected_status, f"期望状态码 {expected_status}, 实际状态码 {response.status_code}"
-            
-            return response_data
-            
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"请求失败: {e}")
-
-def test_update_order_status():
+def test_update_order_status(http_session):
     """测试更新订单状态"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -62,42 +17,31 @@ def test_update_order_status():
     headers = get_auth_headers()
     
     try:
-        response = requests.put(url, json=payload, headers=headers, timeout=10)
-        try:
-            response_data = response.json()
-            print(f"Update order status: {response.status_code}, {response_data}")
-        except requests.exceptions.JSONDecodeError:
-            print(f"Update order status: {response.status_code}, 非JSON响应: {response.text}")
+        response = http_session.put(url, json=payload, headers=headers, timeout=10)
         assert response.status_code in [200, 404]
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_update_order_status_with_token():
+def test_update_order_status_with_token(http_session, auth_token):
     """测试带token更新订单状态"""
     if not is_api_available():
         pytest.skip("API不可用")
     
-    token = "your_token_here"  # Replace with valid token
     order_id = "order-001"
     url = f"{BASE_URL}/v1/orders/{order_id}/status"
     payload = {
         "status": "preparing"
     }
-    headers = get_auth_headers(token)
+    headers = get_auth_headers(auth_token)
     
     try:
-        response = requests.put(url, json=payload, headers=headers, timeout=10)
-        try:
-            response_data = response.json()
-            print(f"Update order status with token: {response.status_code}, {response_data}")
-        except requests.exceptions.JSONDecodeError:
-            print(f"Update order status with token: {response.status_code}, 非JSON响应: {response.text}")
+        response = http_session.put(url, json=payload, headers=headers, timeout=10)
         assert response.status_code in [200, 404]
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
 @pytest.mark.parametrize("status", ["confirmed", "preparing", "ready", "completed", "cancelled"])
-def test_update_order_different_statuses(status):
+def test_update_order_different_statuses(http_session, status):
     """测试更新订单不同状态"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -110,17 +54,12 @@ def test_update_order_different_statuses(status):
     headers = get_auth_headers()
     
     try:
-        response = requests.put(url, json=payload, headers=headers, timeout=10)
-        try:
-            response_data = response.json()
-            print(f"Update order status to {status}: {response.status_code}, {response_data}")
-        except requests.exceptions.JSONDecodeError:
-            print(f"Update order status to {status}: {response.status_code}, 非JSON响应: {response.text}")
+        response = http_session.put(url, json=payload, headers=headers, timeout=10)
         assert response.status_code in [200, 404]
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_update_order_items():
+def test_update_order_items(http_session):
     """测试更新订单商品"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -149,17 +88,12 @@ def test_update_order_items():
     headers = get_auth_headers()
     
     try:
-        response = requests.put(url, json=payload, headers=headers, timeout=10)
-        try:
-            response_data = response.json()
-            print(f"Update order items: {response.status_code}, {response_data}")
-        except requests.exceptions.JSONDecodeError:
-            print(f"Update order items: {response.status_code}, 非JSON响应: {response.text}")
+        response = http_session.put(url, json=payload, headers=headers, timeout=10)
         assert response.status_code in [200, 404]
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_update_order_pickup_time():
+def test_update_order_pickup_time(http_session):
     """测试更新订单取餐时间"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -172,17 +106,12 @@ def test_update_order_pickup_time():
     headers = get_auth_headers()
     
     try:
-        response = requests.put(url, json=payload, headers=headers, timeout=10)
-        try:
-            response_data = response.json()
-            print(f"Update order pickup time: {response.status_code}, {response_data}")
-        except requests.exceptions.JSONDecodeError:
-            print(f"Update order pickup time: {response.status_code}, 非JSON响应: {response.text}")
+        response = http_session.put(url, json=payload, headers=headers, timeout=10)
         assert response.status_code in [200, 404]
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_cancel_order():
+def test_cancel_order(http_session):
     """测试取消订单"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -195,41 +124,30 @@ def test_cancel_order():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-        try:
-            response_data = response.json()
-            print(f"Cancel order: {response.status_code}, {response_data}")
-        except requests.exceptions.JSONDecodeError:
-            print(f"Cancel order: {response.status_code}, 非JSON响应: {response.text}")
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         assert response.status_code in [200, 404]
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_cancel_order_with_token():
+def test_cancel_order_with_token(http_session, auth_token):
     """测试带token取消订单"""
     if not is_api_available():
         pytest.skip("API不可用")
     
-    token = "your_token_here"  # Replace with valid token
     order_id = "order-001"
     url = f"{BASE_URL}/v1/orders/{order_id}/cancel"
     payload = {
         "reason": "Out of stock"
     }
-    headers = get_auth_headers(token)
+    headers = get_auth_headers(auth_token)
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
-        try:
-            response_data = response.json()
-            print(f"Cancel order with token: {response.status_code}, {response_data}")
-        except requests.exceptions.JSONDecodeError:
-            print(f"Cancel order with token: {response.status_code}, 非JSON响应: {response.text}")
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         assert response.status_code in [200, 404]
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_update_order_invalid_status():
+def test_update_order_invalid_status(http_session):
     """测试更新订单无效状态"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -242,12 +160,7 @@ def test_update_order_invalid_status():
     headers = get_auth_headers()
     
     try:
-        response = requests.put(url, json=payload, headers=headers, timeout=10)
-        try:
-            response_data = response.json()
-            print(f"Update order with invalid status: {response.status_code}, {response_data}")
-        except requests.exceptions.JSONDecodeError:
-            print(f"Update order with invalid status: {response.status_code}, 非JSON响应: {response.text}")
+        response = http_session.put(url, json=payload, headers=headers, timeout=10)
         assert response.status_code in [400, 404]
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}") 
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+工具模块单元测试的共享fixture
+"""
+
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from utils.mock_server import MockConfig, create_mock_app
+
+@pytest.fixture
+def mock_server():
+    """在后台线程中运行本地模拟服务，返回 (base_url, 收到的请求列表)"""
+    app = create_mock_app(MockConfig(seed=1))
+    received = []
+    wsgi_app = app.wsgi_app
+    
+    def counting_app(environ, start_response):
+        received.append((environ["REQUEST_METHOD"], environ["PATH_INFO"]))
+        return wsgi_app(environ, start_response)
+    
+    app.wsgi_app = counting_app
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", received
+    server.shutdown()
+    thread.join(timeout=5)
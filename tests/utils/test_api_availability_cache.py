@@ -0,0 +1,91 @@
+import pytest
+from utils import api_validator
+from utils.api_validator import APIValidator, is_api_available, invalidate_api_availability
+
+@pytest.fixture
+def probe_counter(monkeypatch, tmp_path):
+    """把可用性探测替换为计数器，并使用独立的缓存目录"""
+    calls = []
+    
+    def fake_check(self):
+        calls.append(self.base_url)
+        self.is_available = True
+        api_validator._store_availability(self.base_url, True)
+        return True
+    
+    monkeypatch.setattr(api_validator.settings, "API_AVAILABILITY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(api_validator.settings, "API_AVAILABILITY_TTL", 60)
+    monkeypatch.setattr(APIValidator, "check_api_availability", fake_check)
+    monkeypatch.setattr(api_validator, "_availability_cache", {})
+    return calls
+
+def test_is_api_available_probes_once_per_ttl(probe_counter):
+    """测试TTL窗口内只探测一次"""
+    for _ in range(5):
+        assert is_api_available()
+    assert len(probe_counter) == 1
+
+def test_is_api_available_shares_verdict_between_processes(probe_counter):
+    """测试其他进程写入的缓存文件会被复用"""
+    assert is_api_available()
+    # 模拟另一个worker进程：进程内缓存为空，只剩共享文件
+    api_validator._availability_cache.clear()
+    assert is_api_available()
+    assert len(probe_counter) == 1
+
+def test_is_api_available_reprobes_after_ttl(probe_counter, monkeypatch):
+    """测试TTL过期后重新探测"""
+    assert is_api_available()
+    monkeypatch.setattr(api_validator.settings, "API_AVAILABILITY_TTL", 0)
+    assert is_api_available()
+    assert len(probe_counter) == 2
+
+def test_invalidate_api_availability_forces_reprobe(probe_counter):
+    """测试连接错误导致缓存失效后重新探测"""
+    assert is_api_available()
+    invalidate_api_availability()
+    assert is_api_available()
+    assert len(probe_counter) == 2
+
+def test_find_working_endpoints_runs_probes_concurrently(monkeypatch):
+    """测试端点并发探测在截止时间内完成并记录延迟"""
+    import time
+    
+    def slow_probe(self, endpoint, timeout):
+        time.sleep(0.2)
+        return endpoint != "/status", 200.0
+    
+    monkeypatch.setattr(APIValidator, "check_api_availability", lambda self, timeout=10: True)
+    monkeypatch.setattr(APIValidator, "_probe_endpoint", slow_probe)
+    
+    validator = APIValidator()
+    start = time.perf_counter()
+    endpoints = validator.find_working_endpoints(deadline=2)
+    elapsed = time.perf_counter() - start
+    
+    assert elapsed < 0.2 * len(APIValidator.TEST_ENDPOINTS) / 2
+    assert "/status" not in endpoints
+    assert len(endpoints) == len(APIValidator.TEST_ENDPOINTS) - 1
+    assert validator.endpoint_latencies["/health"] == 200.0
+
+def test_find_working_endpoints_deadline_includes_availability_check(monkeypatch):
+    """测试可用性检查的耗时计入截止时间，非正数的截止时间直接报错"""
+    import time
+    
+    timeouts = []
+    
+    def slow_check(self, timeout=10):
+        timeouts.append(timeout)
+        time.sleep(0.3)
+        return True
+    
+    monkeypatch.setattr(APIValidator, "check_api_availability", slow_check)
+    monkeypatch.setattr(APIValidator, "_probe_endpoint", lambda self, endpoint, timeout: (True, 1.0))
+    
+    validator = APIValidator()
+    with pytest.raises(ValueError):
+        validator.find_working_endpoints(deadline=0)
+    assert validator.find_working_endpoints(deadline=0.2) == []
+    assert validator.find_working_endpoints(deadline=0.2, parallel=False) == []
+    assert timeouts == [0.2, 0.2]
+    assert validator.endpoint_latencies["/health"] is None
@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+
+from utils.api_validator import APIValidator
+from utils.async_probe import LOCATION_PROBE_ENDPOINTS, AsyncProbeEngine, build_probe_targets
+
+def _targets(hosts):
+    """每个主机若干GET探测目标：{"host": 数量}"""
+    return [
+        {"base_url": f"http://{host}", "realm_id": "r", "location_id": None, "endpoint": f"/v1/item/{i}",
+         "method": "GET", "url": f"http://{host}/v1/item/{i}", "params": None, "headers": {}}
+        for host, count in hosts.items() for i in range(count)
+    ]
+
+class InFlightTransport(httpx.AsyncBaseTransport):
+    """假的传输层：每个请求等待delay秒，记录全局和每个主机同时进行的请求数以及请求开始的顺序"""
+    
+    def __init__(self, delay=0.05, status_code=200):
+        self.delay = delay
+        self.status_code = status_code
+        self.in_flight = 0
+        self.host_in_flight = {}
+        self.max_in_flight = 0
+        self.max_host_in_flight = {}
+        self.started = []
+    
+    async def handle_async_request(self, request):
+        host = request.url.host
+        self.started.append(host)
+        self.in_flight += 1
+        self.host_in_flight[host] = self.host_in_flight.get(host, 0) + 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.max_host_in_flight[host] = max(self.max_host_in_flight.get(host, 0), self.host_in_flight[host])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+            self.host_in_flight[host] -= 1
+        return httpx.Response(self.status_code, json={})
+
+def test_build_probe_targets():
+    """测试每个环境×realm探测全部候选端点，每个门店额外探测门店端点并带上realm的请求头"""
+    targets = build_probe_targets(["http://a.test", "http://b.test"], ["r1", "r2"], ["loc-1"])
+    per_combo = len(APIValidator.TEST_ENDPOINTS) + len(LOCATION_PROBE_ENDPOINTS)
+    assert len(targets) == 4 * per_combo
+    
+    location = [t for t in targets if t["location_id"] == "loc-1"]
+    assert len(location) == 4 * len(LOCATION_PROBE_ENDPOINTS)
+    assert all(t["method"] == "GET" and t["params"] == {"location-id": "loc-1"} for t in location)
+    
+    auth = [t for t in targets if t["endpoint"].startswith("/auth")]
+    assert auth and all(t["method"] == "POST" for t in auth)
+    first = targets[0]
+    assert first["url"] == f"http://a.test{first['endpoint']}"
+    assert first["headers"]["X-Realm-ID"] == "r1"
+    assert targets[-1]["headers"]["X-Realm-ID"] == "r2"
+
+def test_global_and_per_host_limits():
+    """测试同时进行的探测不超过全局上限和每个主机的上限"""
+    transport = InFlightTransport()
+    engine = AsyncProbeEngine(concurrency=5, per_host_limit=2, transport=transport)
+    results = engine.run(_targets({"a.test": 6, "b.test": 6, "c.test": 6}))
+    assert len(results) == 18 and all(r["ok"] for r in results)
+    assert transport.max_in_flight == 5
+    assert max(transport.max_host_in_flight.values()) == 2
+
+def test_busy_host_does_not_block_other_hosts():
+    """测试等待繁忙主机的探测不占用全局名额：其他主机的探测不必排在它们后面"""
+    transport = InFlightTransport()
+    engine = AsyncProbeEngine(concurrency=2, per_host_limit=1, transport=transport)
+    engine.run(_targets({"busy.test": 5, "other.test": 1}))
+    # busy.test 的第一个请求和 other.test 的请求同时开始
+    assert transport.started[:2] == ["busy.test", "other.test"]
+
+def test_timeout_reported_as_failure(mock_server):
+    """测试超过探测超时的请求记为失败并记录错误，不影响其他探测"""
+    base_url, _ = mock_server
+    targets = build_probe_targets([base_url], ["r1"], [])
+    slow = dict(targets[0], headers={"X-Mock-Latency-Ms": "1000"})
+    results = AsyncProbeEngine(timeout=0.2).run([slow, targets[1]])
+    assert results[0]["ok"] is False
+    assert results[0]["status_code"] is None
+    assert "Timeout" in results[0]["error"]
+    assert results[0]["latency_ms"] < 1000
+    assert results[1]["error"] == ""
+
+def test_5xx_and_404_count_as_failures():
+    """测试404和5xx算作探测失败，其他状态码（包括401）说明端点正常"""
+    for status_code, ok in ((200, True), (401, True), (404, False), (500, False), (503, False)):
+        result = AsyncProbeEngine(transport=InFlightTransport(delay=0, status_code=status_code)).run(_targets({"a.test": 1}))
+        assert result[0]["status_code"] == status_code
+        assert result[0]["ok"] is ok
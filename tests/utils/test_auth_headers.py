@@ -0,0 +1,26 @@
+import pytest
+from config.settings import settings
+from utils.token_manager import get_auth_headers
+
+def test_headers_are_precomputed_and_shared():
+    """测试相同参数返回同一个预先构建的请求头对象"""
+    assert get_auth_headers() is get_auth_headers()
+    assert get_auth_headers("abc") is get_auth_headers("abc")
+    assert get_auth_headers() is not get_auth_headers("abc")
+
+def test_headers_are_read_only():
+    """测试缓存的请求头不能被调用方修改"""
+    headers = get_auth_headers()
+    with pytest.raises(TypeError):
+        headers["X-Realm-ID"] = "other-realm"
+    assert get_auth_headers()["X-Realm-ID"] == settings.REALM_ID
+
+def test_headers_per_realm_and_token():
+    """测试按 realm/app/token 区分请求头"""
+    headers = get_auth_headers("abc", realm_id="prod-realm", appz_id="kiosk-pos")
+    assert dict(headers) == {
+        "X-Realm-ID": "prod-realm",
+        "X-Appz-ID": "kiosk-pos",
+        "Authorization": "Bearer abc"
+    }
+    assert "Authorization" not in get_auth_headers()
@@ -0,0 +1,136 @@
+import json
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from config.settings import settings
+from utils import cassette as cassette_module
+from utils.cassette import REDACTED, Cassette, CassetteAdapter, CassetteMissError, match_key
+from utils.http_client import PooledSession
+
+class CountingAdapter(BaseAdapter):
+    """代替网络的适配器：每次请求返回递增的计数"""
+    
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+    
+    def send(self, request, **kwargs):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 201
+        response.reason = "Created"
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps({"count": self.calls, "path": request.path_url}).encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def close(self):
+        pass
+
+def _session(cassette, adapter=None):
+    session = requests.Session()
+    session.mount("http://", CassetteAdapter(cassette, adapter))
+    return session
+
+def test_match_key_rules():
+    """测试匹配键只比较方法、路径、查询参数和请求体，忽略主机、参数顺序和JSON键顺序"""
+    key = match_key("post", "http://a.test/v1/orders?b=2&a=1", b'{"x": 1, "y": [1, 2]}')
+    assert key == match_key("POST", "https://b.test/v1/orders?a=1&b=2", '{"y":[1,2],"x":1}')
+    assert key != match_key("PUT", "http://a.test/v1/orders?a=1&b=2", b'{"x": 1, "y": [1, 2]}')
+    assert key != match_key("POST", "http://a.test/v1/orders?a=1&b=3", b'{"x": 1, "y": [1, 2]}')
+    assert key != match_key("POST", "http://a.test/v1/orders?a=1&b=2", b'{"x": 2, "y": [1, 2]}')
+
+def test_record_then_replay_offline(tmp_path):
+    """测试录制的响应按顺序回放、用完后重复最后一条，回放不调用真实适配器，未录制的请求报连接错误"""
+    path = str(tmp_path / "cassette.db")
+    adapter = CountingAdapter()
+    recorder = Cassette(path, "record")
+    session = _session(recorder, adapter)
+    session.post("http://api.test/v1/orders", json={"a": 1, "b": 2})
+    session.post("http://api.test/v1/orders", json={"a": 1, "b": 2})
+    session.get("http://api.test/v1/menu", params={"location": "x"})
+    assert recorder.stats()["recorded"] == 3
+    recorder.close()
+    
+    player = Cassette(path, "replay")
+    session = _session(player)
+    first = session.post("http://other.test/v1/orders", json={"b": 2, "a": 1})
+    assert first.status_code == 201
+    assert first.headers["content-type"] == "application/json"
+    assert first.json() == {"count": 1, "path": "/v1/orders"}
+    assert session.post("http://api.test/v1/orders", json={"a": 1, "b": 2}).json()["count"] == 2
+    assert session.post("http://api.test/v1/orders", json={"a": 1, "b": 2}).json()["count"] == 2
+    assert session.get("http://api.test/v1/menu?location=x").json()["count"] == 3
+    
+    with pytest.raises(requests.exceptions.ConnectionError) as excinfo:
+        session.post("http://api.test/v1/orders", json={"a": 2})
+    assert isinstance(excinfo.value, CassetteMissError)
+    assert player.stats() == {"hits": 4, "misses": 1, "recorded": 0}
+    assert adapter.calls == 3
+
+def test_rerecord_replaces_previous_interactions(tmp_path):
+    """测试重新录制同一请求时覆盖旧的录制"""
+    path = str(tmp_path / "cassette.db")
+    for _ in range(2):
+        recorder = Cassette(path, "record")
+        _session(recorder, CountingAdapter()).get("http://api.test/v1/menu")
+        recorder.close()
+    assert len(Cassette(path, "replay")) == 1
+
+class LoginAdapter(BaseAdapter):
+    """返回带token和Set-Cookie的登录响应"""
+    
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Set-Cookie"] = "session=secret-cookie; HttpOnly"
+        response._content = json.dumps({
+            "code": 0,
+            "data": {"accessToken": "secret-token", "expires_in": 3600, "user": {"email": "a@test.com"}}
+        }).encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def close(self):
+        pass
+
+def test_record_redacts_credentials(tmp_path):
+    """测试录制前替换响应中的token和认证相关的响应头，其他字段保持不变"""
+    path = tmp_path / "cassette.db"
+    recorder = Cassette(str(path), "record")
+    live = _session(recorder, LoginAdapter()).post("http://api.test/auth/login/email", json={"email": "a@test.com"})
+    assert live.json()["data"]["accessToken"] == "secret-token"
+    recorder.close()
+    
+    raw = path.read_bytes()
+    assert b"secret-cookie" not in raw
+    
+    replayed = _session(Cassette(str(path), "replay")).post("http://api.test/auth/login/email", json={"email": "a@test.com"})
+    assert replayed.json() == {
+        "code": 0,
+        "data": {"accessToken": REDACTED, "expires_in": 3600, "user": {"email": "a@test.com"}}
+    }
+    assert replayed.headers["Set-Cookie"] == REDACTED
+    assert b"secret-token" not in replayed.content
+
+def test_pooled_session_uses_active_cassette(tmp_path, monkeypatch):
+    """测试开启回放时 PooledSession 从卡带读取响应，连接池统计照常可用"""
+    path = str(tmp_path / "cassette.db")
+    recorder = Cassette(path, "record")
+    _session(recorder, CountingAdapter()).get("http://api.test/v1/location")
+    recorder.close()
+    
+    monkeypatch.setattr(settings, "HTTP_CASSETTE_MODE", "replay")
+    monkeypatch.setattr(settings, "HTTP_CASSETTE_PATH", path)
+    try:
+        session = PooledSession(retries=0)
+        assert session.get("http://127.0.0.1:9/v1/location").json()["count"] == 1
+        assert session.pool_stats() == {"connections": 0, "requests": 0}
+        session.close()
+    finally:
+        assert cassette_module.close_cassette() == {"hits": 1, "misses": 0, "recorded": 0}
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+
+from utils.collection_cache import CollectionCache, collected_nodeids, source_signature
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _write_tree(root):
+    (root / "tests").mkdir()
+    (root / "pytest.ini").write_text("[pytest]\nmarkers =\n    smoke: 冒烟测试\n", encoding="utf-8")
+    (root / "tests" / "test_sample.py").write_text(
+        "import pytest\n\n"
+        "@pytest.mark.smoke\n"
+        "def test_smoke():\n    \"\"\"冒烟测试\"\"\"\n\n"
+        "@pytest.mark.parametrize('value', [1, 2])\n"
+        "def test_param(value):\n    pass\n\n"
+        "class TestGroup:\n    \"\"\"分组\"\"\"\n\n    def test_member(self):\n        pass\n",
+        encoding="utf-8"
+    )
+    (root / "conftest.py").write_text(
+        "import sys\n"
+        f"sys.path.insert(0, {PROJECT_ROOT!r})\n"
+        "from utils.collection_cache import CollectionCachePlugin\n\n"
+        "def pytest_configure(config):\n"
+        "    config.pluginmanager.register(CollectionCachePlugin(config, path='cache.json'), 'collection-cache')\n",
+        encoding="utf-8"
+    )
+
+def _collect(root, *args, verbosity="-q"):
+    return subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", verbosity, "-p", "no:cacheprovider", *args],
+        cwd=str(root), capture_output=True, text=True, timeout=60
+    )
+
+def test_signature_changes_with_sources(tmp_path):
+    """测试源码文件修改或新增后缓存签名改变，旧缓存失效"""
+    _write_tree(tmp_path)
+    signature = source_signature(str(tmp_path))
+    cache = CollectionCache(str(tmp_path), str(tmp_path / "cache.json"))
+    cache.save(signature, [{"nodeid": "tests/test_sample.py::test_param[1]", "markers": [], "params": "1", "keywords": []}])
+    assert cache.load(signature)[0]["params"] == "1"
+    assert collected_nodeids(str(tmp_path), str(tmp_path / "cache.json")) == {
+        "tests/test_sample.py::test_param[1]", "tests/test_sample.py::test_param"
+    }
+    
+    (tmp_path / "tests" / "test_new.py").write_text("def test_new():\n    pass\n", encoding="utf-8")
+    assert source_signature(str(tmp_path)) != signature
+    assert cache.load() is None
+    assert collected_nodeids(str(tmp_path), str(tmp_path / "cache.json")) is None
+
+def test_collect_only_served_from_cache(tmp_path):
+    """测试完整收集后写入缓存，再次 --collect-only 在各种详细程度下输出与正常收集一致（包括 -k、-m 过滤）"""
+    _write_tree(tmp_path)
+    first = _collect(tmp_path)
+    assert first.returncode == 0, first.stdout + first.stderr
+    items = CollectionCache(str(tmp_path), str(tmp_path / "cache.json")).load()
+    assert [(item["nodeid"], item["markers"], item["params"]) for item in items] == [
+        ("tests/test_sample.py::test_smoke", ["smoke"], None),
+        ("tests/test_sample.py::test_param[1]", ["parametrize"], "1"),
+        ("tests/test_sample.py::test_param[2]", ["parametrize"], "2"),
+        ("tests/test_sample.py::TestGroup::test_member", [], None),
+    ]
+    assert [label for _, label, _ in items[3]["chain"][1:]] == [
+        "<Dir tests>", "<Module test_sample.py>", "<Class TestGroup>", "<Function test_member>"
+    ]
+    
+    # 缓存中只有一个测试时输出缓存内容，说明没有重新收集
+    signature = source_signature(str(tmp_path))
+    CollectionCache(str(tmp_path), str(tmp_path / "cache.json")).save(signature, items[:1])
+    cached = _collect(tmp_path)
+    assert cached.returncode == 0
+    assert cached.stdout.splitlines()[0] == "tests/test_sample.py::test_smoke"
+    assert "1 test collected" in cached.stdout
+    
+    CollectionCache(str(tmp_path), str(tmp_path / "cache.json")).save(signature, items)
+    cases = [(verbosity, []) for verbosity in ("-qq", "-q", "--verbosity=0", "-v")]
+    cases += [("-q", ["-k", "param and not 2"]), ("-q", ["-m", "smoke"]), ("-q", ["tests/test_sample.py::test_param"])]
+    cases += [("--verbosity=0", ["-m", "smoke"]), ("-v", ["-k", "member or smoke"])]
+    for verbosity, args in cases:
+        cached = _collect(tmp_path, *args, verbosity=verbosity)
+        fresh = _collect(tmp_path, "-p", "no:collection-cache", *args, verbosity=verbosity)
+        assert cached.stdout.rsplit(" in ", 1)[0] == fresh.stdout.rsplit(" in ", 1)[0], (verbosity, args)
+    
+    # 不存在的路径交给正常收集报错
+    missing = _collect(tmp_path, "tests/test_missing.py")
+    assert missing.returncode == 4
+    assert "file or directory not found" in missing.stdout + missing.stderr
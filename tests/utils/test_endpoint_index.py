@@ -0,0 +1,61 @@
+from utils.endpoint_index import EndpointIndex, changed_endpoints, down_endpoints, endpoint_health, scan_test_file
+
+TEST_MODULE = '''
+from config.env_config import BASE_URL
+
+CREATE_ORDER_ENDPOINT = "/v1/orders"
+
+def test_create(http_session):
+    url = f"{BASE_URL}{CREATE_ORDER_ENDPOINT}"
+    http_session.post(url, json={})
+
+def test_status(http_session):
+    order_id = "order-001"
+    http_session.get(f"{BASE_URL}/v1/orders/{order_id}/status?verbose=1")
+
+def test_local(client):
+    client.get("/metrics")
+
+class TestSendCode:
+    def test_email(self):
+        self.make_request("POST", "/auth/send-code/email", {})
+'''
+
+def _probe(endpoint, status_code, latency_ms, base_url="http://api.test"):
+    return {"base_url": base_url, "endpoint": endpoint, "status_code": status_code, "latency_ms": latency_ms}
+
+def test_scan_maps_tests_to_endpoint_templates(tmp_path):
+    """测试静态分析识别 BASE_URL 拼接的URL、模块常量和 make_request 的路径，本地客户端请求不计入"""
+    tests_dir = tmp_path / "tests"
+    tests_dir.mkdir()
+    (tests_dir / "test_orders.py").write_text(TEST_MODULE, encoding="utf-8")
+    
+    assert scan_test_file(str(tests_dir / "test_orders.py")) == {
+        "test_create": ["/v1/orders"],
+        "test_status": ["/v1/orders/{id}/status"],
+        "test_local": [],
+        "TestSendCode::test_email": ["/auth/send-code/email"]
+    }
+    
+    index = EndpointIndex.scan(str(tests_dir), str(tmp_path))
+    assert index.tests_for(["/v1/orders"]) == ["tests/test_orders.py::test_create"]
+    
+    index.observe([{"event": "test", "nodeid": "tests/test_orders.py::test_local[1]",
+                    "endpoints": ["GET /v1/menu/items"]}])
+    assert index.tests_for(["/v1/menu/items"]) == ["tests/test_orders.py::test_local"]
+
+def test_health_changes_and_down_endpoints():
+    """测试端点在所有探测都是5xx或连接错误时才算不可用，状态翻转和延迟明显变化被识别"""
+    previous = endpoint_health([
+        _probe("/health", 200, 20), _probe("/v1/menu/items", 200, 40), _probe("/v1/orders", 200, 30),
+        _probe("/health", 500, 5, base_url="http://other.test")
+    ], "http://api.test")
+    current = endpoint_health([
+        _probe("/health", 200, 25), _probe("/v1/menu/items", 200, 400),
+        _probe("/v1/orders", 503, 10), _probe("/v1/orders", None, None), _probe("/missing", 404, 10)
+    ], "http://api.test")
+    
+    assert current["/missing"]["up"] is True
+    assert down_endpoints(current) == ["/v1/orders"]
+    assert changed_endpoints(previous, current, latency_ratio=2, latency_min_ms=100) == ["/v1/menu/items", "/v1/orders"]
+    assert changed_endpoints(previous, current, latency_ratio=20, latency_min_ms=100) == ["/v1/orders"]
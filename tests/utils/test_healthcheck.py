@@ -0,0 +1,70 @@
+import importlib.util
+import os
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+from config.settings import settings
+from utils import api_validator
+from utils.history_store import HistoryStore, probe_row
+from utils.monitor_web import create_monitor_app
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _load_healthcheck():
+    spec = importlib.util.spec_from_file_location(
+        "healthcheck", os.path.join(PROJECT_ROOT, "scripts", "healthcheck.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+healthcheck = _load_healthcheck()
+
+def _record_api_check(path, timestamp):
+    store = HistoryStore(path)
+    store.record_probes([probe_row({"endpoint": "/", "ok": False}, kind="api", timestamp=timestamp)])
+    store.close()
+
+def test_web_port_uses_readyz(monkeypatch):
+    """测试开启监控接口时按 /readyz 的状态码判断"""
+    state = {"live": True, "ready": False}
+    server = make_server("127.0.0.1", 0, create_monitor_app(health=lambda: state), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        monkeypatch.setattr(settings, "MONITOR_WEB_HOST", "0.0.0.0")
+        monkeypatch.setattr(settings, "MONITOR_WEB_PORT", server.server_port)
+        assert healthcheck.main() == 1
+        state["ready"] = True
+        assert healthcheck.main() == 0
+    finally:
+        server.shutdown()
+        thread.join(timeout=5)
+
+def test_without_web_port_checks_last_status_check(monkeypatch, tmp_path):
+    """测试关闭监控接口时按历史库中最近一次API状态检查的时间判断，与API是否可用无关"""
+    db_path = str(tmp_path / "history.db")
+    monkeypatch.setattr(settings, "MONITOR_WEB_PORT", 0)
+    monkeypatch.setattr(settings, "HISTORY_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "HISTORY_DB_PATH", db_path)
+    monkeypatch.setattr(settings, "API_AVAILABILITY_CACHE_DIR", str(tmp_path))
+    assert healthcheck.main() == 1
+    
+    _record_api_check(db_path, time.time() - healthcheck.ready_max_probe_age() - 60)
+    assert healthcheck.main() == 1
+    _record_api_check(db_path, time.time())
+    assert healthcheck.main() == 0
+
+def test_without_history_uses_availability_cache(monkeypatch, tmp_path):
+    """测试没有SQLite历史时改用共享可用性缓存的探测时间，缓存过了TTL也照样计算"""
+    monkeypatch.setattr(settings, "MONITOR_WEB_PORT", 0)
+    monkeypatch.setattr(settings, "HISTORY_BACKEND", "none")
+    monkeypatch.setattr(settings, "API_AVAILABILITY_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "API_AVAILABILITY_TTL", 0)
+    monkeypatch.setattr(api_validator, "_availability_cache", {})
+    assert healthcheck.main() == 1
+    
+    api_validator._store_availability(api_validator.BASE_URL, False)
+    assert healthcheck.last_history_check() is None
+    assert healthcheck.main() == 0
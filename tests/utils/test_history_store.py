@@ -0,0 +1,52 @@
+from utils.history_store import HistoryStore, probe_row
+
+def _store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.db"))
+
+def test_probe_range_query_and_wal(tmp_path):
+    """测试探测记录按时间范围和端点查询，数据库使用WAL模式"""
+    store = _store(tmp_path)
+    store.record_probes([
+        probe_row({"endpoint": "/health", "ok": True, "status_code": 200, "latency_ms": 10.0}, timestamp=100),
+        probe_row({"endpoint": "/health", "ok": False, "error": "timeout"}, timestamp=200),
+        probe_row({"endpoint": "/v1/menu/items", "ok": True, "latency_ms": 30.0}, timestamp=300)
+    ])
+    
+    assert [row["timestamp"] for row in store.query_probes(since=150)] == [200, 300]
+    assert [row["timestamp"] for row in store.query_probes(until=300)] == [100, 200]
+    health = store.query_probes(endpoint="/health")
+    assert [row["ok"] for row in health] == [1, 0]
+    assert health[1]["error"] == "timeout"
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_downsample_buckets(tmp_path):
+    """测试按时间桶聚合可用率和延迟"""
+    store = _store(tmp_path)
+    store.record_probes(
+        probe_row({"endpoint": "/", "ok": timestamp != 30, "latency_ms": float(timestamp)}, kind="api", timestamp=timestamp)
+        for timestamp in (0, 30, 60, 3600, 3660)
+    )
+    
+    buckets = store.downsample(0, 7200, bucket_seconds=3600, kind="api")
+    assert [bucket["checks"] for bucket in buckets] == [3, 2]
+    assert buckets[0]["uptime_percent"] == round(2 / 3 * 100, 3)
+    assert buckets[0]["latency_max_ms"] == 60.0
+    assert buckets[1]["latency_mean_ms"] == 3630.0
+    assert store.downsample(0, kind="fleet") == []
+
+def test_test_results_and_prune(tmp_path):
+    """测试写入结果流中的测试记录并清理过期历史"""
+    store = _store(tmp_path)
+    store.record_test_results([
+        {"event": "start", "timestamp": "2025-01-01T00:00:00"},
+        {"event": "test", "nodeid": "tests/a.py::test_a", "outcome": "failed", "duration": 0.5,
+         "endpoints": ["GET /v1/orders"], "message": "boom", "run_id": "r1", "timestamp": 100},
+        {"event": "test", "nodeid": "tests/a.py::test_b", "outcome": "passed", "duration": 0.1,
+         "run_id": "r1", "timestamp": 200}
+    ])
+    
+    failed = store.query_test_results(outcome="failed")
+    assert len(failed) == 1
+    assert failed[0]["endpoints"] == ["GET /v1/orders"]
+    assert store.prune(before=150) == 1
+    assert [row["nodeid"] for row in store.query_test_results()] == ["tests/a.py::test_b"]
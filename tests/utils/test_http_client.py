@@ -0,0 +1,36 @@
+import pytest
+import requests
+
+from utils.http_client import PooledSession
+
+def test_connections_are_reused(mock_server):
+    """测试同一会话的多次请求复用同一个keep-alive连接"""
+    base_url, received = mock_server
+    session = PooledSession(retries=0)
+    for _ in range(5):
+        assert session.get(f"{base_url}/health").status_code == 200
+    assert session.pool_stats() == {"connections": 1, "requests": 5}
+    assert len(received) == 5
+    session.close()
+
+def test_gateway_errors_retried_only_for_idempotent_methods(mock_server):
+    """测试502/503/504只对GET等幂等方法重试，POST只发送一次"""
+    base_url, received = mock_server
+    session = PooledSession(retries=2)
+    headers = {"X-Mock-Status": "503"}
+    
+    assert session.get(f"{base_url}/health", headers=headers).status_code == 503
+    assert received.count(("GET", "/health")) == 3
+    
+    assert session.post(f"{base_url}/v1/orders", json={}, headers=headers).status_code == 503
+    assert received.count(("POST", "/v1/orders")) == 1
+    session.close()
+
+def test_read_timeout_not_retried(mock_server):
+    """测试读超时不重试（read=0）：请求可能已被服务端处理"""
+    base_url, received = mock_server
+    session = PooledSession(retries=2, timeout=0.2)
+    with pytest.raises(requests.exceptions.ConnectionError, match="Read timed out"):
+        session.get(f"{base_url}/health", headers={"X-Mock-Latency-Ms": "500"})
+    assert received == [("GET", "/health")]
+    session.close()
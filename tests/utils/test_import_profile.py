@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+from utils.import_profile import ENTRY_POINTS, parse_importtime, summarize_imports
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:       200 |        300 | io
+import time:      1500 |       1500 |     requests.compat
+import time:       500 |       2000 |   requests
+import time:      1000 |       3000 | monitor_api
+"""
+
+def test_parse_and_summarize():
+    """测试解析 -X importtime 输出，汇总总耗时和顶层导入及其直接导入"""
+    modules = parse_importtime(SAMPLE)
+    assert [(m["module"], m["depth"]) for m in modules] == [
+        ("_io", 1), ("io", 0), ("requests.compat", 2), ("requests", 1), ("monitor_api", 0)
+    ]
+    summary = summarize_imports(modules, top=3)
+    assert summary["import_ms"] == 3.3
+    assert summary["modules"] == 5
+    assert summary["top"] == {"monitor_api": 3.0, "  requests": 2.0, "io": 0.3}
+
+def test_entry_points_skip_heavy_imports():
+    """测试监控和健康检查入口在导入时不加载HTTP客户端、Flask、pytest和邮件模块"""
+    heavy = ("httpx", "flask", "requests", "smtplib", "redis", "pytest", "multiprocessing")
+    for name in ("monitor", "healthcheck"):
+        code = ENTRY_POINTS[name] + f"; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True,
+                                text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "", f"{name} 导入了 {result.stdout.strip()}"
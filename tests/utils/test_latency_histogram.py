@@ -0,0 +1,41 @@
+import pytest
+from config.env_config import BASE_URL
+from utils.latency_histogram import LatencyHistogram, LatencyRegistry, endpoint_template
+
+def test_histogram_percentiles_within_bucket_precision():
+    """测试百分位误差在分桶精度内"""
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(float(value))
+    
+    summary = histogram.summary()
+    assert summary["count"] == 1000
+    assert summary["max"] == 1000.0
+    assert summary["p50"] == pytest.approx(500, rel=1 / 32)
+    assert summary["p90"] == pytest.approx(900, rel=1 / 32)
+    assert summary["p99"] == pytest.approx(990, rel=1 / 32)
+
+def test_empty_histogram_summary():
+    """测试空直方图"""
+    assert LatencyHistogram().summary()["p99"] == 0.0
+
+@pytest.mark.parametrize("url,template", [
+    (f"{BASE_URL}/v1/orders/order-001", "/v1/orders/{id}"),
+    (f"{BASE_URL}/v1/orders?status=pending", "/v1/orders"),
+    (f"{BASE_URL}/v1/location/5382410a-d2d7-4271-a29c-385a38ebbca9/settings", "/v1/location/{id}/settings"),
+    (f"{BASE_URL}/", "/"),
+])
+def test_endpoint_template(url, template):
+    """测试URL归一化为端点模板"""
+    assert endpoint_template(url) == template
+
+def test_registry_groups_by_method_and_template():
+    """测试按方法和端点模板聚合"""
+    registry = LatencyRegistry()
+    registry.record("get", f"{BASE_URL}/v1/orders/order-001", {"total": 10.0, "connect": None})
+    registry.record("GET", f"{BASE_URL}/v1/orders/order-002", {"total": 30.0})
+    
+    snapshot = registry.snapshot()
+    assert list(snapshot) == ["GET /v1/orders/{id}"]
+    assert snapshot["GET /v1/orders/{id}"]["total"]["count"] == 2
+    assert "connect" not in snapshot["GET /v1/orders/{id}"]
@@ -0,0 +1,48 @@
+import pytest
+from utils.latency_histogram import LatencyHistogram
+from utils.load_generator import LoadGenerator, constant_profile, is_error_status, make_scenario, ramp_profile
+
+def _generator(profile, duration, **kwargs):
+    scenarios = [make_scenario("create_order", "POST", "/v1/orders", {})]
+    return LoadGenerator("http://127.0.0.1:1", scenarios, profile, duration, **kwargs)
+
+def test_constant_profile_arrivals_evenly_spaced():
+    """测试恒定速率按均匀间隔排定请求"""
+    arrivals = list(_generator(constant_profile(10), 2)._arrivals())
+    assert len(arrivals) == 20
+    assert arrivals[1] - arrivals[0] == pytest.approx(0.1)
+
+def test_ramp_profile_increases_rate():
+    """测试爬坡曲线线性升速，结束后保持终点速率"""
+    profile = ramp_profile(10, 110, 10)
+    assert profile(0) == 10
+    assert profile(5) == 60
+    assert profile(20) == 110
+    
+    arrivals = list(_generator(profile, 10)._arrivals())
+    first_half = sum(1 for t in arrivals if t < 5)
+    assert len(arrivals) - first_half > first_half
+
+def test_poisson_arrivals_reproducible_with_seed():
+    """测试泊松到达在相同种子下可复现"""
+    first = list(_generator(constant_profile(50), 1, poisson=True, seed=7)._arrivals())
+    second = list(_generator(constant_profile(50), 1, poisson=True, seed=7)._arrivals())
+    assert first == second
+
+def test_error_status_classification():
+    """测试压测错误口径：5xx和429算错误，业务4xx不算"""
+    assert is_error_status(503)
+    assert is_error_status(429)
+    assert not is_error_status(400)
+    assert not is_error_status(201)
+
+def test_histogram_merge():
+    """测试直方图合并"""
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(10)
+    second.record(30)
+    second.record(50)
+    first.merge(second)
+    assert first.count == 3
+    assert first.max_ms == 50
+    assert first.summary()["mean"] == 30
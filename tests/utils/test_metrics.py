@@ -0,0 +1,45 @@
+from utils.metrics import MetricsRegistry, monitor_metrics
+from utils.monitor_web import create_monitor_app
+
+def test_render_counter_gauge_and_histogram():
+    """测试计数器、仪表和直方图按Prometheus文本格式导出"""
+    registry = MetricsRegistry()
+    registry.describe("probe_total", "counter", "探测次数")
+    registry.describe("api_up", "gauge", "是否可用")
+    registry.describe("probe_seconds", "histogram", "探测耗时", buckets=(0.1, 1.0))
+    registry.inc("probe_total", {"endpoint": "/health", "result": "ok"})
+    registry.inc("probe_total", {"endpoint": "/health", "result": "ok"})
+    registry.set("api_up", 1)
+    for value in (0.05, 0.5, 3.0):
+        registry.observe("probe_seconds", value, {"endpoint": "/health"})
+    
+    text = registry.render()
+    assert "# TYPE probe_total counter" in text
+    assert 'probe_total{endpoint="/health",result="ok"} 2' in text
+    assert "api_up 1" in text
+    assert 'probe_seconds_bucket{endpoint="/health",le="0.1"} 1' in text
+    assert 'probe_seconds_bucket{endpoint="/health",le="1"} 2' in text
+    assert 'probe_seconds_bucket{endpoint="/health",le="+Inf"} 3' in text
+    assert 'probe_seconds_sum{endpoint="/health"} 3.55' in text
+    assert 'probe_seconds_count{endpoint="/health"} 3' in text
+
+def test_label_escaping_and_collectors():
+    """测试标签值转义和导出时调用的采集函数"""
+    registry = MetricsRegistry()
+    registry.describe("errors_total", "counter", "错误数")
+    registry.inc("errors_total", {"message": 'say "hi"\nbye'})
+    registry.add_collector(lambda: [("jobs_running", "gauge", "运行中的任务", [("", {"job": "probe"}, 1)])])
+    
+    text = registry.render()
+    assert 'errors_total{message="say \\"hi\\"\\nbye"} 1' in text
+    assert 'jobs_running{job="probe"} 1' in text
+
+def test_metrics_endpoint():
+    """测试 /metrics 接口返回进程内的指标"""
+    monitor_metrics.set("kiosk_api_up", 1, {"base_url": "http://example.test"})
+    client = create_monitor_app().test_client()
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert 'kiosk_api_up{base_url="http://example.test"} 1' in response.get_data(as_text=True)
@@ -0,0 +1,40 @@
+import time
+import pytest
+from utils.mock_server import MockConfig, create_mock_app
+
+@pytest.fixture
+def mock_client():
+    """模拟服务的Flask测试客户端"""
+    config = MockConfig(seed=1)
+    app = create_mock_app(config, base_path="/kiosk-shopping-api")
+    return app.test_client(), config
+
+def test_routes_served_under_base_path(mock_client):
+    """测试路由挂载在base_path下"""
+    client, _ = mock_client
+    assert client.get("/kiosk-shopping-api/v1/menu/items/item-001").status_code == 200
+    assert client.get("/kiosk-shopping-api/v1/menu/items/unknown").status_code == 404
+    assert client.get("/v1/menu/items/item-001").status_code == 404
+
+def test_order_validation(mock_client):
+    """测试订单校验"""
+    client, _ = mock_client
+    base = "/kiosk-shopping-api/v1/orders"
+    valid = {"items": [{"item_id": "item-001", "quantity": 1}], "payment_method": "card"}
+    assert client.post(base, json=valid).status_code == 201
+    assert client.post(base, json=dict(valid, items=[])).status_code == 400
+    assert client.post(base, json=dict(valid, payment_method="bitcoin")).status_code == 400
+
+def test_error_and_latency_injection(mock_client):
+    """测试错误率、延迟以及单请求覆盖"""
+    client, config = mock_client
+    client.put("/__mock__/config", json={"error_rate": 1, "error_status": 502})
+    assert client.get("/kiosk-shopping-api/health").status_code == 502
+    
+    client.put("/__mock__/config", json={"error_rate": 0, "latency_ms": 50})
+    start = time.perf_counter()
+    assert client.get("/kiosk-shopping-api/health").status_code == 200
+    assert time.perf_counter() - start >= 0.05
+    
+    response = client.get("/kiosk-shopping-api/health", headers={"X-Mock-Status": "500", "X-Mock-Latency-Ms": "0"})
+    assert response.status_code == 500
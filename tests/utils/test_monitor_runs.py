@@ -0,0 +1,82 @@
+import importlib.util
+import os
+
+import pytest
+
+from config.settings import settings
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _load_monitor_module():
+    spec = importlib.util.spec_from_file_location(
+        "monitor_api", os.path.join(PROJECT_ROOT, "scripts", "monitor_api.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+monitor_api = _load_monitor_module()
+
+class RecordingRunner:
+    """记录传给popen的参数，不真正运行测试"""
+    
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.calls = []
+    
+    def popen(self, args, log_path):
+        self.calls.append(args)
+        raise RuntimeError("not started")
+
+def _monitor(enabled, tmp_path):
+    monitor = monitor_api.APIMonitor.__new__(monitor_api.APIMonitor)
+    monitor.test_runner = RecordingRunner(enabled)
+    monitor.down_endpoints = []
+    monitor.outcomes = monitor_api.OutcomeHistory(path=str(tmp_path / "outcomes.json"))
+    monitor.notifications = []
+    monitor.send_notification = monitor.notifications.append
+    return monitor
+
+@pytest.fixture(autouse=True)
+def keep_results_file(monkeypatch, tmp_path):
+    """_run_tests 会删除项目根目录下的结果文件，测试中改为临时目录"""
+    monkeypatch.setattr(monitor_api, "project_root", str(tmp_path))
+
+def test_warm_runner_runs_serially(monkeypatch, tmp_path):
+    """测试常驻运行器开启时忽略 TEST_WORKERS，不传 -n 给pytest"""
+    monkeypatch.setattr(settings, "TEST_WORKERS", "auto")
+    monitor = _monitor(enabled=True, tmp_path=tmp_path)
+    monitor._run_tests([], "full")
+    
+    (args,) = monitor.test_runner.calls
+    assert "-n" not in args and "--dist" not in args
+    assert args[args.index("-m") + 1] == "not unit"
+    assert "--alluredir=allure-results" in args
+    assert monitor.notifications == ["❌ 运行测试时出错: not started"]
+
+def test_subprocess_runs_use_test_workers(monkeypatch, tmp_path):
+    """测试关闭常驻运行器时按 TEST_WORKERS 启动xdist，TEST_WORKERS=0 时串行"""
+    monkeypatch.setattr(settings, "TEST_WORKERS", "4")
+    monitor = _monitor(enabled=False, tmp_path=tmp_path)
+    monitor._run_tests([], "full")
+    args = monitor.test_runner.calls[-1]
+    assert args[args.index("-n") + 1] == "4"
+    assert args[args.index("--dist") + 1] == "loadgroup"
+    
+    monkeypatch.setattr(settings, "TEST_WORKERS", "0")
+    monitor._run_tests([], "full")
+    assert "-n" not in monitor.test_runner.calls[-1]
+
+def test_partial_runs_select_nodeids(monkeypatch, tmp_path):
+    """测试部分运行只运行指定的测试，单独生成报告，不写Allure结果"""
+    monkeypatch.setattr(settings, "TEST_WORKERS", "auto")
+    monitor = _monitor(enabled=True, tmp_path=tmp_path)
+    monitor.down_endpoints = ["/v1/menu"]
+    nodeids = ["tests/menu/test_menu.py::test_get_menu", "tests/order/test_order.py::test_create"]
+    monitor._run_tests(nodeids, "rerun")
+    
+    (args,) = monitor.test_runner.calls
+    assert args[-2:] == nodeids
+    assert "--html=test_report_rerun.html" in args
+    assert "--down-endpoints=/v1/menu" in args
+    assert not any(arg.startswith("--alluredir") for arg in args)
+    assert "-n" not in args
@@ -0,0 +1,23 @@
+from utils.monitor_web import create_monitor_app
+
+def test_health_endpoints_follow_state():
+    """测试 /healthz 和 /readyz 按健康状态返回200或503，不缓存"""
+    state = {"live": True, "ready": False, "last_status_check": None}
+    client = create_monitor_app(health=lambda: state).test_client()
+    
+    live = client.get("/healthz")
+    assert live.status_code == 200
+    assert live.get_json()["live"] is True
+    assert live.headers["Cache-Control"] == "no-store"
+    assert client.get("/readyz").status_code == 503
+    
+    state.update(ready=True)
+    assert client.get("/readyz").status_code == 200
+    state.update(live=False)
+    assert client.get("/healthz").status_code == 503
+
+def test_health_endpoints_optional():
+    """测试没有提供健康状态时不注册健康检查接口"""
+    client = create_monitor_app().test_client()
+    assert client.get("/healthz").status_code == 404
+    assert client.get("/metrics").status_code == 200
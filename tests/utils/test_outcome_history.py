@@ -0,0 +1,42 @@
+from utils.outcome_history import OutcomeHistory
+
+def _run(outcomes, finished=True):
+    records = [{"event": "test", "nodeid": nodeid, "when": "call", "outcome": outcome}
+               for nodeid, outcome in outcomes.items()]
+    if finished:
+        records.append({"event": "finish", "exitstatus": 0 if outcomes else 4})
+    return records
+
+def test_failing_and_flaky_candidates(tmp_path):
+    """测试最近失败的和窗口内失败过的测试都需要重跑，连续通过满窗口后移出"""
+    history = OutcomeHistory(path=str(tmp_path / "outcomes.json"), window=3)
+    history.update(_run({"t::a": "passed", "t::b": "failed", "t::c": "passed"}), full_run=True)
+    assert history.failing() == ["t::b"]
+    assert history.rerun_candidates() == ["t::b"]
+    
+    history.update(_run({"t::b": "passed"}), selected=["t::b"])
+    assert history.failing() == []
+    assert history.flaky() == ["t::b"]
+    
+    history.update(_run({"t::b": "passed"}), selected=["t::b"])
+    history.update(_run({"t::b": "passed"}), selected=["t::b"])
+    assert history.rerun_candidates() == []
+
+def test_persisted_and_pruned(tmp_path):
+    """测试结果历史在重启后恢复，完整运行中不存在的测试被移除，未结束的运行不删除记录"""
+    path = str(tmp_path / "outcomes.json")
+    history = OutcomeHistory(path=path, window=3)
+    history.update(_run({"t::a": "failed", "t::old": "error"}), full_run=True)
+    
+    restored = OutcomeHistory(path=path, window=3)
+    assert restored.failing() == ["t::a", "t::old"]
+    
+    restored.update(_run({"t::a": "failed"}, finished=False), full_run=True)
+    assert "t::old" in restored.tests
+    restored.update(_run({"t::a": "failed"}), full_run=True)
+    assert restored.failing() == ["t::a"]
+    
+    restored.update(_run({}), selected=["t::a"])
+    assert restored.failing() == ["t::a"]
+    restored.update(_run({"t::b": "passed"}), selected=["t::a", "t::b"])
+    assert restored.tests == {"t::b": ["passed"]}
@@ -0,0 +1,51 @@
+import pytest
+from utils.probe_history import ProbeHistory, capacity_for
+
+def test_stats_time_weighted_uptime_and_outages():
+    """测试按时间加权的可用率和故障窗口"""
+    history = ProbeHistory(capacity=10)
+    history.record(True, 100.0, timestamp=0)
+    history.record(False, None, timestamp=60)
+    history.record(False, None, timestamp=120)
+    history.record(True, 300.0, timestamp=180)
+    
+    stats = history.stats(until=240)
+    assert stats["checks"] == 4
+    assert stats["uptime_percent"] == pytest.approx(50.0)
+    assert stats["latency_mean_ms"] == 200.0
+    assert stats["latency_p95_ms"] == 300.0
+    assert len(stats["outages"]) == 1
+    assert stats["outages"][0]["duration_seconds"] == 120.0
+
+def test_ring_buffer_keeps_only_latest_entries():
+    """测试环形缓冲区写满后覆盖最旧记录"""
+    history = ProbeHistory(capacity=3)
+    for timestamp in range(5):
+        history.record(True, float(timestamp), timestamp=timestamp)
+    
+    assert len(history) == 3
+    assert [entry[0] for entry in history.entries()] == [2, 3, 4]
+    assert [entry[0] for entry in history.entries(since=3)] == [3, 4]
+
+def test_ongoing_outage_has_no_end():
+    """测试仍在持续的故障窗口"""
+    history = ProbeHistory(capacity=3)
+    history.record(True, 10.0, timestamp=0)
+    history.record(False, None, timestamp=30)
+    
+    outage = history.stats(until=90)["outages"][0]
+    assert outage["end"] is None
+    assert outage["duration_seconds"] == 60.0
+
+def test_capacity_covers_period_at_fastest_interval():
+    """测试容量按最短检查间隔覆盖整个统计周期：24小时每2秒一次需要43200条"""
+    assert capacity_for(24 * 3600, 2) == 43200
+    assert capacity_for(24 * 3600, 15) == 5760
+    assert capacity_for(100, 3) == 34
+    
+    history = ProbeHistory(capacity_for(3600, 2))
+    for second in range(0, 3600, 2):
+        history.record(second % 600 >= 60, 10.0, timestamp=second)
+    stats = history.stats(since=0, until=3600)
+    assert stats["checks"] == 1800
+    assert len(stats["outages"]) == 6
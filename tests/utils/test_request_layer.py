@@ -0,0 +1,76 @@
+import pytest
+import requests
+from tests import base_test
+from tests.base_test import BaseAPITest
+from utils.http_client import RequestJournal
+from utils.request_handler import APIResult
+
+def _response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body.encode("utf-8")
+    return response
+
+def test_api_result_parses_json_once(monkeypatch):
+    """测试响应体只在访问json时解析，且只解析一次"""
+    response = _response(200, '{"items": [1, 2]}')
+    calls = []
+    original = response.json
+    monkeypatch.setattr(response, "json", lambda: calls.append(1) or original())
+    
+    result = APIResult("get", "http://api/v1/menu/items", response)
+    assert calls == []
+    assert result.json == {"items": [1, 2]}
+    assert result["json"]["items"] == [1, 2]
+    assert len(calls) == 1
+    assert result["status_code"] == 200
+    assert result.method == "GET"
+
+def test_api_result_non_json():
+    """测试非JSON响应"""
+    result = APIResult("GET", "http://api/", _response(404, "<html>Not Found</html>"))
+    assert result["json_error"] is not None
+    assert result.json is None
+
+def test_request_journal_formats_only_when_asked():
+    """测试请求记录：关闭时不记录，开启后保留最近的请求并截断响应体"""
+    journal = RequestJournal(maxlen=2)
+    journal.record("POST", "http://api/v1/orders", {"items": []}, _response(201, "{}"))
+    assert len(journal) == 0
+    
+    journal.enabled = True
+    journal.record("GET", "http://api/v1/menu/items", None, _response(200, "x" * 50))
+    journal.record("POST", "http://api/v1/orders", {"items": []}, _response(500, "boom" * 10))
+    journal.record("GET", "http://api/v1/orders/order-001", None, error=requests.exceptions.Timeout("timed out"))
+    assert len(journal) == 2
+    
+    text = journal.format(limit=20)
+    assert "/v1/menu/items" not in text
+    assert 'POST http://api/v1/orders\n  请求体: {"items": []}\n  响应: 500 boomboomboomboomboom...（共 40 字符）' in text
+    assert "异常: Timeout: timed out" in text
+    
+    journal.clear()
+    assert journal.format() == ""
+
+def test_make_request_returns_lazy_api_result(mock_server, monkeypatch):
+    """测试 BaseAPITest.make_request 经共享会话请求模拟服务，返回的 APIResult 按需解析JSON并配合断言辅助方法"""
+    base_url, _ = mock_server
+    monkeypatch.setattr(base_test, "is_api_available", lambda: True)
+    
+    class MockAPITest(BaseAPITest):
+        @property
+        def base_url(self):
+            return base_url
+    
+    api = MockAPITest()
+    result = api.make_request("GET", "/v1/menu/items", expected_status=200)
+    assert isinstance(result, APIResult)
+    assert "json" not in vars(result)
+    api.assert_json_response(result, expected_keys=["items"])
+    assert result.json["items"]
+    
+    invalid = api.make_request("POST", "/v1/orders", data={"items": []}, expected_status=[400, 422])
+    api.assert_error_response(invalid, expected_error_code="INVALID_ITEMS")
+    
+    with pytest.raises(AssertionError, match="期望状态码"):
+        api.make_request("GET", "/v1/menu/items/unknown", expected_status=200)
@@ -0,0 +1,41 @@
+import json
+from utils.result_stream import ResultStreamReader, summarize_results
+
+def _test_record(nodeid, outcome, when="call", endpoints=None):
+    return {"event": "test", "nodeid": nodeid, "when": when, "outcome": outcome,
+            "duration": 0.01, "endpoints": endpoints or [], "message": ""}
+
+def test_reader_returns_only_new_complete_lines(tmp_path):
+    """测试增量读取：只返回新增的完整行，未写完的行留到下次"""
+    path = tmp_path / "results.jsonl"
+    reader = ResultStreamReader(str(path))
+    assert reader.poll() == []
+    
+    first = json.dumps(_test_record("test_a", "passed"))
+    second = json.dumps(_test_record("test_b", "failed"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(first + "\n" + second[:10])
+    assert [r["nodeid"] for r in reader.poll()] == ["test_a"]
+    
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(second[10:] + "\n")
+    assert [r["nodeid"] for r in reader.poll()] == ["test_b"]
+    assert reader.poll() == []
+
+def test_summarize_results_counts_each_test_once():
+    """测试汇总：每个测试只计一次，teardown错误覆盖call结果"""
+    records = [
+        {"event": "start"},
+        _test_record("test_a", "passed"),
+        _test_record("test_b", "failed", endpoints=["POST /v1/orders"]),
+        _test_record("test_c", "skipped", when="setup"),
+        _test_record("test_d", "passed"),
+        _test_record("test_d", "error", when="teardown"),
+        {"event": "finish", "exitstatus": 1, "duration": 1.5}
+    ]
+    summary = summarize_results(records)
+    assert summary["total_tests"] == 4
+    assert (summary["passed"], summary["failed"], summary["skipped"], summary["errors"]) == (1, 1, 1, 1)
+    assert summary["finished"] and summary["duration_seconds"] == 1.5
+    assert [f["nodeid"] for f in summary["failures"]] == ["test_b", "test_d"]
+    assert summary["failures"][0]["endpoints"] == ["POST /v1/orders"]
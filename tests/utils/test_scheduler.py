@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from utils.scheduler import AdaptiveInterval, Job, Scheduler
+
+def test_interval_advances_from_plan_without_drift():
+    """测试间隔任务按计划时间推进，错过的周期直接跳过"""
+    job = Job("probe", lambda: None, interval=15)
+    job.next_run = 100.0
+    job.advance(now=103.0)
+    assert job.next_run == 115.0
+    job.advance(now=161.0)
+    assert job.next_run == 175.0
+    assert job.due_at == 175.0
+
+def test_jitter_stays_within_bound():
+    """测试抖动只影响本次触发时间，不累积到计划时间"""
+    job = Job("probe", lambda: None, interval=10, jitter=2)
+    job.next_run = 0.0
+    for step in range(1, 20):
+        job.advance(now=job.next_run)
+        assert job.next_run == step * 10
+        assert job.next_run <= job.due_at <= job.next_run + 2
+
+def test_slow_job_is_skipped_and_does_not_block_others():
+    """测试慢任务不阻塞其他任务，同一任务不会重叠执行"""
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+    fast_runs = []
+    
+    def slow():
+        with lock:
+            overlaps.append(len(active))
+            active.append(1)
+        time.sleep(0.25)
+        with lock:
+            active.pop()
+    
+    scheduler = Scheduler(max_workers=2)
+    slow_job = scheduler.every(0.05, slow, run_now=True)
+    scheduler.every(0.05, lambda: fast_runs.append(1), name="fast", run_now=True)
+    scheduler.start()
+    time.sleep(0.4)
+    scheduler.stop()
+    
+    assert max(overlaps) == 0
+    assert slow_job.skipped > 0
+    assert len(fast_runs) >= 4
+
+def test_failing_job_keeps_running():
+    """测试任务抛出异常后记录错误并继续调度"""
+    def broken():
+        raise RuntimeError("boom")
+    
+    scheduler = Scheduler()
+    job = scheduler.every(0.02, broken, run_now=True)
+    scheduler.start()
+    time.sleep(0.15)
+    scheduler.stop()
+    
+    assert job.failures >= 2
+    assert job.last_error == "RuntimeError: boom"
+    assert job.status()["schedule"] == "every 0.02s"
+
+def test_adaptive_interval_backs_off_and_tightens():
+    """测试健康时间隔逐步放慢，异常时快速探测并指数退避，恢复后回到基础间隔"""
+    adaptive = AdaptiveInterval(base=15, healthy_max=60, degraded_min=2, degraded_max=10, healthy_streak=2)
+    assert [adaptive.update(True, timestamp=t) for t in range(6)] == [15, 15, 30, 30, 60, 60]
+    assert [adaptive.update(False, timestamp=t) for t in (100, 102, 106, 114, 124)] == [2, 4, 8, 10, 10]
+    assert adaptive.update(True, timestamp=130) == 15
+    
+    assert [(t["state"], t["previous_state_seconds"]) for t in adaptive.transitions] == [("down", 100), ("up", 30)]
+    assert adaptive.status()["state"] == "up"
+
+def test_reschedule_pulls_next_run_forward():
+    """测试缩短间隔后下一次执行按上一次计划时间重新计算"""
+    scheduler = Scheduler()
+    job = scheduler.every(60, lambda: None)
+    planned = job.next_run
+    scheduler.reschedule(job, 2)
+    assert job.interval == 2
+    assert job.next_run == pytest.approx(planned - 58)
+
+def test_trigger_runs_job_immediately():
+    """测试手动触发的任务立即执行，之后按间隔重新计时"""
+    runs = []
+    scheduler = Scheduler()
+    job = scheduler.every(3600, lambda: runs.append(1))
+    scheduler.start()
+    scheduler.trigger(job)
+    time.sleep(0.2)
+    scheduler.stop()
+    
+    assert runs == [1]
+    assert job.next_run > time.monotonic() + 3500
+
+def test_heartbeat_advances_while_idle():
+    """测试没有到期任务时调度线程仍定期更新心跳，停止后心跳为None"""
+    scheduler = Scheduler()
+    scheduler.HEARTBEAT_INTERVAL = 0.05
+    scheduler.every(3600, lambda: None)
+    assert scheduler.heartbeat_age() is None
+    scheduler.start()
+    time.sleep(0.2)
+    first = scheduler.heartbeat
+    time.sleep(0.2)
+    assert scheduler.heartbeat > first
+    assert scheduler.heartbeat_age() < 0.2
+    scheduler.stop()
+    assert scheduler.heartbeat_age() is None
+
+def test_on_change_invalidates_cached_job_status():
+    """测试任务开始和结束时调用 on_change，缓存的任务状态随之更新，回调中读取任务状态不会死锁"""
+    from utils.status_page import StatusCache
+    
+    started = threading.Event()
+    release = threading.Event()
+    
+    def job_func():
+        started.set()
+        release.wait(5)
+    
+    scheduler = Scheduler(on_change=lambda: cache.invalidate())
+    cache = StatusCache(lambda: {"jobs": scheduler.status()})
+    job = scheduler.every(3600, job_func, name="slow")
+    first_etag, status = cache.snapshot()
+    assert status["jobs"][0]["running"] is False
+    
+    scheduler.start()
+    scheduler.trigger(job)
+    assert started.wait(5)
+    running_etag, status = cache.snapshot()
+    assert running_etag != first_etag
+    assert status["jobs"][0]["running"] is True
+    
+    release.set()
+    deadline = time.monotonic() + 5
+    while cache.etag == running_etag and time.monotonic() < deadline:
+        time.sleep(0.01)
+    finished_etag, status = cache.snapshot()
+    scheduler.stop()
+    assert finished_etag != running_etag
+    assert status["jobs"][0]["running"] is False
+    assert status["jobs"][0]["runs"] == 1
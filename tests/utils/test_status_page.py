@@ -0,0 +1,56 @@
+from utils.monitor_web import create_monitor_app
+from utils.probe_history import ProbeHistory
+from utils.status_page import StatusCache
+
+def _status():
+    history = ProbeHistory(capacity=10)
+    history.record(True, 12.0, timestamp=0)
+    return {
+        "generated_at": "2025-01-01T00:00:00",
+        "api": {"base_url": "http://example.test", "available": False, "last_latency_ms": None,
+                "interval_seconds": 2, "since": "2025-01-01T00:00:00",
+                "transitions": [{"timestamp": "2025-01-01T00:00:00", "state": "down", "previous_state_seconds": 60}]},
+        "availability": {"1h": history.stats(until=60)},
+        "fleet": {"total": 2, "ok": 1, "by_realm": {"http://example.test [dev-realm]": {"total": 2, "ok": 1}},
+                  "failed": [{"method": "GET", "base_url": "http://example.test", "endpoint": "/v1/menu/items",
+                              "realm_id": "dev-realm", "location_id": None, "status_code": 503, "error": ""}],
+                  "finished_at": "2025-01-01T00:00:00"},
+        "tests": None,
+        "jobs": []
+    }
+
+def test_status_json_etag_and_304():
+    """测试状态JSON带ETag，未变化时返回304且不重新生成快照"""
+    builds = []
+    cache = StatusCache(lambda: builds.append(1) or _status())
+    client = create_monitor_app(status=cache).test_client()
+    
+    first = client.get("/api/status")
+    assert first.status_code == 200
+    assert first.get_json()["api"]["available"] is False
+    etag = first.headers["ETag"]
+    
+    cached = client.get("/api/status", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+    assert len(builds) == 1
+    
+    cache.invalidate()
+    changed = client.get("/api/status", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(builds) == 2
+
+def test_status_page_renders_cached_html():
+    """测试状态页渲染，同一版本只渲染一次"""
+    cache = StatusCache(_status, refresh_seconds=5)
+    client = create_monitor_app(status=cache).test_client()
+    
+    page = client.get("/")
+    html = page.get_data(as_text=True)
+    assert page.status_code == 200
+    assert page.content_type.startswith("text/html")
+    assert "❌ 不可用" in html
+    assert "/v1/menu/items" in html
+    assert 'content="5"' in html
+    assert cache.render("html")[1] is cache.render("html")[1]
@@ -0,0 +1,95 @@
+import threading
+import time
+import pytest
+from config.settings import settings
+from utils.token_manager import TokenManager
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self._data = data
+    
+    def json(self):
+        return self._data
+
+class FakeSession:
+    """记录登录次数的假会话"""
+    
+    def __init__(self, status_code=200, expires_in=3600, delay=0.0):
+        self.status_code = status_code
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+    
+    def post(self, url, json=None, headers=None, timeout=None):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append((url, json))
+            count = len(self.calls)
+        return FakeResponse(self.status_code, {"token": f"token-{count}", "expires_in": self.expires_in})
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "tokens.json")
+
+def test_concurrent_get_token_logs_in_once(cache_file):
+    """测试并发获取同一账号的token只登录一次"""
+    session = FakeSession(delay=0.05)
+    manager = TokenManager("http://api", cache_file=cache_file, session=session)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get_token())) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == ["token-1"] * 10
+    assert len(session.calls) == 1
+    assert session.calls[0] == ("http://api/auth/login/email",
+                                {"email": settings.TEST_EMAILS[0], "password": settings.TEST_PASSWORD})
+
+def test_disk_cache_shared_between_managers(cache_file):
+    """测试token写入磁盘后，另一个进程（新的管理器实例）直接复用"""
+    first = TokenManager("http://api", cache_file=cache_file, session=FakeSession())
+    assert first.get_token(settings.TEST_PHONES[0]) == "token-1"
+    
+    session = FakeSession()
+    second = TokenManager("http://api", cache_file=cache_file, session=session)
+    assert second.get_token(settings.TEST_PHONES[0]) == "token-1"
+    assert session.calls == []
+    
+    # 其他环境不共享token
+    other = TokenManager("http://other-api", cache_file=cache_file, session=session)
+    assert other.get_token(settings.TEST_PHONES[0]) == "token-1"
+    assert session.calls[0][0] == "http://other-api/auth/login/phone"
+
+def test_expiring_token_is_refreshed(cache_file, monkeypatch):
+    """测试到达刷新时间的token由后台刷新，刷新前仍返回旧token"""
+    session = FakeSession(expires_in=4 * settings.TOKEN_REFRESH_MARGIN)
+    manager = TokenManager("http://api", cache_file=cache_file, session=session)
+    assert manager.get_token() == "token-1"
+    manager.refresh_expiring()
+    assert len(session.calls) == 1
+    
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 3 * settings.TOKEN_REFRESH_MARGIN + 1)
+    manager.refresh_expiring()
+    assert len(session.calls) == 2
+    assert manager.get_token() == "token-2"
+
+def test_short_lived_token_not_refreshed_on_every_call(cache_file):
+    """测试有效期短于刷新提前量的token不会每次获取都重新登录"""
+    session = FakeSession(expires_in=60)
+    manager = TokenManager("http://api", cache_file=cache_file, session=session)
+    assert manager.get_token() == "token-1"
+    assert manager.get_token() == "token-1"
+    assert len(session.calls) == 1
+
+def test_login_failure_backs_off(cache_file):
+    """测试登录失败后在重试间隔内不再请求登录接口"""
+    session = FakeSession(status_code=401)
+    manager = TokenManager("http://api", cache_file=cache_file, session=session)
+    assert manager.get_token() is None
+    assert manager.get_token() is None
+    assert len(session.calls) == 1
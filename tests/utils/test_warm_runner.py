@@ -0,0 +1,31 @@
+import os
+
+from utils.warm_runner import WarmTestRunner
+
+TEST_MODULE = '''
+STATE = []
+
+def test_isolated():
+    STATE.append(1)
+    assert STATE == [1]
+'''
+
+def test_runs_are_isolated_and_reload_after_code_change(tmp_path):
+    """测试每次运行互不影响，测试代码修改后重启worker使用新代码"""
+    (tmp_path / "tests").mkdir()
+    test_file = tmp_path / "tests" / "test_sample.py"
+    test_file.write_text(TEST_MODULE, encoding="utf-8")
+    log_path = str(tmp_path / "run.log")
+    runner = WarmTestRunner(str(tmp_path), preload_args=["--collect-only", "-q", "-p", "no:cacheprovider", "tests"])
+    try:
+        for _ in range(2):
+            assert runner.popen(["-q", "-p", "no:cacheprovider", "tests"], log_path).wait(timeout=60) == 0
+        assert "1 passed" in open(log_path, encoding="utf-8").read()
+        
+        test_file.write_text(TEST_MODULE.replace("[1]", "[2]"), encoding="utf-8")
+        os.utime(test_file, (0, 0))
+        assert runner.popen(["-q", "-p", "no:cacheprovider", "tests"], log_path).wait(timeout=60) == 1
+        assert runner.status()["restarts"] == 1
+        assert runner.status()["runs"] == 3
+    finally:
+        runner.stop()
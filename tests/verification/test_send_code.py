@@ -1,12 +1,12 @@
 import requests
 import pytest
-import json
 from utils.token_manager import get_auth_headers
 from config.env_config import BASE_URL
+from tests.base_test import BaseAPITest
 from utils.api_validator import is_api_available
 
 @pytest.mark.skip_if_api_unavailable
-class TestSendCode:
+class TestSendCode(BaseAPITest):
     """发送验证码测试类"""
     
     def setup_method(self):
@@ -14,34 +14,12 @@ class TestSendCode:
         if not is_api_available():
             pytest.skip("API不可用")
     
-    def make_request(self, endpoint, payload, expected_status=None):
-        """发送验证码请求"""
-        url = f"{BASE_URL}{endpoint}"
-        headers = get_auth_headers()
-        
-        try:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
-            
-            # 尝试解析JSON响应
-            try:
-                json_data = response.json()
-                print(f"Response: {response.status_code}, {json_data}")
-            except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-                print(f"Response: {response.status_code}, {response.text[:100]}...")
-            
-            if expected_status:
-                assert response.status_code == expected_status
-            return response
-            
-        except requests.exceptions.RequestException as e:
-            pytest.fail(f"请求失败: {e}")
-    
     def test_send_code_email_success(self):
         """测试发送邮箱验证码成功"""
         payload = {
             "email": "test@example.com"
         }
-        response = self.make_request("/auth/send-code/email", payload)
+        response = self.make_request("POST", "/auth/send-code/email", payload)
         assert response.status_code in [200, 201, 404]  # 404表示端点不存在
     
     def test_send_code_phone_success(self):
@@ -49,7 +27,7 @@ class TestSendCode:
         payload = {
             "phone": "1234567890"
         }
-        response = self.make_request("/auth/send-code/phone", payload)
+        response = self.make_request("POST", "/auth/send-code/phone", payload)
         assert response.status_code in [200, 201, 404]  # 404表示端点不存在
     
     @pytest.mark.parametrize("email", [
@@ -62,7 +40,7 @@ class TestSendCode:
         payload = {
             "email": email
         }
-        response = self.make_request("/auth/send-code/email", payload)
+        response = self.make_request("POST", "/auth/send-code/email", payload)
         assert response.status_code in [200, 201, 404]  # 404表示端点不存在
     
     @pytest.mark.parametrize("phone", [
@@ -75,7 +53,7 @@ class TestSendCode:
         payload = {
             "phone": phone
         }
-        response = self.make_request("/auth/send-code/phone", payload)
+        response = self.make_request("POST", "/auth/send-code/phone", payload)
         assert response.status_code in [200, 201, 404]  # 404表示端点不存在
     
     def test_send_code_email_invalid_format(self):
@@ -83,7 +61,7 @@ class TestSendCode:
         payload = {
             "email": "invalid-email"
         }
-        response = self.make_request("/auth/send-code/email", payload)
+        response = self.make_request("POST", "/auth/send-code/email", payload)
         assert response.status_code in [400, 404]  # 404表示端点不存在
     
     def test_send_code_phone_invalid_format(self):
@@ -91,23 +69,23 @@ class TestSendCode:
         payload = {
             "phone": "123"
         }
-        response = self.make_request("/auth/send-code/phone", payload)
+        response = self.make_request("POST", "/auth/send-code/phone", payload)
         assert response.status_code in [400, 404]  # 404表示端点不存在
     
     def test_send_code_email_missing_email(self):
         """测试发送邮箱验证码缺少邮箱"""
         payload = {}
-        response = self.make_request("/auth/send-code/email", payload)
+        response = self.make_request("POST", "/auth/send-code/email", payload)
         assert response.status_code in [400, 404]  # 404表示端点不存在
     
     def test_send_code_phone_missing_phone(self):
         """测试发送手机验证码缺少手机号"""
         payload = {}
-        response = self.make_request("/auth/send-code/phone", payload)
+        response = self.make_request("POST", "/auth/send-code/phone", payload)
         assert response.status_code in [400, 404]  # 404表示端点不存在
 
 # 保持向后兼容的旧测试函数
-def test_send_code_email():
+def test_send_code_email(http_session):
     """测试发送邮箱验证码（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -119,22 +97,15 @@ def test_send_code_email():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Send code to email: {response.status_code}")
         
-        # 尝试解析JSON
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [200, 201, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_send_code_phone():
+def test_send_code_phone(http_session):
     """测试发送手机验证码（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -146,16 +117,9 @@ def test_send_code_phone():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Send code to phone: {response.status_code}")
         
-        # 尝试解析JSON
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [200, 201, 404]
         
     except requests.exceptions.RequestException as e:
@@ -166,7 +130,7 @@ def test_send_code_phone():
     "test002@example.com",
     "test003@example.com"
 ])
-def test_send_code_multiple_emails(email):
+def test_send_code_multiple_emails(http_session, email):
     """测试发送验证码到多个邮箱（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -178,7 +142,7 @@ def test_send_code_multiple_emails(email):
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Send code to {email}: {response.status_code}")
         assert response.status_code in [200, 201, 404]
         
@@ -190,7 +154,7 @@ def test_send_code_multiple_emails(email):
     "9876543210",
     "5555555555"
 ])
-def test_send_code_multiple_phones(phone):
+def test_send_code_multiple_phones(http_session, phone):
     """测试发送验证码到多个手机号（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -202,14 +166,14 @@ def test_send_code_multiple_phones(phone):
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Send code to {phone}: {response.status_code}")
         assert response.status_code in [200, 201, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_send_code_email_invalid_format():
+def test_send_code_email_invalid_format(http_session):
     """测试发送验证码到无效邮箱格式（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -221,21 +185,15 @@ def test_send_code_email_invalid_format():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Send code to invalid email: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [400, 404]
         
     except requests.exceptions.RequestException as e:
         pytest.fail(f"请求失败: {e}")
 
-def test_send_code_phone_invalid_format():
+def test_send_code_phone_invalid_format(http_session):
     """测试发送验证码到无效手机号格式（向后兼容）"""
     if not is_api_available():
         pytest.skip("API不可用")
@@ -247,15 +205,9 @@ def test_send_code_phone_invalid_format():
     headers = get_auth_headers()
     
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
+        response = http_session.post(url, json=payload, headers=headers, timeout=10)
         print(f"Send code to invalid phone: {response.status_code}")
         
-        try:
-            json_data = response.json()
-            print(f"Response: {json_data}")
-        except (json.JSONDecodeError, requests.exceptions.JSONDecodeError):
-            print(f"Response text: {response.text[:100]}...")
-        
         assert response.status_code in [400, 404]
         
     except requests.exceptions.RequestException as e:
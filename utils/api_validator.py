@@ -3,66 +3,159 @@
 API验证器 - 检查API可用性并调整测试行为
 """
 
-import requests
 import json
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import cached_property
 from typing import Dict, List, Optional, Tuple
 from config.env_config import BASE_URL
-from utils.token_manager import get_auth_headers
+from config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows下没有fcntl，退化为仅进程内加锁
+    fcntl = None
+
+# 进程内可用性缓存: base_url -> (是否可用, 探测时间戳)
+_availability_cache: Dict[str, Tuple[bool, float]] = {}
+_availability_lock = threading.Lock()
 
 class APIValidator:
     """API验证器类"""
     
+    # 端点发现时探测的候选路径
+    TEST_ENDPOINTS = [
+        "/auth/login/email",
+        "/auth/login/phone",
+        "/api/auth/login/email", 
+        "/api/auth/login/phone",
+        "/v1/auth/login/email",
+        "/v1/auth/login/phone",
+        "/health",
+        "/status",
+        "/"
+    ]
+    
+    # 单个端点探测超时（秒）
+    PROBE_TIMEOUT = 5
+    # 可用性检查超时（秒）
+    AVAILABILITY_TIMEOUT = 10
+    
     def __init__(self):
         self.base_url = BASE_URL
         self.is_available = None
         self.available_endpoints = []
+        self.endpoint_latencies = {}
+        self.last_latency_ms = None
+        self.last_status_code = None
         self.error_message = ""
     
-    def check_api_availability(self) -> bool:
+    @cached_property
+    def session(self):
+        """
+        探测用的HTTP会话，第一次探测时才导入 requests
+        
+        探测不重试，以便如实反映服务状态；各阶段耗时记录到 latency_registry。
+        只读取缓存结果的调用方（健康检查、测试收集）不需要导入HTTP客户端。
+        """
+        from utils.http_client import PooledSession
+        return PooledSession(retries=0)
+    
+    def check_api_availability(self, timeout: float = AVAILABILITY_TIMEOUT) -> bool:
         """检查API是否可用"""
+        import requests
+        
+        start = time.perf_counter()
         try:
-            response = requests.get(self.base_url, timeout=10)
+            response = self.session.get(self.base_url, timeout=timeout)
+            self.last_latency_ms = (time.perf_counter() - start) * 1000
+            self.last_status_code = response.status_code
             self.is_available = response.status_code in [200, 404]
             if not self.is_available:
                 self.error_message = f"API服务器不可用，状态码: {response.status_code}"
-            return self.is_available
         except requests.exceptions.RequestException as e:
+            self.last_latency_ms = None
+            self.last_status_code = None
             self.is_available = False
             self.error_message = f"无法连接到API服务器: {e}"
-            return False
+        
+        _store_availability(self.base_url, self.is_available)
+        return self.is_available
+    
+    @staticmethod
+    def probe_method(endpoint: str) -> str:
+        """探测端点使用的HTTP方法：认证端点用空body的POST，其余用GET"""
+        if endpoint.startswith("/auth") or endpoint.startswith("/api/auth") or endpoint.startswith("/v1/auth"):
+            return "POST"
+        return "GET"
     
-    def find_working_endpoints(self) -> List[str]:
-        """查找可用的端点"""
-        if not self.check_api_availability():
+    def _probe_endpoint(self, endpoint: str, timeout: float) -> Tuple[bool, Optional[float]]:
+        """探测单个端点，返回 (是否可用, 延迟毫秒)；请求失败时延迟为None"""
+        import requests
+        
+        url = f"{self.base_url}{endpoint}"
+        start = time.perf_counter()
+        try:
+            if self.probe_method(endpoint) == "POST":
+                response = self.session.post(url, json={}, timeout=timeout)
+            else:
+                response = self.session.get(url, timeout=timeout)
+        except requests.exceptions.RequestException:
+            return False, None
+        latency_ms = (time.perf_counter() - start) * 1000
+        return response.status_code != 404, latency_ms
+    
+    def find_working_endpoints(self, parallel: bool = True, deadline: Optional[float] = None) -> List[str]:
+        """
+        查找可用的端点
+        
+        Args:
+            parallel: 是否并发探测所有候选端点
+            deadline: 总截止时间（秒），包括开始时的可用性检查，默认使用 Settings.ENDPOINT_DISCOVERY_DEADLINE，
+                      超时未返回的端点视为不可用
+        """
+        if deadline is None:
+            deadline = settings.ENDPOINT_DISCOVERY_DEADLINE
+        if deadline <= 0:
+            raise ValueError(f"deadline 必须大于0: {deadline}")
+        start = time.monotonic()
+        
+        if not self.check_api_availability(timeout=min(self.AVAILABILITY_TIMEOUT, deadline)):
             return []
         
-        test_endpoints = [
-            "/auth/login/email",
-            "/auth/login/phone",
-            "/api/auth/login/email", 
-            "/api/auth/login/phone",
-            "/v1/auth/login/email",
-            "/v1/auth/login/phone",
-            "/health",
-            "/status",
-            "/"
-        ]
+        results: Dict[str, Tuple[bool, Optional[float]]] = {}
+        remaining = deadline - (time.monotonic() - start)
         
-        working_endpoints = []
+        if parallel and remaining > 0:
+            probe_timeout = min(self.PROBE_TIMEOUT, remaining)
+            executor = ThreadPoolExecutor(max_workers=len(self.TEST_ENDPOINTS))
+            futures = {
+                executor.submit(self._probe_endpoint, endpoint, probe_timeout): endpoint
+                for endpoint in self.TEST_ENDPOINTS
+            }
+            done, _ = wait(futures, timeout=remaining)
+            for future in done:
+                results[futures[future]] = future.result()
+            # 不等待超过截止时间的探测
+            executor.shutdown(wait=False, cancel_futures=True)
+        elif not parallel:
+            for endpoint in self.TEST_ENDPOINTS:
+                remaining = deadline - (time.monotonic() - start)
+                if remaining <= 0:
+                    break
+                results[endpoint] = self._probe_endpoint(endpoint, min(self.PROBE_TIMEOUT, remaining))
         
-        for endpoint in test_endpoints:
-            try:
-                url = f"{self.base_url}{endpoint}"
-                if endpoint.startswith("/auth") or endpoint.startswith("/api/auth") or endpoint.startswith("/v1/auth"):
-                    response = requests.post(url, json={}, timeout=5)
-                else:
-                    response = requests.get(url, timeout=5)
-                
-                if response.status_code != 404:
-                    working_endpoints.append(endpoint)
-                    
-            except requests.exceptions.RequestException:
-                continue
+        working_endpoints = []
+        self.endpoint_latencies = {}
+        for endpoint in self.TEST_ENDPOINTS:
+            is_working, latency_ms = results.get(endpoint, (False, None))
+            self.endpoint_latencies[endpoint] = round(latency_ms, 1) if latency_ms is not None else None
+            if is_working:
+                working_endpoints.append(endpoint)
         
         self.available_endpoints = working_endpoints
         return working_endpoints
@@ -73,7 +166,8 @@ class APIValidator:
             "base_url": self.base_url,
             "is_available": self.is_available,
             "error_message": self.error_message,
-            "available_endpoints": self.available_endpoints
+            "available_endpoints": self.available_endpoints,
+            "endpoint_latencies": self.endpoint_latencies
         }
         
         if self.is_available is None:
@@ -86,6 +180,7 @@ class APIValidator:
         if self.is_available and not self.available_endpoints:
             self.find_working_endpoints()
             status["available_endpoints"] = self.available_endpoints
+            status["endpoint_latencies"] = self.endpoint_latencies
         
         return status
 
@@ -93,10 +188,115 @@ def get_api_validator() -> APIValidator:
     """获取API验证器实例"""
     return APIValidator()
 
-def is_api_available() -> bool:
-    """检查API是否可用的便捷函数"""
-    validator = get_api_validator()
-    return validator.check_api_availability()
+def _availability_cache_path(base_url: str) -> str:
+    """跨进程共享的可用性缓存文件路径（按base_url区分；回放卡带时的结果与真实探测分开保存）"""
+    key = base_url if settings.HTTP_CASSETTE_MODE != "replay" else f"{base_url}#replay"
+    digest = hashlib.md5(key.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(settings.API_AVAILABILITY_CACHE_DIR, f"kiosk_api_availability_{digest}.json")
+
+def _read_shared_availability(base_url: str) -> Optional[Tuple[bool, float]]:
+    """读取其他进程（如xdist worker）写入的可用性结果，过期或损坏时返回None"""
+    try:
+        with open(_availability_cache_path(base_url), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entry = (bool(data["available"]), float(data["checked_at"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    
+    if time.time() - entry[1] >= settings.API_AVAILABILITY_TTL:
+        return None
+    return entry
+
+def _store_availability(base_url: str, available: bool):
+    """记录一次探测结果到进程内缓存和共享缓存文件"""
+    entry = (available, time.time())
+    _availability_cache[base_url] = entry
+    
+    path = _availability_cache_path(base_url)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".kiosk_api_availability_")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"base_url": base_url, "available": entry[0], "checked_at": entry[1]}, f)
+        # 原子替换，避免并发读取到写了一半的文件
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def _cached_availability(base_url: str) -> Optional[bool]:
+    """按TTL返回缓存的可用性结果，优先使用进程内缓存"""
+    entry = _availability_cache.get(base_url)
+    if entry is None or time.time() - entry[1] >= settings.API_AVAILABILITY_TTL:
+        entry = _read_shared_availability(base_url)
+        if entry is None:
+            return None
+        _availability_cache[base_url] = entry
+    return entry[0]
+
+def last_availability_check() -> Optional[float]:
+    """共享缓存文件中最近一次探测的时间戳，不论结果是否可用、是否已过TTL；没有时返回None"""
+    try:
+        with open(_availability_cache_path(BASE_URL), "r", encoding="utf-8") as f:
+            return float(json.load(f)["checked_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def seed_api_availability(available: bool, checked_at: float):
+    """用其他进程（如xdist controller）的探测结果填充进程内缓存，TTL从checked_at起算"""
+    with _availability_lock:
+        _availability_cache[BASE_URL] = (available, checked_at)
+
+def get_cached_api_availability() -> Optional[Tuple[bool, float]]:
+    """返回当前有效的 (是否可用, 探测时间戳)，没有有效缓存时先探测一次"""
+    is_api_available()
+    return _availability_cache.get(BASE_URL)
+
+def invalidate_api_availability():
+    """使缓存的可用性结果失效（例如请求出现连接错误时），下次调用会重新探测"""
+    with _availability_lock:
+        _availability_cache.pop(BASE_URL, None)
+        try:
+            os.remove(_availability_cache_path(BASE_URL))
+        except OSError:
+            pass
+
+def is_api_available(refresh: bool = False) -> bool:
+    """
+    检查API是否可用的便捷函数
+    
+    结果按 Settings.API_AVAILABILITY_TTL 缓存，在线程之间以及xdist worker之间共享，
+    同一TTL窗口内整个测试运行只探测一次。
+    
+    Args:
+        refresh: 忽略缓存强制重新探测
+    """
+    with _availability_lock:
+        if not refresh:
+            cached = _cached_availability(BASE_URL)
+            if cached is not None:
+                return cached
+        
+        lock_file = None
+        if fcntl is not None:
+            try:
+                lock_file = open(_availability_cache_path(BASE_URL) + ".lock", "w")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except OSError:
+                lock_file = None
+        
+        try:
+            # 等待锁期间其他进程可能已完成探测
+            if not refresh and lock_file is not None:
+                shared = _read_shared_availability(BASE_URL)
+                if shared is not None:
+                    _availability_cache[BASE_URL] = shared
+                    return shared[0]
+            
+            validator = get_api_validator()
+            return validator.check_api_availability()
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
 
 def get_working_endpoints() -> List[str]:
     """获取可用端点的便捷函数"""
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+异步探测引擎 - 基于httpx/asyncio并发探测多个环境、realm和门店的API端点
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config.settings import settings
+from utils.api_validator import APIValidator
+from utils.token_manager import get_auth_headers
+
+# 按门店探测的端点，携带 location-id 参数
+LOCATION_PROBE_ENDPOINTS = [
+    "/v1/location/info",
+    "/v1/menu/items"
+]
+
+def build_probe_targets(base_urls: Optional[List[str]] = None,
+                        realm_ids: Optional[List[str]] = None,
+                        location_ids: Optional[List[str]] = None) -> List[Dict]:
+    """
+    生成探测目标列表
+    
+    每个 base_url × realm 组合探测 APIValidator.TEST_ENDPOINTS，
+    每个门店额外探测 LOCATION_PROBE_ENDPOINTS。
+    """
+    base_urls = base_urls or settings.MONITOR_BASE_URLS
+    realm_ids = realm_ids or settings.MONITOR_REALM_IDS
+    location_ids = settings.MONITOR_LOCATION_IDS if location_ids is None else location_ids
+    
+    targets = []
+    for base_url in base_urls:
+        for realm_id in realm_ids:
+            headers = get_auth_headers(realm_id=realm_id)
+            
+            for endpoint in APIValidator.TEST_ENDPOINTS:
+                targets.append({
+                    "base_url": base_url,
+                    "realm_id": realm_id,
+                    "location_id": None,
+                    "endpoint": endpoint,
+                    "method": APIValidator.probe_method(endpoint),
+                    "url": f"{base_url}{endpoint}",
+                    "params": None,
+                    "headers": headers
+                })
+            
+            for location_id in location_ids:
+                for endpoint in LOCATION_PROBE_ENDPOINTS:
+                    targets.append({
+                        "base_url": base_url,
+                        "realm_id": realm_id,
+                        "location_id": location_id,
+                        "endpoint": endpoint,
+                        "method": "GET",
+                        "url": f"{base_url}{endpoint}",
+                        "params": {"location-id": location_id},
+                        "headers": headers
+                    })
+    return targets
+
+class AsyncProbeEngine:
+    """
+    异步探测引擎：全局并发上限 + 每个主机的连接上限 + 单次探测超时
+    
+    transport 可替换httpx的传输层（测试中使用 httpx.MockTransport）。
+    """
+    
+    def __init__(self, concurrency: Optional[int] = None, per_host_limit: Optional[int] = None,
+                 timeout: Optional[float] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.concurrency = concurrency or settings.MONITOR_PROBE_CONCURRENCY
+        self.per_host_limit = per_host_limit or settings.MONITOR_PER_HOST_LIMIT
+        self.timeout = settings.MONITOR_PROBE_TIMEOUT if timeout is None else timeout
+        self.transport = transport
+    
+    async def _probe(self, client: httpx.AsyncClient, target: Dict,
+                     global_limit: asyncio.Semaphore, host_limits: Dict[str, asyncio.Semaphore]) -> Dict:
+        """探测单个目标"""
+        result = {
+            "base_url": target["base_url"],
+            "realm_id": target["realm_id"],
+            "location_id": target["location_id"],
+            "endpoint": target["endpoint"],
+            "method": target["method"],
+            "status_code": None,
+            "ok": False,
+            "latency_ms": None,
+            "error": ""
+        }
+        host = urlsplit(target["url"]).netloc
+        
+        # 先取主机的名额再取全局名额：等待繁忙主机的探测不占用全局名额，不会阻塞其他主机
+        async with host_limits[host], global_limit:
+            start = time.perf_counter()
+            try:
+                if target["method"] == "POST":
+                    response = await client.post(target["url"], json={}, headers=target["headers"])
+                else:
+                    response = await client.get(target["url"], params=target["params"], headers=target["headers"])
+                result["status_code"] = response.status_code
+                # 比 APIValidator._probe_endpoint 严格：那里只把404算作不可用（用于发现存在的端点），
+                # 这里404表示端点不存在，5xx表示服务异常，都算探测失败；endpoint_health 据此判断要跳过的测试
+                result["ok"] = response.status_code != 404 and response.status_code < 500
+            except httpx.HTTPError as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        
+        return result
+    
+    async def run_async(self, targets: List[Dict]) -> List[Dict]:
+        """并发探测所有目标，结果顺序与targets一致"""
+        global_limit = asyncio.Semaphore(self.concurrency)
+        host_limits = {
+            urlsplit(target["url"]).netloc: asyncio.Semaphore(self.per_host_limit)
+            for target in targets
+        }
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits, transport=self.transport) as client:
+            return await asyncio.gather(*[
+                self._probe(client, target, global_limit, host_limits) for target in targets
+            ])
+    
+    def run(self, targets: List[Dict]) -> List[Dict]:
+        """同步入口，供定时任务调用"""
+        return asyncio.run(self.run_async(targets))
+
+def summarize_probe_results(results: List[Dict]) -> Dict:
+    """按 环境/realm 汇总探测结果"""
+    summary = {
+        "total": len(results),
+        "ok": sum(1 for r in results if r["ok"]),
+        "failed": [r for r in results if not r["ok"]],
+        "by_realm": {}
+    }
+    for r in results:
+        key = f"{r['base_url']} [{r['realm_id']}]"
+        group = summary["by_realm"].setdefault(key, {"total": 0, "ok": 0})
+        group["total"] += 1
+        group["ok"] += 1 if r["ok"] else 0
+    return summary
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+HTTP录制回放 - 在 PooledSession 的传输层录制请求/响应，之后离线回放
+
+record 模式照常请求API并把响应写入SQLite卡带（响应体zlib压缩，按匹配键建索引）；
+replay 模式启动时把卡带读入内存，请求按 方法+路径+查询参数+请求体 匹配录制的响应，不访问网络。
+录制前脱敏：认证相关的响应头和JSON响应体中的token、密码等字段替换为 REDACTED，回放得到的token只是占位符。
+共享会话、RequestHandler、token管理器和可用性探测都经过 PooledSession，因此一起被录制和回放。
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config.settings import settings
+
+MODES = ("off", "record", "replay")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_key TEXT NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    reason TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interactions_key ON interactions (match_key, id);
+"""
+
+REDACTED = "REDACTED"
+# 录制时脱敏的响应头，以及JSON响应体中名称包含这些词的字段
+_SENSITIVE_HEADERS = ("authorization", "proxy-authorization", "set-cookie", "cookie", "x-api-key", "x-auth-token")
+_SENSITIVE_KEY = re.compile(r"token|secret|passw|authorization|api_?key|cookie|session", re.IGNORECASE)
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """回放模式下没有匹配的录制；按连接错误处理，测试照常失败或跳过"""
+
+def _canonical_body(body) -> bytes:
+    """请求体的规范形式：JSON按键排序后序列化，其余原样比较"""
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        return body
+
+def _redact_value(value):
+    """递归替换JSON中敏感字段的值；字段值是对象或数组时继续向下处理"""
+    if isinstance(value, dict):
+        redacted = {}
+        for key, item in value.items():
+            if _SENSITIVE_KEY.search(key) and isinstance(item, (str, int, float)) and not isinstance(item, bool):
+                redacted[key] = REDACTED
+            else:
+                redacted[key] = _redact_value(item)
+        return redacted
+    if isinstance(value, list):
+        return [_redact_value(item) for item in value]
+    return value
+
+def redact_headers(headers) -> Dict[str, str]:
+    """认证相关的响应头替换为 REDACTED"""
+    return {name: REDACTED if name.lower() in _SENSITIVE_HEADERS else value for name, value in headers.items()}
+
+def redact_body(body: bytes) -> bytes:
+    """JSON响应体中的敏感字段替换为 REDACTED；不是JSON的响应体原样返回"""
+    try:
+        data = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return body
+    redacted = _redact_value(data)
+    if redacted == data:
+        return body
+    return json.dumps(redacted, ensure_ascii=False).encode("utf-8")
+
+def match_key(method: str, url: str, body=None) -> str:
+    """
+    请求的匹配键：方法、路径、排序后的查询参数和规范化的请求体
+    
+    不含协议和主机，同一份卡带可以在指向不同主机的 BASE_URL 下回放。
+    """
+    parts = urlsplit(url)
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    digest = hashlib.sha1(_canonical_body(body))
+    return f"{method.upper()} {parts.path or '/'}?{json.dumps(query, ensure_ascii=False)} {digest.hexdigest()}"
+
+class Cassette:
+    """
+    SQLite中的录制卡带
+    
+    同一请求可以有多条录制（例如创建后再查询），回放时按录制顺序依次返回，用完后重复最后一条。
+    录制时每个匹配键在本进程第一次写入前删除旧的录制，重新录制即可覆盖过时的响应。
+    """
+    
+    def __init__(self, path: str, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"不支持的卡带模式: {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # 回放：匹配键 -> 按录制顺序排列的响应；播放进度
+        self._entries: Dict[str, List[tuple]] = {}
+        self._played: Dict[str, int] = {}
+        # 录制：本进程已覆盖过旧录制的匹配键
+        self._rerecorded = set()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        if mode == "replay":
+            self._load()
+        else:
+            self._connect()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+    
+    def _load(self):
+        """一次读入全部录制，回放时只查内存；卡带不存在时所有请求都未命中"""
+        if not os.path.exists(self.path):
+            return
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT match_key, status_code, reason, headers, body FROM interactions ORDER BY id"
+            ).fetchall()
+        except sqlite3.Error:
+            rows = []
+        finally:
+            conn.close()
+        for key, *entry in rows:
+            self._entries.setdefault(key, []).append(tuple(entry))
+    
+    def __len__(self) -> int:
+        if self.mode == "replay":
+            return sum(len(entries) for entries in self._entries.values())
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+    
+    def play(self, key: str) -> Optional[Dict]:
+        """返回下一条匹配的录制 {"status_code", "reason", "headers", "body"}，没有时返回None"""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+            self.hits += 1
+        status_code, reason, headers, body = entries[min(index, len(entries) - 1)]
+        return {"status_code": status_code, "reason": reason, "headers": json.loads(headers),
+                "body": zlib.decompress(body)}
+    
+    def record(self, key: str, method: str, url: str, response: requests.Response):
+        # requests 已经按 Content-Encoding 解压，保存的是解压后的内容，去掉相应的头
+        headers = redact_headers({name: value for name, value in response.headers.items()
+                                  if name.lower() not in ("content-encoding", "transfer-encoding", "content-length")})
+        row = (key, method.upper(), url, response.status_code, response.reason,
+               json.dumps(headers, ensure_ascii=False), zlib.compress(redact_body(response.content)), time.time())
+        with self._lock:
+            conn = self._connect()
+            if key not in self._rerecorded:
+                conn.execute("DELETE FROM interactions WHERE match_key = ?", (key,))
+                self._rerecorded.add(key)
+            conn.execute(
+                "INSERT INTO interactions (match_key, method, url, status_code, reason, headers, body, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row
+            )
+            self.recorded += 1
+    
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class CassetteAdapter(BaseAdapter):
+    """
+    requests传输适配器：录制时把请求交给真实的适配器并保存响应，回放时直接从卡带构造响应
+    
+    录制时会读取完整的响应体（stream=True 的请求也一样）。
+    """
+    
+    def __init__(self, cassette: Cassette, adapter: Optional[BaseAdapter] = None):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+    
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = match_key(request.method, request.url, request.body)
+        if self.cassette.mode == "replay":
+            entry = self.cassette.play(key)
+            if entry is None:
+                raise CassetteMissError(f"卡带中没有匹配的录制: {request.method} {request.url}", request=request)
+            return self._build_response(request, entry)
+        
+        response = self.adapter.send(request, stream=stream, timeout=timeout, verify=verify,
+                                     cert=cert, proxies=proxies)
+        self.cassette.record(key, request.method, request.url, response)
+        return response
+    
+    def _build_response(self, request, entry: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry["body"]
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+    
+    def close(self):
+        if self.adapter is not None:
+            self.adapter.close()
+
+_active: Optional[Cassette] = None
+_active_lock = threading.Lock()
+
+def active_cassette() -> Optional[Cassette]:
+    """按 Settings.HTTP_CASSETTE_MODE / HTTP_CASSETTE_PATH 返回进程内共享的卡带，off 时返回None"""
+    global _active
+    mode = settings.HTTP_CASSETTE_MODE
+    if mode == "off":
+        return None
+    with _active_lock:
+        if _active is None or _active.mode != mode or _active.path != settings.HTTP_CASSETTE_PATH:
+            if _active is not None:
+                _active.close()
+            _active = Cassette(settings.HTTP_CASSETTE_PATH, mode)
+        return _active
+
+def close_cassette() -> Optional[Dict[str, int]]:
+    """关闭共享卡带，返回命中、未命中和录制的数量"""
+    global _active
+    with _active_lock:
+        if _active is None:
+            return None
+        stats = _active.stats()
+        _active.close()
+        _active = None
+        return stats
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+测试收集缓存 - 按源码文件的mtime缓存一次完整收集的结果（nodeid、标记、参数化）
+
+代码未修改时 pytest --collect-only（包括 -q、-v）直接输出缓存，不导入测试模块；
+监控也用它判断要运行的nodeid是否仍然存在。
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import pytest
+
+from config.settings import settings
+
+CACHE_VERSION = 2
+# 这些目录下的 .py 文件决定收集结果（测试文件、conftest以及测试导入的模块）
+WATCH_DIRS = ("tests", "utils", "config", "scripts")
+CONFIG_FILES = ("pytest.ini", "conftest.py", "setup.cfg", "tox.ini", "pyproject.toml")
+
+def source_files(rootdir: str, watch_dirs: Sequence[str] = WATCH_DIRS) -> tuple:
+    """被监视目录下所有 .py 文件以及pytest配置文件的 (路径, mtime_ns, 大小)"""
+    paths = []
+    for name in watch_dirs:
+        for directory, dirnames, files in os.walk(os.path.join(rootdir, name)):
+            dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+            paths.extend(os.path.join(directory, filename) for filename in files if filename.endswith(".py"))
+    paths.extend(os.path.join(rootdir, filename) for filename in CONFIG_FILES)
+    entries = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((os.path.relpath(path, rootdir), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+def source_signature(rootdir: str, watch_dirs: Sequence[str] = WATCH_DIRS) -> str:
+    """源码和运行环境的摘要，任一文件修改、增删或pytest升级后改变"""
+    digest = hashlib.sha1(repr((CACHE_VERSION, sys.version, pytest.__version__)).encode("utf-8"))
+    digest.update(repr(source_files(rootdir, watch_dirs)).encode("utf-8"))
+    return digest.hexdigest()
+
+class CollectionCache:
+    """保存在JSON文件中的收集结果，签名不一致时视为失效"""
+    
+    def __init__(self, rootdir: str, path: Optional[str] = None):
+        self.rootdir = rootdir
+        self.path = path or settings.TEST_COLLECTION_CACHE
+    
+    def load(self, signature: Optional[str] = None) -> Optional[List[Dict]]:
+        """返回缓存的测试列表，不存在或已失效时返回None"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("signature") != (signature or source_signature(self.rootdir)):
+            return None
+        return data.get("items")
+    
+    def save(self, signature: str, items: List[Dict]):
+        data = {"signature": signature, "created_at": datetime.now().isoformat(), "items": items}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".collection_cache_")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+def collected_nodeids(rootdir: str, path: Optional[str] = None) -> Optional[Set[str]]:
+    """
+    缓存中的nodeid及其去掉参数化后缀的形式，缓存不存在或源码已修改时返回None
+    """
+    items = CollectionCache(rootdir, path).load()
+    if items is None:
+        return None
+    return {item["nodeid"] for item in items} | {item["nodeid"].split("[", 1)[0] for item in items}
+
+def _collector_record(node) -> List:
+    """--collect-only 树形输出中的一行 [nodeid, 显示名, 文档字符串]"""
+    obj = getattr(node, "obj", None)
+    return [node.nodeid, str(node), (inspect.getdoc(obj) if obj else None) or None]
+
+def item_record(item) -> Dict:
+    """缓存中的一个测试：nodeid、标记、参数化id、-k 匹配用的名称以及所在的收集器链"""
+    markers = sorted({marker.name for marker in item.iter_markers()})
+    names = {node.name for node in item.listchain() if not isinstance(node, pytest.Session)}
+    names.update(item.listextrakeywords())
+    return {
+        "nodeid": item.nodeid,
+        "markers": markers,
+        "params": item.callspec.id if hasattr(item, "callspec") else None,
+        "keywords": sorted(names | set(markers)),
+        "chain": [_collector_record(node) for node in item.listchain()[1:]]
+    }
+
+def _selection(config) -> Optional[List[str]]:
+    """
+    命令行参数转换为相对rootdir的nodeid前缀，"" 表示全部；无法转换时返回None
+    
+    路径不存在时也返回None，交给真正的收集报告 "file or directory not found"。
+    """
+    rootdir = str(config.rootpath)
+    selection = []
+    for arg in config.args:
+        path, sep, rest = str(arg).partition("::")
+        if not os.path.exists(path):
+            return None
+        relative = os.path.relpath(os.path.abspath(path), rootdir)
+        if relative.startswith(".."):
+            return None
+        relative = "" if relative == "." else relative.replace(os.sep, "/")
+        selection.append(f"{relative}::{rest}" if sep else relative)
+    return selection or [""]
+
+def _write_collected(reporter, items: List[Dict], verbosity: int):
+    """按 TerminalReporter._printcollecteditems 的格式输出缓存中的测试"""
+    if verbosity < -1:
+        counts: Dict[str, int] = {}
+        for item in items:
+            path = item["nodeid"].split("::", 1)[0]
+            counts[path] = counts.get(path, 0) + 1
+        for path, count in sorted(counts.items()):
+            reporter.write_line(f"{path}: {count}")
+        return
+    if verbosity == -1:
+        for item in items:
+            reporter.write_line(item["nodeid"])
+        return
+    stack: List[str] = []
+    for item in items:
+        chain = item["chain"]
+        needed = [node[0] for node in chain]
+        while stack and stack != needed[:len(stack)]:
+            stack.pop()
+        for nodeid, label, doc in chain[len(stack):]:
+            stack.append(nodeid)
+            indent = (len(stack) - 1) * "  "
+            reporter.write_line(f"{indent}{label}")
+            if verbosity >= 1 and doc:
+                for line in doc.splitlines():
+                    reporter.write_line(f"{indent}  {line}")
+
+def _matches(nodeid: str, prefix: str) -> bool:
+    return (not prefix or nodeid == prefix or nodeid.startswith(prefix + "::")
+            or nodeid.startswith(prefix + "/") or nodeid.startswith(prefix + "["))
+
+class CollectionCachePlugin:
+    """
+    pytest插件
+    
+    完整收集（不带 -k/-m、--deselect 等过滤）结束后写入缓存；缓存有效时 --collect-only
+    按命令行的路径、-k 和 -m 过滤缓存，以与正常收集相同的格式（-q 的nodeid列表、默认和 -v 的树形）
+    直接输出，跳过导入测试模块和收集钩子。
+    """
+    
+    # 这些选项会改变收集结果，出现时不读也不写缓存
+    BYPASS_OPTIONS = ("deselect", "ignore", "ignore_glob", "lf", "failedfirst", "newfirst", "stepwise", "pyargs")
+    
+    def __init__(self, config, path: Optional[str] = None):
+        self.config = config
+        self.cache = CollectionCache(str(config.rootpath), path)
+        self.signature = source_signature(str(config.rootpath))
+        self._records: Dict[str, Dict] = {}
+    
+    def _bypassed(self) -> bool:
+        option = self.config.option
+        return any(getattr(option, name, None) for name in self.BYPASS_OPTIONS)
+    
+    def _filtered(self, items: List[Dict]) -> Optional[Tuple[List[Dict], List[Dict]]]:
+        """
+        按命令行参数选出测试，再按 -k 和 -m 过滤，返回 (选中的测试, 取消选择的测试)；
+        无法在缓存上求值时返回None
+        """
+        from _pytest.mark.expression import Expression
+        
+        selection = _selection(self.config)
+        if selection is None:
+            return None
+        keyword = self.config.option.keyword
+        markexpr = self.config.option.markexpr
+        if "(" in markexpr:
+            # 带参数的标记表达式需要标记的参数，缓存中没有
+            return None
+        keyword_expr = Expression.compile(keyword) if keyword else None
+        mark_expr = Expression.compile(markexpr) if markexpr else None
+        
+        selected = []
+        deselected = []
+        seen = set()
+        for prefix in selection:
+            for item in items:
+                if item["nodeid"] in seen or not _matches(item["nodeid"], prefix):
+                    continue
+                seen.add(item["nodeid"])
+                names = [name.lower() for name in item["keywords"]]
+                if keyword_expr and not keyword_expr.evaluate(lambda sub: any(sub.lower() in name for name in names)):
+                    deselected.append(item)
+                elif mark_expr and not mark_expr.evaluate(lambda name, **kwargs: name in item["markers"]):
+                    deselected.append(item)
+                else:
+                    selected.append(item)
+        return selected, deselected
+    
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection(self, session):
+        """--collect-only 且缓存有效时直接输出缓存中的测试"""
+        config = self.config
+        if not config.option.collectonly or self._bypassed():
+            return None
+        items = self.cache.load(self.signature)
+        if items is None:
+            return None
+        try:
+            filtered = self._filtered(items)
+        except Exception:
+            return None
+        if filtered is None:
+            return None
+        selected, deselected = filtered
+        
+        reporter = config.pluginmanager.get_plugin("terminalreporter")
+        if reporter is not None:
+            # 本钩子返回后终端报告插件的 pytest_collection 不再被调用，由这里输出 "collecting ..."；
+            # "collected N items" 和结尾的统计行按收集和取消选择的数量输出，与正常收集一致
+            reporter.pytest_collection()
+            reporter._numcollected = len(selected) + len(deselected)
+            reporter.stats.setdefault("deselected", []).extend(item["nodeid"] for item in deselected)
+            reporter.report_collect(True)
+            if selected and config.option.verbose > -1:
+                reporter.write_line("")
+            _write_collected(reporter, selected, config.get_verbosity(pytest.Config.VERBOSITY_TEST_CASES))
+        session.testscollected = len(selected) + len(deselected)
+        return True
+    
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, config, items):
+        # 在其他插件添加跳过标记、按 -k/-m 取消选择之前记录
+        self._records = {item.nodeid: item_record(item) for item in items}
+    
+    def pytest_collection_finish(self, session):
+        """完整收集结束后更新缓存"""
+        config = self.config
+        if not session.items or self._bypassed() or config.option.keyword or config.option.markexpr:
+            return
+        source = getattr(config, "args_source", None)
+        if _selection(config) != [""] and getattr(source, "name", None) != "TESTPATHS":
+            return
+        self.cache.save(self.signature, [self._records.get(item.nodeid) or item_record(item) for item in session.items])
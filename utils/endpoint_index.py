@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+端点-测试索引 - 静态分析测试文件，记录每个测试请求的端点模板
+
+监控按端点探测结果选择测试：只运行端点健康状态或延迟发生变化的测试，
+已知不可用端点的测试在收集阶段直接跳过，不发出请求。
+"""
+
+import ast
+import os
+import statistics
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.latency_histogram import endpoint_template
+
+# 发出HTTP请求的方法：参数中 f"{BASE_URL}..." 形式的URL视为请求的端点
+REQUEST_CALLS = {"get", "post", "put", "patch", "delete", "head", "request"}
+# 直接接收端点路径的辅助方法（BaseAPITest.make_request）
+PATH_CALLS = {"make_request"}
+
+# 文件路径 -> (mtime, {测试名: 端点列表})
+_file_cache: Dict[str, Tuple[float, Dict[str, List[str]]]] = {}
+_file_cache_lock = threading.Lock()
+
+def base_nodeid(nodeid: str) -> str:
+    """去掉参数化后缀，tests/a.py::test_x[1] -> tests/a.py::test_x"""
+    return nodeid.split("[", 1)[0]
+
+def _module_constants(tree: ast.Module) -> Dict[str, str]:
+    """模块顶层的字符串常量，例如 CREATE_ORDER_ENDPOINT = "/v1/orders" """
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    constants[target.id] = node.value.value
+    return constants
+
+def _url_path(node: ast.JoinedStr, constants: Dict[str, str]) -> Optional[str]:
+    """f"{BASE_URL}/v1/orders/{order_id}" -> /v1/orders/{id}；不以 BASE_URL 开头时返回None"""
+    values = node.values
+    if not values or not isinstance(values[0], ast.FormattedValue):
+        return None
+    head = values[0].value
+    if not (isinstance(head, ast.Name) and head.id == "BASE_URL"):
+        return None
+    parts = []
+    for value in values[1:]:
+        if isinstance(value, ast.Constant):
+            parts.append(str(value.value))
+        elif isinstance(value.value, ast.Name) and value.value.id in constants:
+            parts.append(constants[value.value.id])
+        else:
+            parts.append("{id}")
+    return "".join(parts) or "/"
+
+def _endpoints(function: ast.AST, constants: Dict[str, str]) -> List[str]:
+    """函数体内请求的端点模板：赋值给变量或传给请求方法的URL，以及传给 make_request 的路径"""
+    urls = []
+    paths = set()
+    for node in ast.walk(function):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.JoinedStr):
+            urls.append(node.value)
+        elif isinstance(node, ast.Call):
+            func = node.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            arguments = list(node.args) + [keyword.value for keyword in node.keywords]
+            if name in REQUEST_CALLS:
+                urls.extend(arg for arg in arguments if isinstance(arg, ast.JoinedStr))
+            elif name in PATH_CALLS:
+                for arg in arguments:
+                    if isinstance(arg, ast.Name):
+                        value = constants.get(arg.id)
+                    elif isinstance(arg, ast.Constant):
+                        value = arg.value
+                    else:
+                        continue
+                    if isinstance(value, str) and value.startswith("/"):
+                        paths.add(value)
+    for url in urls:
+        path = _url_path(url, constants)
+        if path is not None:
+            paths.add(path)
+    return sorted({endpoint_template(path) for path in paths})
+
+def scan_test_file(path: str) -> Dict[str, List[str]]:
+    """
+    返回文件中每个测试请求的端点：{"test_x" 或 "TestClass::test_x": [端点模板]}
+    
+    只识别 f"{BASE_URL}..." 形式的URL和传给 make_request 的路径；
+    通过辅助函数发出的请求由运行时记录的端点补充（见 EndpointIndex.observe）。按mtime缓存。
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    with _file_cache_lock:
+        cached = _file_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return {}
+    constants = _module_constants(tree)
+    tests = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test"):
+            tests[node.name] = _endpoints(node, constants)
+        elif isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and child.name.startswith("test"):
+                    tests[f"{node.name}::{child.name}"] = _endpoints(child, constants)
+    
+    with _file_cache_lock:
+        _file_cache[path] = (mtime, tests)
+    return tests
+
+def item_endpoints(path: str, nodeid: str) -> List[str]:
+    """pytest收集到的测试项请求的端点"""
+    _, _, name = base_nodeid(nodeid).partition("::")
+    return scan_test_file(str(path)).get(name, [])
+
+class EndpointIndex:
+    """
+    测试（不含参数化后缀的nodeid）到端点模板的索引
+    
+    静态分析的结果与测试运行时实际请求过的端点合并，用于按端点反查测试。
+    """
+    
+    def __init__(self, tests: Optional[Dict[str, List[str]]] = None):
+        self._lock = threading.Lock()
+        self.tests: Dict[str, Set[str]] = {nodeid: set(endpoints) for nodeid, endpoints in (tests or {}).items()}
+        self.observed: Dict[str, Set[str]] = {}
+    
+    @classmethod
+    def scan(cls, tests_dir: str, rootdir: str) -> "EndpointIndex":
+        """扫描 tests_dir 下的 test_*.py，nodeid 相对于 rootdir"""
+        tests = {}
+        for directory, _, files in os.walk(tests_dir):
+            for filename in sorted(files):
+                if not (filename.startswith("test_") and filename.endswith(".py")):
+                    continue
+                path = os.path.join(directory, filename)
+                relative = os.path.relpath(path, rootdir).replace(os.sep, "/")
+                for name, endpoints in scan_test_file(path).items():
+                    tests[f"{relative}::{name}"] = endpoints
+        return cls(tests)
+    
+    def refresh(self, tests_dir: str, rootdir: str):
+        """重新扫描测试文件（未修改的文件使用缓存），保留仍然存在的测试的运行时记录"""
+        scanned = EndpointIndex.scan(tests_dir, rootdir)
+        with self._lock:
+            self.tests = scanned.tests
+            self.observed = {nodeid: endpoints for nodeid, endpoints in self.observed.items() if nodeid in self.tests}
+    
+    def observe(self, records: Iterable[Dict]):
+        """合并结果流中每个测试实际请求过的端点（"方法 端点模板"）"""
+        with self._lock:
+            for record in records:
+                if record.get("event") != "test" or not record.get("endpoints"):
+                    continue
+                endpoints = self.observed.setdefault(base_nodeid(record["nodeid"]), set())
+                endpoints.update(entry.split(" ", 1)[-1] for entry in record["endpoints"])
+    
+    def endpoints_for(self, nodeid: str) -> Set[str]:
+        nodeid = base_nodeid(nodeid)
+        with self._lock:
+            return self.tests.get(nodeid, set()) | self.observed.get(nodeid, set())
+    
+    def tests_for(self, endpoints: Iterable[str]) -> List[str]:
+        """请求过任一端点的测试"""
+        wanted = set(endpoints)
+        with self._lock:
+            nodeids = set(self.tests) | set(self.observed)
+            return sorted(
+                nodeid for nodeid in nodeids
+                if wanted & (self.tests.get(nodeid, set()) | self.observed.get(nodeid, set()))
+            )
+
+def endpoint_health(results: Iterable[Dict], base_url: str) -> Dict[str, Dict]:
+    """
+    按端点汇总一轮探测中 base_url 的结果：{端点: {"up": bool, "latency_ms": 中位数}}
+    
+    所有realm和门店的探测都是连接错误或5xx时端点才算不可用；404说明端点不存在，
+    测试可能正是在验证这种响应，不算不可用。
+    """
+    grouped: Dict[str, List[Dict]] = {}
+    for r in results:
+        if r["base_url"] == base_url:
+            grouped.setdefault(r["endpoint"], []).append(r)
+    health = {}
+    for endpoint, probes in grouped.items():
+        answered = [r for r in probes if r["status_code"] is not None and r["status_code"] < 500]
+        latencies = [r["latency_ms"] for r in answered if r["latency_ms"] is not None]
+        health[endpoint] = {
+            "up": bool(answered),
+            "latency_ms": round(statistics.median(latencies), 1) if latencies else None
+        }
+    return health
+
+def changed_endpoints(previous: Dict[str, Dict], current: Dict[str, Dict],
+                      latency_ratio: float, latency_min_ms: float) -> List[str]:
+    """可用状态变化，或延迟变化超过 latency_ratio 倍且至少 latency_min_ms 毫秒的端点"""
+    changed = []
+    for endpoint, now in current.items():
+        before = previous.get(endpoint)
+        if before is None:
+            continue
+        if before["up"] != now["up"]:
+            changed.append(endpoint)
+            continue
+        old, new = before["latency_ms"], now["latency_ms"]
+        if old and new and abs(new - old) >= latency_min_ms and max(old, new) / min(old, new) >= latency_ratio:
+            changed.append(endpoint)
+    return sorted(changed)
+
+def down_endpoints(health: Dict[str, Dict]) -> List[str]:
+    return sorted(endpoint for endpoint, state in health.items() if not state["up"])
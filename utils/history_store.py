@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+监控历史存储 - 把每次探测和每个测试结果追加写入本地SQLite（WAL模式），支持按时间范围查询和降采样
+
+容器重启后历史仍然保留；可选使用 docker-compose 中的 redis 服务作为后端。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from config.settings import settings
+
+PROBE_FIELDS = ("timestamp", "kind", "base_url", "realm_id", "location_id", "endpoint",
+                "method", "status_code", "ok", "latency_ms", "error")
+TEST_FIELDS = ("timestamp", "run_id", "nodeid", "outcome", "duration", "endpoints", "message")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    timestamp REAL NOT NULL,
+    kind TEXT NOT NULL,
+    base_url TEXT,
+    realm_id TEXT,
+    location_id TEXT,
+    endpoint TEXT,
+    method TEXT,
+    status_code INTEGER,
+    ok INTEGER NOT NULL,
+    latency_ms REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_probes_timestamp ON probes (timestamp);
+CREATE INDEX IF NOT EXISTS idx_probes_endpoint ON probes (endpoint, timestamp);
+CREATE TABLE IF NOT EXISTS test_results (
+    timestamp REAL NOT NULL,
+    run_id TEXT,
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL,
+    endpoints TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_test_results_timestamp ON test_results (timestamp);
+CREATE INDEX IF NOT EXISTS idx_test_results_nodeid ON test_results (nodeid, timestamp);
+"""
+
+def probe_row(result: Dict, kind: str = "fleet", timestamp: Optional[float] = None) -> Dict:
+    """把一次探测结果（AsyncProbeEngine的结果或单次状态检查）转换为存储记录"""
+    return {
+        "timestamp": time.time() if timestamp is None else timestamp,
+        "kind": kind,
+        "base_url": result.get("base_url"),
+        "realm_id": result.get("realm_id"),
+        "location_id": result.get("location_id"),
+        "endpoint": result.get("endpoint"),
+        "method": result.get("method"),
+        "status_code": result.get("status_code"),
+        "ok": 1 if result.get("ok") else 0,
+        "latency_ms": result.get("latency_ms"),
+        "error": result.get("error") or ""
+    }
+
+def result_row(record: Dict) -> Dict:
+    """把结果流中的一条测试记录转换为存储记录，ISO时间戳转为epoch秒"""
+    timestamp = record.get("timestamp")
+    try:
+        timestamp = datetime.fromisoformat(timestamp).timestamp() if isinstance(timestamp, str) else float(timestamp)
+    except (TypeError, ValueError):
+        timestamp = time.time()
+    return {
+        "timestamp": timestamp,
+        "run_id": record.get("run_id"),
+        "nodeid": record["nodeid"],
+        "outcome": record["outcome"],
+        "duration": record.get("duration"),
+        "endpoints": json.dumps(record.get("endpoints", []), ensure_ascii=False),
+        "message": record.get("message", "")
+    }
+
+def _bucket_stats(start: float, rows: List[Dict]) -> Dict:
+    """一个降采样时间桶的统计"""
+    latencies = [row["latency_ms"] for row in rows if row["latency_ms"] is not None]
+    ok = sum(row["ok"] for row in rows)
+    return {
+        "start": datetime.fromtimestamp(start).isoformat(),
+        "checks": len(rows),
+        "ok": ok,
+        "uptime_percent": round(ok / len(rows) * 100, 3),
+        "latency_mean_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+        "latency_max_ms": round(max(latencies), 1) if latencies else None
+    }
+
+class HistoryStore:
+    """
+    SQLite历史存储
+    
+    只追加写入，按时间戳和端点建索引；WAL模式下监控进程写入时报告和面板可以并发读取。
+    一个连接在线程间共享，由锁串行化。
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.HISTORY_DB_PATH
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def _insert(self, table: str, fields: tuple, rows: Iterable[Dict]) -> int:
+        values = [tuple(row[field] for field in fields) for row in rows]
+        if not values:
+            return 0
+        sql = f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})"
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(sql, values)
+        return len(values)
+    
+    def record_probes(self, rows: Iterable[Dict]) -> int:
+        """批量写入探测记录（probe_row的返回值），一次事务"""
+        return self._insert("probes", PROBE_FIELDS, rows)
+    
+    def record_test_results(self, records: Iterable[Dict]) -> int:
+        """写入结果流中的测试记录，忽略start/finish等其他事件"""
+        return self._insert("test_results", TEST_FIELDS,
+                            (result_row(r) for r in records if r.get("event") == "test"))
+    
+    def query_probes(self, since: Optional[float] = None, until: Optional[float] = None,
+                     endpoint: Optional[str] = None, kind: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[Dict]:
+        """按时间顺序返回时间范围内的探测记录"""
+        where, args = self._range(since, until)
+        if endpoint is not None:
+            where.append("endpoint = ?")
+            args.append(endpoint)
+        if kind is not None:
+            where.append("kind = ?")
+            args.append(kind)
+        sql = f"SELECT {', '.join(PROBE_FIELDS)} FROM probes"
+        return self._select(sql, where, args, limit)
+    
+    def query_test_results(self, since: Optional[float] = None, until: Optional[float] = None,
+                           nodeid: Optional[str] = None, outcome: Optional[str] = None,
+                           limit: Optional[int] = None) -> List[Dict]:
+        """按时间顺序返回时间范围内的测试结果，endpoints解码为列表"""
+        where, args = self._range(since, until)
+        if nodeid is not None:
+            where.append("nodeid = ?")
+            args.append(nodeid)
+        if outcome is not None:
+            where.append("outcome = ?")
+            args.append(outcome)
+        sql = f"SELECT {', '.join(TEST_FIELDS)} FROM test_results"
+        rows = self._select(sql, where, args, limit)
+        for row in rows:
+            row["endpoints"] = json.loads(row["endpoints"] or "[]")
+        return rows
+    
+    def downsample(self, since: float, until: Optional[float] = None, bucket_seconds: int = 3600,
+                   endpoint: Optional[str] = None, kind: Optional[str] = None) -> List[Dict]:
+        """
+        按固定时间桶聚合探测记录，长时间窗口只返回每个桶的检查次数、可用率和延迟
+        
+        聚合在SQLite中完成，不把原始记录读入内存。
+        """
+        where, args = self._range(since, until)
+        if endpoint is not None:
+            where.append("endpoint = ?")
+            args.append(endpoint)
+        if kind is not None:
+            where.append("kind = ?")
+            args.append(kind)
+        sql = (
+            "SELECT CAST(timestamp / ? AS INTEGER) AS bucket, COUNT(*) AS checks, SUM(ok) AS ok, "
+            "AVG(latency_ms) AS latency_mean, MAX(latency_ms) AS latency_max FROM probes"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " GROUP BY bucket ORDER BY bucket"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, [bucket_seconds] + args).fetchall()
+        return [
+            {
+                "start": datetime.fromtimestamp(row["bucket"] * bucket_seconds).isoformat(),
+                "checks": row["checks"],
+                "ok": row["ok"],
+                "uptime_percent": round(row["ok"] / row["checks"] * 100, 3),
+                "latency_mean_ms": round(row["latency_mean"], 1) if row["latency_mean"] is not None else None,
+                "latency_max_ms": round(row["latency_max"], 1) if row["latency_max"] is not None else None
+            }
+            for row in rows
+        ]
+    
+    def prune(self, before: float) -> int:
+        """删除早于before的记录，返回删除条数"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                deleted = self._conn.execute("DELETE FROM probes WHERE timestamp < ?", (before,)).rowcount
+                deleted += self._conn.execute("DELETE FROM test_results WHERE timestamp < ?", (before,)).rowcount
+        return deleted
+    
+    @staticmethod
+    def _range(since: Optional[float], until: Optional[float]):
+        where, args = [], []
+        if since is not None:
+            where.append("timestamp >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("timestamp < ?")
+            args.append(until)
+        return where, args
+    
+    def _select(self, sql: str, where: List[str], args: List, limit: Optional[int]) -> List[Dict]:
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        sql += " ORDER BY timestamp"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args = args + [limit]
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, args)]
+
+class RedisHistoryStore:
+    """
+    Redis历史存储，接口与HistoryStore相同
+    
+    每类记录一个有序集合，score为时间戳，范围查询用ZRANGEBYSCORE；降采样在客户端完成。
+    """
+    
+    def __init__(self, url: Optional[str] = None, prefix: str = "kiosk-monitor", client=None):
+        if client is None:
+            # 只有使用Redis后端时才导入（redis.asyncio 会连带导入 asyncio）
+            try:
+                import redis
+            except ImportError:  # 未安装redis时只能使用SQLite后端
+                raise RuntimeError("使用Redis历史存储需要安装redis包") from None
+            client = redis.Redis.from_url(url or settings.REDIS_URL)
+        self._redis = client
+        self._probes_key = f"{prefix}:probes"
+        self._tests_key = f"{prefix}:test_results"
+    
+    def close(self):
+        self._redis.close()
+    
+    def _insert(self, key: str, rows: Iterable[Dict]) -> int:
+        # 成员中带序号，避免同一时刻的相同记录被有序集合去重
+        mapping = {
+            json.dumps({**row, "_seq": f"{time.time_ns()}-{index}"}, ensure_ascii=False): row["timestamp"]
+            for index, row in enumerate(rows)
+        }
+        if mapping:
+            self._redis.zadd(key, mapping)
+        return len(mapping)
+    
+    def record_probes(self, rows: Iterable[Dict]) -> int:
+        return self._insert(self._probes_key, rows)
+    
+    def record_test_results(self, records: Iterable[Dict]) -> int:
+        return self._insert(self._tests_key, (result_row(r) for r in records if r.get("event") == "test"))
+    
+    def _range(self, key: str, since: Optional[float], until: Optional[float]) -> List[Dict]:
+        low = "-inf" if since is None else since
+        high = "+inf" if until is None else f"({until}"
+        rows = []
+        for member in self._redis.zrangebyscore(key, low, high):
+            row = json.loads(member)
+            row.pop("_seq", None)
+            rows.append(row)
+        return rows
+    
+    def query_probes(self, since: Optional[float] = None, until: Optional[float] = None,
+                     endpoint: Optional[str] = None, kind: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[Dict]:
+        rows = [
+            row for row in self._range(self._probes_key, since, until)
+            if (endpoint is None or row["endpoint"] == endpoint) and (kind is None or row["kind"] == kind)
+        ]
+        return rows[:limit] if limit is not None else rows
+    
+    def query_test_results(self, since: Optional[float] = None, until: Optional[float] = None,
+                           nodeid: Optional[str] = None, outcome: Optional[str] = None,
+                           limit: Optional[int] = None) -> List[Dict]:
+        rows = [
+            {**row, "endpoints": json.loads(row["endpoints"] or "[]")}
+            for row in self._range(self._tests_key, since, until)
+            if (nodeid is None or row["nodeid"] == nodeid) and (outcome is None or row["outcome"] == outcome)
+        ]
+        return rows[:limit] if limit is not None else rows
+    
+    def downsample(self, since: float, until: Optional[float] = None, bucket_seconds: int = 3600,
+                   endpoint: Optional[str] = None, kind: Optional[str] = None) -> List[Dict]:
+        buckets: Dict[int, List[Dict]] = {}
+        for row in self.query_probes(since, until, endpoint, kind):
+            buckets.setdefault(int(row["timestamp"] // bucket_seconds), []).append(row)
+        return [_bucket_stats(bucket * bucket_seconds, rows) for bucket, rows in sorted(buckets.items())]
+    
+    def prune(self, before: float) -> int:
+        deleted = self._redis.zremrangebyscore(self._probes_key, "-inf", f"({before}")
+        deleted += self._redis.zremrangebyscore(self._tests_key, "-inf", f"({before}")
+        return deleted
+
+def create_history_store(backend: Optional[str] = None):
+    """
+    按 Settings.HISTORY_BACKEND 创建历史存储："sqlite"（默认）、"redis"，"none" 表示不持久化
+    
+    Redis不可用时退回SQLite，打开失败时返回None，监控照常运行。
+    """
+    backend = (backend or settings.HISTORY_BACKEND).lower()
+    if backend == "none":
+        return None
+    if backend == "redis":
+        try:
+            store = RedisHistoryStore()
+            store._redis.ping()
+            return store
+        except Exception as e:
+            print(f"[{datetime.now()}] Redis历史存储不可用，改用SQLite: {e}")
+    try:
+        return HistoryStore()
+    except (OSError, sqlite3.Error) as e:
+        print(f"[{datetime.now()}] 无法打开历史存储 {settings.HISTORY_DB_PATH}: {e}")
+        return None
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+共享HTTP客户端 - 进程内复用的连接池会话（keep-alive、重试、默认超时）
+"""
+
+import json
+import threading
+import time
+import requests
+from collections import deque
+from typing import Any, Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from config.settings import settings
+from utils.cassette import CassetteAdapter, active_cassette
+from utils.latency_histogram import endpoint_template, latency_registry
+
+# 当前线程最近一次新建连接的耗时（毫秒），复用连接时为0
+_connect_timing = threading.local()
+
+class _TimedConnectionMixin:
+    """记录建立连接的耗时：DNS解析+TCP连接计入connect，TLS握手计入tls"""
+    
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _connect_timing.connect = (time.perf_counter() - start) * 1000
+    
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        elapsed = (time.perf_counter() - start) * 1000
+        _connect_timing.tls = max(0.0, elapsed - getattr(_connect_timing, "connect", 0.0))
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """使用带连接计时的连接池"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else f"{text[:limit]}...（共 {len(text)} 字符）"
+
+class RequestJournal:
+    """
+    最近发出的请求记录
+    
+    只保存请求和响应对象的引用，不解码也不打印响应体；测试失败时才由 conftest 调用 format() 输出。
+    """
+    
+    def __init__(self, maxlen: int = 20):
+        self.enabled = False
+        self._entries = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def record(self, method: str, url: str, body: Any = None,
+               response: Optional[requests.Response] = None, error: Optional[Exception] = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries.append((method.upper(), url, body, response, error))
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def endpoints(self) -> List[str]:
+        """记录中请求过的 "方法 端点模板"，按首次出现的顺序去重"""
+        with self._lock:
+            entries = list(self._entries)
+        return list(dict.fromkeys(f"{method} {endpoint_template(url)}" for method, url, _, _, _ in entries))
+    
+    def format(self, limit: int = 2000) -> str:
+        """格式化所有记录，请求体和响应体各截断到limit个字符"""
+        with self._lock:
+            entries = list(self._entries)
+        lines = []
+        for method, url, body, response, error in entries:
+            lines.append(f"{method} {url}")
+            if body is not None:
+                if not isinstance(body, (str, bytes)):
+                    body = json.dumps(body, ensure_ascii=False)
+                elif isinstance(body, bytes):
+                    body = body.decode("utf-8", "replace")
+                lines.append(f"  请求体: {_truncate(body, limit)}")
+            if response is not None:
+                lines.append(f"  响应: {response.status_code} {_truncate(response.text, limit)}")
+            if error is not None:
+                lines.append(f"  异常: {type(error).__name__}: {error}")
+        return "\n".join(lines)
+
+# 进程内的请求记录，由 tests/conftest.py 在测试运行期间开启
+request_journal = RequestJournal()
+
+class PooledSession(requests.Session):
+    """
+    带连接池、重试和默认超时的会话
+    
+    开启HTTP录制回放（Settings.HTTP_CASSETTE_MODE）时，传输层换成 CassetteAdapter：
+    录制时仍通过连接池请求，回放时不建立任何连接。
+    """
+    
+    def __init__(self, pool_size: Optional[int] = None, retries: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        super().__init__()
+        self.timeout = settings.TEST_TIMEOUT if timeout is None else timeout
+        pool_size = pool_size or settings.HTTP_POOL_SIZE
+        retries = settings.TEST_RETRY_COUNT if retries is None else retries
+        
+        # 连接错误对所有方法都可以安全重试（请求尚未发出）；
+        # 网关错误只对幂等方法重试，避免重复创建订单或支付
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            backoff_factor=0.1,
+            raise_on_status=False
+        )
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        cassette = active_cassette()
+        if cassette is not None:
+            adapter = CassetteAdapter(cassette, adapter)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+    
+    def request(self, method, url, **kwargs):
+        """发送请求，未指定timeout时使用默认超时，并记录各阶段耗时到 latency_registry"""
+        kwargs.setdefault("timeout", self.timeout)
+        _connect_timing.connect = 0.0
+        _connect_timing.tls = 0.0
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            request_journal.record(method, url, kwargs.get("json", kwargs.get("data")), error=e)
+            raise
+        request_journal.record(method, url, kwargs.get("json", kwargs.get("data")), response)
+        # 非stream请求返回时响应体已读取完毕
+        total = (time.perf_counter() - start) * 1000
+        latency_registry.record(method, url, {
+            "connect": _connect_timing.connect,
+            "tls": _connect_timing.tls,
+            "ttfb": response.elapsed.total_seconds() * 1000,
+            "total": total
+        })
+        return response
+    
+    def pool_stats(self) -> Dict[str, int]:
+        """统计连接池中新建的连接数和发送的请求数"""
+        stats = {"connections": 0, "requests": 0}
+        seen = set()
+        for adapter in self.adapters.values():
+            # 录制回放时连接池在被包装的适配器中
+            adapter = adapter.adapter if isinstance(adapter, CassetteAdapter) else adapter
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats["connections"] += pool.num_connections
+                stats["requests"] += pool.num_requests
+        return stats
+
+_shared_session: Optional[PooledSession] = None
+_shared_session_lock = threading.Lock()
+
+# 最近一次关闭共享会话时的连接池统计
+last_pool_stats: Dict[str, int] = {"connections": 0, "requests": 0}
+
+def get_http_session() -> PooledSession:
+    """获取进程内共享的连接池会话"""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = PooledSession()
+    return _shared_session
+
+def close_http_session() -> Dict[str, int]:
+    """关闭共享会话并返回其连接池统计"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is not None:
+            last_pool_stats.update(_shared_session.pool_stats())
+            _shared_session.close()
+            _shared_session = None
+    return dict(last_pool_stats)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+导入耗时分析 - 用 python -X importtime 测量入口脚本的启动开销，并与仓库中的基线比较
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+# 入口名 -> 在项目根目录下执行的代码
+ENTRY_POINTS = {
+    "monitor": "import sys; sys.path.insert(0, 'scripts'); import monitor_api",
+    "healthcheck": "import sys; sys.path.insert(0, 'scripts'); import healthcheck",
+    "api_validator": "import utils.api_validator",
+    "warm_runner": "import utils.warm_runner",
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)\s*$")
+
+def parse_importtime(output: str) -> List[Dict]:
+    """解析 -X importtime 的输出：[{"module", "self_us", "cumulative_us", "depth"}]"""
+    modules = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2
+            })
+    return modules
+
+def summarize_imports(modules: List[Dict], top: int = 15) -> Dict:
+    """
+    所有模块的导入总耗时、模块数，以及累计耗时最多的顶层导入和它们直接导入的模块（毫秒）
+    
+    入口模块本身是顶层导入，它直接导入的模块就是需要延迟导入的候选。
+    """
+    outer = [m for m in modules if m["depth"] <= 1]
+    heaviest = sorted(outer, key=lambda m: m["cumulative_us"], reverse=True)[:top]
+    return {
+        "import_ms": round(sum(m["self_us"] for m in modules) / 1000, 1),
+        "modules": len(modules),
+        "top": {"  " * m["depth"] + m["module"]: round(m["cumulative_us"] / 1000, 1) for m in heaviest}
+    }
+
+def profile_entry(code: str, rootdir: str, repeat: int = 5, top: int = 15) -> Dict:
+    """
+    在新的解释器中执行入口代码 repeat 次，取墙钟时间最短的一次
+    
+    子进程环境中去掉 PYTHONDONTWRITEBYTECODE，测量的是有字节码缓存时的正常启动。
+    """
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=rootdir, env=env,
+                                capture_output=True, text=True)
+        wall_ms = round((time.perf_counter() - start) * 1000, 1)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "入口导入失败")
+        if best is None or wall_ms < best["wall_ms"]:
+            best = {"wall_ms": wall_ms, **summarize_imports(parse_importtime(result.stderr), top)}
+    return best
+
+def load_baseline(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def format_profile(name: str, profile: Dict, baseline: Optional[Dict] = None) -> List[str]:
+    """一个入口的报告行，有基线时附上变化"""
+    def delta(key):
+        if not baseline or key not in baseline:
+            return ""
+        return f" ({profile[key] - baseline[key]:+.1f})"
+    
+    lines = [f"{name}: 启动 {profile['wall_ms']}ms{delta('wall_ms')}, 导入 {profile['import_ms']}ms"
+             f"{delta('import_ms')}, {profile['modules']} 个模块"]
+    for module, ms in profile["top"].items():
+        lines.append(f"    {ms:>8.1f}ms  {module}")
+    return lines
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+延迟直方图 - HDR风格的对数线性分桶，按 请求方法 + 端点模板 记录各阶段耗时
+"""
+
+import math
+import re
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from config.env_config import BASE_URL
+
+# 每个2的幂区间划分的子桶位数：32个子桶，相对误差不超过 1/32
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+# 记录的耗时阶段
+PHASES = ("connect", "tls", "ttfb", "total")
+
+_ID_SEGMENT = re.compile(r"\d")
+_VERSION_SEGMENT = re.compile(r"^v\d+$")
+_BASE_PATH = urlsplit(BASE_URL).path.rstrip("/")
+
+def endpoint_template(url: str) -> str:
+    """
+    把请求URL归一化为端点模板，例如 /v1/orders/order-001 -> /v1/orders/{id}
+    
+    去掉BASE_URL的路径前缀和查询参数，含数字的路径段（版本号 v1 除外）视为ID。
+    """
+    path = urlsplit(url).path
+    if _BASE_PATH and path.startswith(_BASE_PATH):
+        path = path[len(_BASE_PATH):]
+    segments = [
+        "{id}" if _ID_SEGMENT.search(segment) and not _VERSION_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    ]
+    return "/".join(segments) or "/"
+
+class LatencyHistogram:
+    """对数线性分桶的延迟直方图，内部以微秒计数，对外以毫秒报告"""
+    
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.min_ms: Optional[float] = None
+    
+    @staticmethod
+    def _bucket_index(micros: int) -> int:
+        if micros < 2 * SUB_BUCKET_COUNT:
+            return micros
+        shift = micros.bit_length() - (SUB_BUCKET_BITS + 1)
+        return (shift + 1) * SUB_BUCKET_COUNT + ((micros >> shift) - SUB_BUCKET_COUNT)
+    
+    @staticmethod
+    def _bucket_upper_bound(index: int) -> int:
+        """桶内最大的微秒值"""
+        if index < 2 * SUB_BUCKET_COUNT:
+            return index
+        shift = index // SUB_BUCKET_COUNT - 1
+        mantissa = index % SUB_BUCKET_COUNT + SUB_BUCKET_COUNT
+        return ((mantissa + 1) << shift) - 1
+    
+    def record(self, value_ms: float):
+        """记录一次耗时（毫秒）"""
+        value_ms = max(0.0, value_ms)
+        index = self._bucket_index(int(value_ms * 1000))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+        self.min_ms = value_ms if self.min_ms is None else min(self.min_ms, value_ms)
+    
+    def merge(self, other: "LatencyHistogram"):
+        """合并另一个直方图的计数"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        if other.min_ms is not None:
+            self.min_ms = other.min_ms if self.min_ms is None else min(self.min_ms, other.min_ms)
+    
+    def percentile(self, percent: float) -> float:
+        """返回百分位耗时（毫秒），不超过实际最大值"""
+        if self.count == 0:
+            return 0.0
+        target = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._bucket_upper_bound(index) / 1000, self.max_ms)
+        return self.max_ms
+    
+    def summary(self) -> Dict[str, float]:
+        """导出 count/mean/p50/p90/p99/max"""
+        return {
+            "count": self.count,
+            "mean": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50": round(self.percentile(50), 2),
+            "p90": round(self.percentile(90), 2),
+            "p99": round(self.percentile(99), 2),
+            "max": round(self.max_ms, 2)
+        }
+
+class LatencyRegistry:
+    """按 "方法 端点模板" 聚合各阶段延迟直方图，线程安全"""
+    
+    def __init__(self):
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, method: str, url: str, timings: Dict[str, float]):
+        """记录一次请求的各阶段耗时（毫秒）"""
+        key = f"{method.upper()} {endpoint_template(url)}"
+        with self._lock:
+            phases = self._histograms.setdefault(key, {})
+            for phase, value_ms in timings.items():
+                if value_ms is None:
+                    continue
+                phases.setdefault(phase, LatencyHistogram()).record(value_ms)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """导出所有端点各阶段的百分位统计"""
+        with self._lock:
+            return {
+                key: {phase: histogram.summary() for phase, histogram in phases.items()}
+                for key, phases in sorted(self._histograms.items())
+            }
+    
+    def reset(self):
+        """清空所有统计"""
+        with self._lock:
+            self._histograms.clear()
+
+# 进程内全局延迟统计
+latency_registry = LatencyRegistry()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+压测引擎 - 开放模型（按到达速率发请求，不等待上一个请求完成），模拟大量kiosk并发下单/支付/登录
+"""
+
+import asyncio
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from utils.latency_histogram import LatencyHistogram
+
+# 速率曲线：压测开始后的秒数 -> 目标RPS
+RateProfile = Callable[[float], float]
+
+def constant_profile(rps: float) -> RateProfile:
+    """恒定速率"""
+    return lambda elapsed: rps
+
+def ramp_profile(start_rps: float, end_rps: float, duration: float) -> RateProfile:
+    """在duration秒内从start_rps线性升到end_rps，用于寻找API的拐点"""
+    def profile(elapsed: float) -> float:
+        progress = min(1.0, elapsed / duration) if duration > 0 else 1.0
+        return start_rps + (end_rps - start_rps) * progress
+    return profile
+
+def make_scenario(name: str, method: str, endpoint: str, payload: Optional[Dict] = None,
+                  params: Optional[Dict] = None, weight: float = 1.0) -> Dict:
+    """构造一个压测场景（一类请求），weight为在混合流量中的相对比例"""
+    return {
+        "name": name,
+        "method": method.upper(),
+        "endpoint": endpoint,
+        "payload": payload,
+        "params": params,
+        "weight": weight
+    }
+
+def is_error_status(status_code: int) -> bool:
+    """压测口径的错误：5xx或限流（429），业务校验类的4xx不计入"""
+    return status_code >= 500 or status_code == 429
+
+class _ScenarioStats:
+    """单个场景的计数与延迟直方图"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.status_codes: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+    
+    def record(self, status: str, error: bool, latency_ms: float):
+        self.requests += 1
+        self.errors += 1 if error else 0
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        self.latency.record(latency_ms)
+
+class LoadGenerator:
+    """
+    开放模型压测
+    
+    请求按速率曲线排定的时间点发出，与响应快慢无关；kiosks限制同时在途的请求数，
+    排队时间计入延迟（从计划发出时刻算起），避免服务变慢时压测自己也跟着降速而低估延迟。
+    """
+    
+    def __init__(self, base_url: str, scenarios: List[Dict], profile: RateProfile, duration: float,
+                 kiosks: int = 100, headers: Optional[Dict] = None, timeout: float = 10,
+                 poisson: bool = False, window: float = 5.0, seed: Optional[int] = None):
+        self.base_url = base_url
+        self.scenarios = scenarios
+        self.profile = profile
+        self.duration = duration
+        self.kiosks = kiosks
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.poisson = poisson
+        self.window = window
+        self.random = random.Random(seed)
+        self.stats: Dict[str, _ScenarioStats] = {}
+        self.timeline: Dict[int, Dict] = {}
+    
+    def _arrivals(self):
+        """按速率曲线生成计划发出时刻（相对开始的秒数）"""
+        elapsed = 0.0
+        while elapsed < self.duration:
+            rate = self.profile(elapsed)
+            if rate <= 0:
+                elapsed += 0.1
+                continue
+            yield elapsed
+            interval = self.random.expovariate(rate) if self.poisson else 1.0 / rate
+            elapsed += interval
+    
+    async def _fire(self, client: httpx.AsyncClient, scenario: Dict, kiosks: asyncio.Semaphore,
+                    scheduled: float, offset: float):
+        """模拟一台kiosk发出一个请求"""
+        async with kiosks:
+            try:
+                response = await client.request(
+                    scenario["method"],
+                    f"{self.base_url}{scenario['endpoint']}",
+                    json=scenario["payload"],
+                    params=scenario["params"],
+                    headers=self.headers
+                )
+                status = str(response.status_code)
+                error = is_error_status(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+                error = True
+        latency_ms = (time.perf_counter() - scheduled) * 1000
+        
+        self.stats.setdefault(scenario["name"], _ScenarioStats()).record(status, error, latency_ms)
+        bucket = self.timeline.setdefault(int(offset // self.window), {
+            "requests": 0, "errors": 0, "latency": LatencyHistogram()
+        })
+        bucket["requests"] += 1
+        bucket["errors"] += 1 if error else 0
+        bucket["latency"].record(latency_ms)
+    
+    async def run_async(self) -> Dict:
+        """执行压测并返回报告"""
+        kiosks = asyncio.Semaphore(self.kiosks)
+        limits = httpx.Limits(max_connections=self.kiosks, max_keepalive_connections=self.kiosks)
+        weights = [scenario["weight"] for scenario in self.scenarios]
+        tasks = set()
+        
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            start = time.perf_counter()
+            for offset in self._arrivals():
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                scenario = self.random.choices(self.scenarios, weights)[0]
+                task = asyncio.create_task(self._fire(client, scenario, kiosks, start + offset, offset))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - start
+        
+        return self.report(elapsed)
+    
+    def run(self) -> Dict:
+        """同步入口"""
+        return asyncio.run(self.run_async())
+    
+    def report(self, elapsed: float) -> Dict:
+        """汇总每个场景以及每个时间窗口的吞吐、错误率和延迟百分位"""
+        elapsed = max(elapsed, 1e-9)
+        endpoints = {}
+        total = _ScenarioStats()
+        for scenario in self.scenarios:
+            stats = self.stats.get(scenario["name"])
+            if not stats:
+                continue
+            endpoints[scenario["name"]] = {
+                "method": scenario["method"],
+                "endpoint": scenario["endpoint"],
+                "requests": stats.requests,
+                "throughput_rps": round(stats.requests / elapsed, 2),
+                "error_rate": round(stats.errors / stats.requests, 4),
+                "status_codes": stats.status_codes,
+                "latency_ms": stats.latency.summary()
+            }
+            total.requests += stats.requests
+            total.errors += stats.errors
+            total.latency.merge(stats.latency)
+        
+        timeline = []
+        for index in sorted(self.timeline):
+            bucket = self.timeline[index]
+            window_start = index * self.window
+            span = max(min(self.window, self.duration - window_start), 1e-9)
+            timeline.append({
+                "start_seconds": round(window_start, 1),
+                "target_rps": round(self.profile(window_start + span / 2), 2),
+                "throughput_rps": round(bucket["requests"] / span, 2),
+                "error_rate": round(bucket["errors"] / bucket["requests"], 4),
+                "p99_ms": round(bucket["latency"].percentile(99), 2)
+            })
+        
+        return {
+            "duration_seconds": round(elapsed, 2),
+            "kiosks": self.kiosks,
+            "total": {
+                "requests": total.requests,
+                "throughput_rps": round(total.requests / elapsed, 2),
+                "error_rate": round(total.errors / total.requests, 4) if total.requests else 0.0,
+                "latency_ms": total.latency.summary()
+            },
+            "endpoints": endpoints,
+            "timeline": timeline
+        }
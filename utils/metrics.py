@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+监控指标 - 进程内的计数器、仪表和直方图，按Prometheus文本格式导出
+
+指标在探测和测试运行时就地累加，抓取时只遍历已有的时间序列，不会触发任何探测。
+"""
+
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.latency_histogram import latency_registry
+
+# 探测和请求耗时的直方图分桶（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 测试运行耗时的直方图分桶（秒）
+RUN_DURATION_BUCKETS = (10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+# (样本名后缀, 标签, 值)
+Sample = Tuple[str, Dict[str, str], float]
+# (指标名, 类型, 说明, 样本列表)
+Family = Tuple[str, str, str, List[Sample]]
+
+def _label_key(labels: Optional[Dict[str, object]]) -> LabelKey:
+    return tuple(sorted((key, "" if value is None else str(value)) for key, value in (labels or {}).items()))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{{{pairs}}}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Histogram:
+    """单个时间序列的累计分桶"""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, buckets: Tuple[float, ...], value: float):
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+class MetricsRegistry:
+    """
+    线程安全的指标注册表
+    
+    指标先用 describe 声明类型和说明，再按标签累加；collector 在导出时提供由其他组件现算的指标。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> {"type": ..., "help": ..., "buckets": ..., "series": {label_key: value}}
+        self._metrics: Dict[str, Dict] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+    
+    def describe(self, name: str, kind: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None):
+        """声明指标，kind 为 counter / gauge / histogram"""
+        if kind not in ("counter", "gauge", "histogram"):
+            raise ValueError(f"不支持的指标类型: {kind}")
+        with self._lock:
+            self._metrics.setdefault(name, {
+                "type": kind,
+                "help": help_text,
+                "buckets": tuple(buckets or LATENCY_BUCKETS) if kind == "histogram" else None,
+                "series": {}
+            })
+    
+    def _metric(self, name: str, kind: str) -> Dict:
+        metric = self._metrics.get(name)
+        if metric is None or metric["type"] != kind:
+            raise KeyError(f"未声明的{kind}指标: {name}")
+        return metric
+    
+    def inc(self, name: str, labels: Optional[Dict] = None, value: float = 1.0):
+        """计数器加 value"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._metric(name, "counter")["series"]
+            series[key] = series.get(key, 0.0) + value
+    
+    def set(self, name: str, value: float, labels: Optional[Dict] = None):
+        """设置仪表的当前值"""
+        key = _label_key(labels)
+        with self._lock:
+            self._metric(name, "gauge")["series"][key] = float(value)
+    
+    def observe(self, name: str, value: float, labels: Optional[Dict] = None):
+        """向直方图记录一个观测值"""
+        key = _label_key(labels)
+        with self._lock:
+            metric = self._metric(name, "histogram")
+            histogram = metric["series"].get(key)
+            if histogram is None:
+                histogram = metric["series"][key] = _Histogram(metric["buckets"])
+            histogram.observe(metric["buckets"], value)
+    
+    def value(self, name: str, labels: Optional[Dict] = None) -> Optional[float]:
+        """计数器或仪表的当前值，直方图返回观测次数"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                return None
+            current = metric["series"].get(_label_key(labels))
+        if isinstance(current, _Histogram):
+            return current.count
+        return current
+    
+    def add_collector(self, collector: Callable[[], Iterable[Family]]):
+        """注册导出时调用的采集函数，返回 (指标名, 类型, 说明, [(后缀, 标签, 值)])"""
+        with self._lock:
+            self._collectors.append(collector)
+    
+    def reset(self):
+        """清空所有时间序列（保留声明和采集函数）"""
+        with self._lock:
+            for metric in self._metrics.values():
+                metric["series"].clear()
+    
+    def render(self) -> str:
+        """按Prometheus文本格式导出所有指标"""
+        lines: List[str] = []
+        with self._lock:
+            for name, metric in sorted(self._metrics.items()):
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['type']}")
+                for key, current in sorted(metric["series"].items()):
+                    if metric["type"] != "histogram":
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(current)}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(metric["buckets"], current.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', _format_value(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {current.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(current.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {current.count}")
+            collectors = list(self._collectors)
+        
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                lines.append(f"# 采集失败: {_escape(str(e))}")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for suffix, labels, value in samples:
+                    lines.append(f"{name}{suffix}{_format_labels(_label_key(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+def http_latency_families() -> List[Family]:
+    """把 latency_registry 中各端点、各阶段的延迟导出为summary（分位数和总和）"""
+    samples: List[Sample] = []
+    for key, phases in latency_registry.snapshot().items():
+        method, _, endpoint = key.partition(" ")
+        for phase, summary in phases.items():
+            labels = {"method": method, "endpoint": endpoint, "phase": phase}
+            for quantile, field in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+                samples.append(("", {**labels, "quantile": quantile}, summary[field] / 1000))
+            samples.append(("_sum", labels, summary["mean"] * summary["count"] / 1000))
+            samples.append(("_count", labels, summary["count"]))
+    return [("kiosk_http_request_duration_seconds", "summary",
+             "通过共享HTTP会话发出的请求各阶段耗时", samples)]
+
+def _describe_monitor_metrics(registry: MetricsRegistry) -> MetricsRegistry:
+    registry.describe("kiosk_api_up", "gauge", "最近一次API状态检查是否可用 (1/0)")
+    registry.describe("kiosk_probe_total", "counter", "探测次数，按结果区分")
+    registry.describe("kiosk_probe_duration_seconds", "histogram", "单次探测耗时")
+    registry.describe("kiosk_api_state_transitions_total", "counter", "API可用状态的切换次数")
+    registry.describe("kiosk_status_check_interval_seconds", "gauge", "当前的状态检查间隔")
+    registry.describe("kiosk_fleet_probe_run_seconds", "histogram", "一轮端点探测的总耗时")
+    registry.describe("kiosk_test_results_total", "counter", "测试结果累计数，按结果区分")
+    registry.describe("kiosk_test_runs_total", "counter", "测试运行次数，按是否全部通过区分")
+    registry.describe("kiosk_test_run_duration_seconds", "histogram", "测试运行耗时", RUN_DURATION_BUCKETS)
+    registry.describe("kiosk_test_last_run", "gauge", "最近一次测试运行的各类结果数")
+    registry.describe("kiosk_test_last_run_timestamp_seconds", "gauge", "最近一次测试运行结束的时间")
+    registry.add_collector(http_latency_families)
+    return registry
+
+# 监控进程内全局指标
+monitor_metrics = _describe_monitor_metrics(MetricsRegistry())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+本地Kiosk API模拟服务 - 实现测试用到的路由，支持延迟和错误注入
+
+用法:
+    python scripts/mock_api_server.py --port 8081
+    BASE_URL=http://127.0.0.1:8081 python -m pytest
+"""
+
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from flask import Blueprint, Flask, jsonify, request
+
+from config.settings import Settings
+
+MOCK_PASSWORD = "123123"
+# 模拟的无效验证码
+MOCK_INVALID_CODE = "000000"
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE_PATTERN = re.compile(r"^\+?\d{10,15}$")
+
+MENU_ITEMS = {
+    "item-001": {"id": "item-001", "name": "Classic Burger", "category_id": "main-courses", "price": 9.99},
+    "item-002": {"id": "item-002", "name": "French Fries", "category_id": "appetizers", "price": 3.49},
+    "item-003": {"id": "item-003", "name": "Chocolate Cake", "category_id": "desserts", "price": 4.99},
+    "item-004": {"id": "item-004", "name": "Iced Tea", "category_id": "beverages", "price": 1.99}
+}
+
+class MockConfig:
+    """可在运行时调整的延迟和错误注入配置"""
+    
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "error_rate": self.error_rate,
+            "error_status": self.error_status
+        }
+
+class MockState:
+    """内存中的订单和支付数据"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.orders = {
+            "order-001": {
+                "id": "order-001",
+                "location_id": Settings.TEST_LOCATION_ID,
+                "items": [{"item_id": "item-001", "quantity": 1, "customizations": []}],
+                "payment_method": "card",
+                "status": "pending"
+            }
+        }
+        self.payments = {
+            "payment-001": {"id": "payment-001", "order_id": "order-001", "amount": 9.99, "status": "completed"}
+        }
+        self.favorites = {"item-001"}
+
+def _error(status: int, code: str, message: str):
+    return jsonify({"code": code, "message": message}), status
+
+def _require_token():
+    """需要登录的接口：没有Bearer token时返回401"""
+    if not request.headers.get("Authorization", "").startswith("Bearer "):
+        return _error(401, "UNAUTHORIZED", "Missing bearer token")
+    return None
+
+def _body() -> Dict:
+    return request.get_json(silent=True) or {}
+
+def create_mock_app(config: Optional[MockConfig] = None, base_path: str = "") -> Flask:
+    """
+    创建模拟服务
+    
+    Args:
+        config: 延迟和错误注入配置
+        base_path: 路由前缀，例如 "/kiosk-shopping-api"
+    """
+    config = config or MockConfig()
+    state = MockState()
+    app = Flask(__name__)
+    app.config["MOCK_CONFIG"] = config
+    api = Blueprint("kiosk_mock", __name__)
+    
+    @app.before_request
+    def inject_latency_and_errors():
+        """按配置注入延迟和错误；请求头 X-Mock-Latency-Ms / X-Mock-Status 可针对单个请求覆盖"""
+        if request.path.startswith("/__mock__"):
+            return None
+        
+        latency_ms = float(request.headers.get("X-Mock-Latency-Ms", config.latency_ms))
+        if config.jitter_ms:
+            latency_ms += config.random.uniform(0, config.jitter_ms)
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000)
+        
+        forced_status = request.headers.get("X-Mock-Status")
+        if forced_status:
+            return _error(int(forced_status), "INJECTED_ERROR", "Injected by X-Mock-Status")
+        if config.error_rate and config.random.random() < config.error_rate:
+            return _error(config.error_status, "INJECTED_ERROR", "Injected by mock error rate")
+        return None
+    
+    @app.route("/__mock__/config", methods=["GET", "PUT"])
+    def mock_config():
+        """查看或修改延迟和错误注入配置"""
+        if request.method == "PUT":
+            for key, value in _body().items():
+                if key in ("latency_ms", "jitter_ms", "error_rate"):
+                    setattr(config, key, float(value))
+                elif key == "error_status":
+                    config.error_status = int(value)
+        return jsonify(config.to_dict())
+    
+    # 健康检查
+    @api.route("/", methods=["GET"])
+    @api.route("/health", methods=["GET"])
+    @api.route("/status", methods=["GET"])
+    def health():
+        return jsonify({"status": "ok", "service": "kiosk-shopping-api-mock"})
+    
+    # 登录
+    @api.route("/auth/login/email", methods=["POST"])
+    @api.route("/api/auth/login/email", methods=["POST"])
+    @api.route("/v1/auth/login/email", methods=["POST"])
+    @api.route("/v1/auth/sign-in-with-email", methods=["POST"])
+    def login_email():
+        body = _body()
+        if not body.get("email") or not body.get("password"):
+            return _error(400, "INVALID_REQUEST", "email and password are required")
+        if body["email"] not in Settings.TEST_EMAILS or body["password"] != MOCK_PASSWORD:
+            return _error(401, "INVALID_CREDENTIALS", "Invalid email or password")
+        return jsonify({"token": f"mock-{uuid.uuid4().hex}", "expires_in": 3600})
+    
+    @api.route("/auth/login/phone", methods=["POST"])
+    @api.route("/api/auth/login/phone", methods=["POST"])
+    @api.route("/v1/auth/login/phone", methods=["POST"])
+    @api.route("/v1/auth/sign-in-with-phone-number", methods=["POST"])
+    # tests/login/test_sign_in_with_phone.py 使用的路径
+    @api.route("/v1/auth/sign-in-with-phone-numbe", methods=["POST"])
+    def login_phone():
+        body = _body()
+        phone = body.get("phone") or body.get("phone_number")
+        code = body.get("verificationCode") or body.get("verification_code")
+        if not phone or not code:
+            return _error(400, "INVALID_REQUEST", "phone and verification code are required")
+        if code == MOCK_INVALID_CODE or not PHONE_PATTERN.match(phone) or set(phone.lstrip("+")) == {"0"}:
+            return _error(401, "INVALID_CODE", "Invalid phone or verification code")
+        return jsonify({"token": f"mock-{uuid.uuid4().hex}", "expires_in": 3600})
+    
+    # 验证码
+    @api.route("/auth/send-code/email", methods=["POST"])
+    def send_code_email():
+        email = _body().get("email")
+        if not email or not EMAIL_PATTERN.match(email):
+            return _error(400, "INVALID_EMAIL", "A valid email is required")
+        return jsonify({"sent": True})
+    
+    @api.route("/auth/send-code/phone", methods=["POST"])
+    def send_code_phone():
+        phone = _body().get("phone")
+        if not phone or not PHONE_PATTERN.match(phone):
+            return _error(400, "INVALID_PHONE", "A valid phone number is required")
+        return jsonify({"sent": True})
+    
+    # 门店和设备
+    @api.route("/v1/location/info", methods=["GET"])
+    def location_info():
+        location_id = request.args.get("location-id", Settings.TEST_LOCATION_ID)
+        return jsonify({"id": location_id, "name": "Mock Kiosk Location", "timezone": "America/Chicago"})
+    
+    @api.route("/v1/location/settings", methods=["GET"])
+    def location_settings():
+        return jsonify({"currency": "USD", "tax_rate": 0.1025, "payment_methods": Settings.PAYMENT_METHODS})
+    
+    @api.route("/v1/device/upload", methods=["POST"])
+    def device_upload():
+        body = _body()
+        return jsonify({"device_id": body.get("device_id") or f"device-{uuid.uuid4().hex[:8]}", "registered": True}), 201
+    
+    @api.route("/v1/device/status", methods=["GET"])
+    def device_status():
+        return jsonify({"device_id": request.args.get("device_id"), "status": "active"})
+    
+    # 菜单
+    @api.route("/v1/menu/categories", methods=["GET"])
+    def menu_categories():
+        return jsonify({"categories": [{"id": category} for category in Settings.MENU_CATEGORIES]})
+    
+    @api.route("/v1/menu/items", methods=["GET"])
+    def menu_items():
+        category_id = request.args.get("category_id")
+        items = [item for item in MENU_ITEMS.values() if not category_id or item["category_id"] == category_id]
+        return jsonify({"items": items})
+    
+    @api.route("/v1/menu/items/<item_id>", methods=["GET"])
+    def menu_item(item_id):
+        if item_id not in MENU_ITEMS:
+            return _error(404, "NOT_FOUND", "Menu item not found")
+        return jsonify(MENU_ITEMS[item_id])
+    
+    @api.route("/v1/menu/search", methods=["GET"])
+    def menu_search():
+        query = request.args.get("query", "").lower()
+        return jsonify({"items": [item for item in MENU_ITEMS.values() if query in item["name"].lower()]})
+    
+    # 积分
+    @api.route("/v1/loyalty/reward-tiers", methods=["GET"])
+    def reward_tiers():
+        return jsonify({"tiers": [{"id": tier} for tier in Settings.REWARD_TIERS]})
+    
+    @api.route("/v1/loyalty/reward-tiers/<tier_id>", methods=["GET"])
+    def reward_tier(tier_id):
+        if tier_id not in Settings.REWARD_TIERS:
+            return _error(404, "NOT_FOUND", "Reward tier not found")
+        return jsonify({"id": tier_id, "min_points": Settings.REWARD_TIERS.index(tier_id) * 1000})
+    
+    @api.route("/v1/loyalty/user-info", methods=["GET"])
+    @api.route("/v1/loyalty/rewards", methods=["GET"])
+    @api.route("/v1/loyalty/transactions", methods=["GET"])
+    def loyalty_user_data():
+        unauthorized = _require_token()
+        if unauthorized:
+            return unauthorized
+        return jsonify({"points": 1200, "tier": "silver", "rewards": [], "transactions": []})
+    
+    # 订单
+    @api.route("/v1/orders", methods=["GET"])
+    def list_orders():
+        status = request.args.get("status")
+        with state.lock:
+            orders = [order for order in state.orders.values() if not status or order["status"] == status]
+        return jsonify({"orders": orders})
+    
+    @api.route("/v1/orders", methods=["POST"])
+    def create_order():
+        body = _body()
+        items = body.get("items")
+        if not items:
+            return _error(400, "INVALID_ITEMS", "Order must contain at least one item")
+        unknown = [item.get("item_id") for item in items if item.get("item_id") not in MENU_ITEMS]
+        if unknown:
+            return _error(400, "INVALID_ITEMS", f"Unknown items: {', '.join(map(str, unknown))}")
+        if body.get("payment_method") not in Settings.PAYMENT_METHODS:
+            return _error(400, "INVALID_PAYMENT_METHOD", "Unsupported payment method")
+        
+        order = dict(body, id=f"order-{uuid.uuid4().hex[:8]}", status="pending")
+        with state.lock:
+            state.orders[order["id"]] = order
+        return jsonify(order), 201
+    
+    @api.route("/v1/orders/<order_id>", methods=["GET"])
+    def get_order(order_id):
+        with state.lock:
+            order = state.orders.get(order_id)
+        if order is None:
+            return _error(404, "NOT_FOUND", "Order not found")
+        return jsonify(order)
+    
+    @api.route("/v1/orders/<order_id>/<field>", methods=["PUT"])
+    def update_order(order_id, field):
+        body = _body()
+        if field == "status" and body.get("status") not in Settings.ORDER_STATUSES:
+            return _error(400, "INVALID_STATUS", "Unsupported order status")
+        if field not in ("status", "items", "pickup-time"):
+            return _error(404, "NOT_FOUND", "Unknown order field")
+        with state.lock:
+            order = state.orders.get(order_id)
+            if order is None:
+                return _error(404, "NOT_FOUND", "Order not found")
+            order.update(body)
+            return jsonify(order)
+    
+    @api.route("/v1/orders/<order_id>/cancel", methods=["POST"])
+    def cancel_order(order_id):
+        with state.lock:
+            order = state.orders.get(order_id)
+            if order is None:
+                return _error(404, "NOT_FOUND", "Order not found")
+            order.update(status="cancelled", cancel_reason=_body().get("reason"))
+            return jsonify(order)
+    
+    # 支付
+    @api.route("/v1/payment/methods", methods=["GET"])
+    def payment_methods():
+        return jsonify({"methods": Settings.PAYMENT_METHODS})
+    
+    @api.route("/v1/payment/process", methods=["POST"])
+    def process_payment():
+        body = _body()
+        amount = body.get("amount")
+        if not isinstance(amount, (int, float)) or amount <= 0:
+            return _error(400, "INVALID_AMOUNT", "Amount must be positive")
+        if body.get("payment_method") not in Settings.PAYMENT_METHODS:
+            return _error(400, "INVALID_PAYMENT_METHOD", "Unsupported payment method")
+        
+        payment = dict(body, id=f"payment-{uuid.uuid4().hex[:8]}", status="completed")
+        with state.lock:
+            state.payments[payment["id"]] = payment
+        return jsonify(payment), 201
+    
+    @api.route("/v1/payment/<payment_id>/status", methods=["GET"])
+    def payment_status(payment_id):
+        with state.lock:
+            payment = state.payments.get(payment_id)
+        if payment is None:
+            return _error(404, "NOT_FOUND", "Payment not found")
+        return jsonify({"id": payment_id, "status": payment["status"]})
+    
+    @api.route("/v1/payment/<payment_id>/refund", methods=["POST"])
+    def refund_payment(payment_id):
+        with state.lock:
+            payment = state.payments.get(payment_id)
+            if payment is None:
+                return _error(404, "NOT_FOUND", "Payment not found")
+            payment["status"] = "refunded"
+            return jsonify(payment)
+    
+    @api.route("/v1/payment/history", methods=["GET"])
+    def payment_history():
+        with state.lock:
+            return jsonify({"payments": list(state.payments.values())})
+    
+    # 用户
+    @api.route("/v1/user/profile", methods=["GET", "PUT"])
+    def user_profile():
+        body = _body()
+        if request.method == "PUT" and "email" in body and not EMAIL_PATTERN.match(str(body["email"])):
+            return _error(400, "INVALID_EMAIL", "A valid email is required")
+        unauthorized = _require_token()
+        if unauthorized:
+            return unauthorized
+        return jsonify(dict({"id": "user-001", "email": Settings.TEST_EMAILS[0]}, **body))
+    
+    @api.route("/v1/user/preferences", methods=["GET", "PUT"])
+    @api.route("/v1/user/orders", methods=["GET"])
+    def user_data():
+        unauthorized = _require_token()
+        if unauthorized:
+            return unauthorized
+        return jsonify(dict({"preferences": {}, "orders": []}, **_body()))
+    
+    @api.route("/v1/user/favorites", methods=["GET", "POST"])
+    def user_favorites():
+        unauthorized = _require_token()
+        if unauthorized:
+            return unauthorized
+        if request.method == "POST":
+            with state.lock:
+                state.favorites.add(_body().get("item_id"))
+            return jsonify({"added": True}), 201
+        with state.lock:
+            return jsonify({"favorites": sorted(state.favorites)})
+    
+    @api.route("/v1/user/favorites/<item_id>", methods=["DELETE"])
+    def remove_user_favorite(item_id):
+        unauthorized = _require_token()
+        if unauthorized:
+            return unauthorized
+        with state.lock:
+            if item_id not in state.favorites:
+                return _error(404, "NOT_FOUND", "Favorite not found")
+            state.favorites.discard(item_id)
+        return jsonify({"removed": True})
+    
+    app.register_blueprint(api, url_prefix=base_path.rstrip("/") or None)
+    return app
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+监控进程的HTTP接口 - 在后台线程中提供 /metrics、状态页 /、/api/status 以及
+存活检查 /healthz、就绪检查 /readyz 等只读接口
+
+所有接口只读取监控进程内存中的聚合数据，请求不会触发探测。
+"""
+
+import json
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from flask import Flask, Response, request
+from werkzeug.serving import make_server
+
+from utils.metrics import CONTENT_TYPE, MetricsRegistry, monitor_metrics
+from utils.status_page import StatusCache
+
+def _cached_response(status: StatusCache, fmt: str, content_type: str) -> Response:
+    """客户端的ETag仍是当前版本时直接返回304，不生成快照"""
+    if status.etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(status.etag)
+    else:
+        etag, body = status.render(fmt)
+        response = Response(body, content_type=content_type)
+        response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+def _health_response(state: Dict, key: str) -> Response:
+    """state[key] 为真时返回200，否则返回503，响应体是 state 的JSON"""
+    response = Response(json.dumps(state, ensure_ascii=False), status=200 if state[key] else 503,
+                        content_type="application/json")
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+def create_monitor_app(metrics: Optional[MetricsRegistry] = None, status: Optional[StatusCache] = None,
+                       health: Optional[Callable[[], Dict]] = None) -> Flask:
+    """
+    创建监控接口的Flask应用，提供status时同时提供状态页和状态JSON
+    
+    health 返回 {"live": bool, "ready": bool, ...}，提供时注册 /healthz 和 /readyz，
+    供容器健康检查用一次本地请求判断监控进程的状态。
+    """
+    metrics = metrics or monitor_metrics
+    app = Flask("kiosk_monitor")
+    
+    @app.get("/metrics")
+    def export_metrics():
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+    
+    if status is not None:
+        @app.get("/")
+        def status_page():
+            return _cached_response(status, "html", "text/html; charset=utf-8")
+        
+        @app.get("/api/status")
+        def status_json():
+            return _cached_response(status, "json", "application/json")
+    
+    if health is not None:
+        @app.get("/healthz")
+        def liveness():
+            return _health_response(health(), "live")
+        
+        @app.get("/readyz")
+        def readiness():
+            return _health_response(health(), "ready")
+    
+    return app
+
+class MonitorWebServer:
+    """在守护线程中运行的多线程HTTP服务，随监控进程退出"""
+    
+    def __init__(self, app: Flask, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._server = make_server(host, port, app, threaded=True)
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self._server.server_port}"
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="monitor-web", daemon=True)
+        self._thread.start()
+        print(f"[{datetime.now()}] 🌐 监控接口: {self.url}/ (状态页), {self.url}/metrics")
+    
+    def stop(self):
+        self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
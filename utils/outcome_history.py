@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+测试结果历史 - 记录每个测试最近几次运行的结果并持久化，用于只重跑失败和不稳定的测试
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.settings import settings
+from utils.result_stream import collapse_results
+
+FAILED_OUTCOMES = ("failed", "error")
+
+class OutcomeHistory:
+    """
+    每个测试最近 window 次运行的结果（按时间顺序），保存在JSON文件中，监控进程重启后仍可用
+    
+    最近一次失败的测试是失败测试；窗口内有过失败、但最近一次已通过的测试是不稳定测试，
+    需要连续通过 window 次才会移出重跑列表。
+    """
+    
+    def __init__(self, path: Optional[str] = None, window: Optional[int] = None):
+        self.path = path or settings.TEST_OUTCOMES_FILE
+        self.window = window or settings.TEST_OUTCOME_WINDOW
+        self._lock = threading.Lock()
+        self.tests: Dict[str, List[str]] = self._load()
+    
+    def _load(self) -> Dict[str, List[str]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {nodeid: [str(o) for o in outcomes][-self.window:] for nodeid, outcomes in data["tests"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+    
+    def _save(self):
+        data = {"updated_at": datetime.now().isoformat(), "tests": self.tests}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".test_outcomes_")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[{datetime.now()}] 保存测试结果历史失败: {e}")
+    
+    def update(self, records: List[Dict], full_run: bool = False, selected: Optional[List[str]] = None):
+        """
+        追加一次运行的结果（结果流中的记录）
+        
+        测试正常执行完时（pytest返回码0或1），删除应当运行却没有出现的测试（已删除或改名）：
+        完整运行检查所有测试，重跑只检查 selected。指定的测试不存在时pytest不执行任何测试，
+        此时不删除，等下一次完整运行清理。
+        """
+        results = collapse_results(records)
+        finished = any(record.get("event") == "finish" and record.get("exitstatus") in (0, 1) for record in records)
+        with self._lock:
+            if finished and full_run and results:
+                self.tests = {nodeid: outcomes for nodeid, outcomes in self.tests.items() if nodeid in results}
+            elif finished and selected:
+                for nodeid in selected:
+                    if nodeid not in results:
+                        self.tests.pop(nodeid, None)
+            for nodeid, record in results.items():
+                outcomes = self.tests.setdefault(nodeid, [])
+                outcomes.append(record["outcome"])
+                del outcomes[:-self.window]
+            self._save()
+    
+    def failing(self) -> List[str]:
+        """最近一次运行失败的测试"""
+        with self._lock:
+            return sorted(nodeid for nodeid, outcomes in self.tests.items() if outcomes and outcomes[-1] in FAILED_OUTCOMES)
+    
+    def flaky(self) -> List[str]:
+        """最近一次通过、但窗口内有过失败的测试"""
+        with self._lock:
+            return sorted(
+                nodeid for nodeid, outcomes in self.tests.items()
+                if outcomes and outcomes[-1] not in FAILED_OUTCOMES and any(o in FAILED_OUTCOMES for o in outcomes)
+            )
+    
+    def rerun_candidates(self) -> List[str]:
+        """需要在两次完整运行之间重跑的测试：失败的和不稳定的"""
+        return sorted(set(self.failing()) | set(self.flaky()))
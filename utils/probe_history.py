@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+探测历史 - 固定容量的环形缓冲区，记录每次API状态检查的时间、结果和延迟
+"""
+
+import math
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+def capacity_for(period_seconds: float, min_interval: float) -> int:
+    """按最短检查间隔计算覆盖整个统计周期所需的容量（自适应间隔在故障时会缩短）"""
+    return max(1, math.ceil(period_seconds / max(min_interval, 0.1)))
+
+class ProbeHistory:
+    """
+    API状态检查的滚动时间序列
+    
+    每条记录只占 时间戳(8字节) + 状态(1字节) + 延迟(4字节)，容量写满后覆盖最旧的记录，
+    内存占用与检查次数无关。
+    """
+    
+    def __init__(self, capacity: int = 8640):
+        self.capacity = capacity
+        self._timestamps = array("d", [0.0]) * capacity
+        self._statuses = array("b", [0]) * capacity
+        self._latencies = array("f", [0.0]) * capacity
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def record(self, available: bool, latency_ms: Optional[float] = None, timestamp: Optional[float] = None):
+        """记录一次检查结果，latency_ms为None表示请求未完成"""
+        with self._lock:
+            self._timestamps[self._next] = time.time() if timestamp is None else timestamp
+            self._statuses[self._next] = 1 if available else 0
+            self._latencies[self._next] = math.nan if latency_ms is None else latency_ms
+            self._next = (self._next + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+    
+    def entries(self, since: Optional[float] = None) -> Iterator[Tuple[float, bool, Optional[float]]]:
+        """按时间顺序返回 (时间戳, 是否可用, 延迟毫秒)"""
+        with self._lock:
+            start = (self._next - self._size) % self.capacity
+            snapshot = [
+                (self._timestamps[i], bool(self._statuses[i]), self._latencies[i])
+                for i in ((start + offset) % self.capacity for offset in range(self._size))
+            ]
+        for timestamp, available, latency_ms in snapshot:
+            if since is not None and timestamp < since:
+                continue
+            yield timestamp, available, (None if math.isnan(latency_ms) else latency_ms)
+    
+    def stats(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict:
+        """
+        统计时间窗口内的可用率、延迟和故障窗口
+        
+        可用率按时间加权：每次检查的结果一直有效到下一次检查（最后一次到until）。
+        """
+        until = time.time() if until is None else until
+        entries = list(self.entries(since))
+        
+        up_seconds = 0.0
+        total_seconds = 0.0
+        latencies: List[float] = []
+        outages = []
+        outage_start = None
+        
+        for index, (timestamp, available, latency_ms) in enumerate(entries):
+            next_timestamp = entries[index + 1][0] if index + 1 < len(entries) else until
+            span = max(0.0, next_timestamp - timestamp)
+            total_seconds += span
+            if available:
+                up_seconds += span
+            if latency_ms is not None:
+                latencies.append(latency_ms)
+            
+            if not available and outage_start is None:
+                outage_start = timestamp
+            elif available and outage_start is not None:
+                outages.append(self._outage(outage_start, timestamp))
+                outage_start = None
+        
+        if outage_start is not None:
+            outages.append(self._outage(outage_start, None, until))
+        
+        latencies.sort()
+        if total_seconds > 0:
+            uptime = up_seconds / total_seconds * 100
+        elif entries:
+            uptime = 100.0 if entries[-1][1] else 0.0
+        else:
+            uptime = None
+        
+        return {
+            "period_start": datetime.fromtimestamp(entries[0][0]).isoformat() if entries else None,
+            "period_end": datetime.fromtimestamp(until).isoformat(),
+            "checks": len(entries),
+            "uptime_percent": round(uptime, 3) if uptime is not None else None,
+            "latency_mean_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+            "latency_p95_ms": round(latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)], 1) if latencies else None,
+            "outages": outages
+        }
+    
+    @staticmethod
+    def _outage(start: float, end: Optional[float], until: Optional[float] = None) -> Dict:
+        """故障窗口，end为None表示故障仍在持续"""
+        return {
+            "start": datetime.fromtimestamp(start).isoformat(),
+            "end": datetime.fromtimestamp(end).isoformat() if end is not None else None,
+            "duration_seconds": round((end if end is not None else until) - start, 1)
+        }
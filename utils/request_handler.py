@@ -1,15 +1,78 @@
 import requests
 import json
-from typing import Dict, Any, Optional
+from functools import cached_property
+from typing import Dict, Any, Mapping, Optional
 from utils.token_manager import get_auth_headers
+from utils.http_client import get_http_session
+from utils.latency_histogram import latency_registry
 from config.env_config import BASE_URL
 
+class APIResult:
+    """
+    API请求结果
+    
+    响应体只在访问 json 时才解析，并且只解析一次；也支持 result["status_code"] 这样的字典式访问。
+    """
+    
+    def __init__(self, method: str, url: str, response: requests.Response):
+        self.method = method.upper()
+        self.url = url
+        self.response = response
+        self.json_error: Optional[str] = None
+    
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+    
+    @property
+    def headers(self):
+        return self.response.headers
+    
+    @property
+    def text(self) -> str:
+        return self.response.text
+    
+    @cached_property
+    def json(self) -> Any:
+        """解析后的JSON响应体，非JSON时为None并记录 json_error"""
+        try:
+            return self.response.json()
+        except ValueError as e:
+            self.json_error = str(e)
+            return None
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == "json_error":
+            # json_error 依赖解析结果
+            self.json
+        return getattr(self, key)
+    
+    def __repr__(self) -> str:
+        return f"<APIResult {self.method} {self.url} [{self.status_code}]>"
+
 class RequestHandler:
     """请求处理器工具类"""
     
-    def __init__(self, base_url: str = BASE_URL):
+    def __init__(self, base_url: str = BASE_URL, session: Optional[requests.Session] = None):
         self.base_url = base_url
-        self.session = requests.Session()
+        self._session = session
+    
+    @property
+    def session(self) -> requests.Session:
+        """未指定会话时使用进程内共享的连接池会话（共享会话关闭后会自动重建）"""
+        return self._session or get_http_session()
+    
+    def request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None,
+                headers: Optional[Mapping[str, str]] = None, token: Optional[str] = None) -> APIResult:
+        """发送请求并返回 APIResult，连接异常原样抛出"""
+        url = f"{self.base_url}{endpoint}"
+        response = self.session.request(
+            method.upper(), url,
+            json=data,
+            params=params,
+            headers=headers or get_auth_headers(token)
+        )
+        return APIResult(method, url, response)
     
     def get(self, endpoint: str, params: Optional[Dict] = None, token: Optional[str] = None) -> requests.Response:
         """发送GET请求"""
@@ -46,6 +109,10 @@ class RequestHandler:
         response = self.session.patch(url, headers=headers, json=data)
         return response
     
+    def get_latency_stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """获取按 方法+端点模板 统计的 connect/tls/ttfb/total 延迟百分位"""
+        return latency_registry.snapshot()
+    
     def validate_response(self, response: requests.Response, expected_status_codes: list = None) -> bool:
         """验证响应状态码"""
         if expected_status_codes is None:
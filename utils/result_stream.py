@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+测试结果流 - pytest每完成一个测试就向JSON Lines文件追加一行，监控进程增量读取
+"""
+
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# 失败信息最多保留的字符数
+MAX_MESSAGE_LENGTH = 500
+
+def _outcome(report) -> Optional[str]:
+    """把pytest各阶段的报告归并为一个测试结果，不需要记录的阶段返回None"""
+    if report.when == "call":
+        if hasattr(report, "wasxfail"):
+            return "xfailed" if report.skipped else "xpassed"
+        return report.outcome
+    # setup/teardown 只在失败或跳过时记录
+    if report.failed:
+        return "error"
+    if report.when == "setup" and report.skipped:
+        return "skipped"
+    return None
+
+class ResultStreamPlugin:
+    """
+    pytest插件：每个测试结束时写入一行 {nodeid, outcome, duration, endpoints}
+    
+    文件按行缓冲写入，运行过程中即可被读取；xdist下只在controller注册，worker的报告会汇总到controller。
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.run_id = uuid.uuid4().hex[:12]
+        self.counts: Dict[str, int] = {}
+        self._start = time.time()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", buffering=1)
+    
+    def _write(self, record: Dict):
+        record["run_id"] = self.run_id
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    
+    def pytest_sessionstart(self, session):
+        self._start = time.time()
+        self._write({"event": "start", "timestamp": datetime.now().isoformat()})
+    
+    def pytest_runtest_logreport(self, report):
+        outcome = _outcome(report)
+        if outcome is None:
+            return
+        
+        message = ""
+        if report.failed:
+            crash = getattr(report.longrepr, "reprcrash", None)
+            lines = str(report.longrepr).strip().splitlines()
+            message = (crash.message if crash is not None else (lines[-1] if lines else ""))[:MAX_MESSAGE_LENGTH]
+        elif report.skipped and isinstance(report.longrepr, tuple):
+            message = str(report.longrepr[2])[:MAX_MESSAGE_LENGTH]
+        
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        self._write({
+            "event": "test",
+            "nodeid": report.nodeid,
+            "when": report.when,
+            "outcome": outcome,
+            "duration": round(report.duration, 4),
+            "endpoints": dict(report.user_properties).get("endpoints", []),
+            "message": message,
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    def pytest_sessionfinish(self, session, exitstatus):
+        self._write({
+            "event": "finish",
+            "exitstatus": int(exitstatus),
+            "duration": round(time.time() - self._start, 2),
+            "counts": self.counts,
+            "timestamp": datetime.now().isoformat()
+        })
+        self._file.close()
+
+class ResultStreamReader:
+    """增量读取结果文件：记住读取位置，每次只解析新写入的完整行"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self._partial = b""
+    
+    def poll(self) -> List[Dict]:
+        """返回自上次调用以来新增的记录，文件尚未创建时返回空列表"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                chunk = f.read()
+        except OSError:
+            return []
+        self.offset += len(chunk)
+        
+        data = self._partial + chunk
+        lines = data.split(b"\n")
+        # 最后一段可能是还没写完的行
+        self._partial = lines.pop()
+        
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+def collapse_results(records: List[Dict]) -> Dict[str, Dict]:
+    """每个测试只保留一条记录：同一测试的teardown错误覆盖call结果"""
+    tests: Dict[str, Dict] = {}
+    for record in records:
+        if record.get("event") == "test":
+            previous = tests.get(record["nodeid"])
+            if previous is None or record["outcome"] == "error" or previous["outcome"] != "error":
+                tests[record["nodeid"]] = record
+    return tests
+
+def summarize_results(records: List[Dict]) -> Dict:
+    """按测试汇总结果，返回各类计数和失败列表"""
+    tests = collapse_results(records)
+    finish = None
+    for record in records:
+        if record.get("event") == "finish":
+            finish = record
+    
+    counts = {"passed": 0, "failed": 0, "skipped": 0, "error": 0, "xfailed": 0, "xpassed": 0}
+    for record in tests.values():
+        counts[record["outcome"]] = counts.get(record["outcome"], 0) + 1
+    
+    return {
+        "total_tests": len(tests),
+        "passed": counts["passed"],
+        "failed": counts["failed"],
+        "errors": counts["error"],
+        "skipped": counts["skipped"],
+        "xfailed": counts["xfailed"],
+        "xpassed": counts["xpassed"],
+        "duration_seconds": finish["duration"] if finish else None,
+        "finished": finish is not None,
+        "failures": [
+            {
+                "nodeid": record["nodeid"],
+                "outcome": record["outcome"],
+                "endpoints": record.get("endpoints", []),
+                "message": record.get("message", "")
+            }
+            for record in tests.values() if record["outcome"] in ("failed", "error")
+        ]
+    }
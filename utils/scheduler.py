@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+任务调度器 - 一个调度线程按截止时间唤醒，任务在线程池中并发执行
+
+替代 schedule + time.sleep(60) 的轮询：支持秒级间隔和随机抖动，慢任务不阻塞其他任务，
+同一任务上一次还没结束时跳过本次执行；间隔任务按计划时间而不是完成时间推进，不会漂移。
+"""
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+class Job:
+    """一个定时任务：每 interval 秒执行，或每天 at（"HH:MM"，本地时间）执行"""
+    
+    def __init__(self, name: str, func: Callable, interval: Optional[float] = None,
+                 at: Optional[str] = None, jitter: float = 0.0, run_now: bool = False):
+        if (interval is None) == (at is None):
+            raise ValueError("interval 和 at 必须且只能指定一个")
+        if interval is not None and interval <= 0:
+            raise ValueError("interval 必须大于0")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.at = datetime.strptime(at, "%H:%M").time() if at is not None else None
+        self.jitter = jitter
+        # 计划执行时间（time.monotonic），不含抖动；due_at 是加上本次抖动后的实际触发时间
+        now = time.monotonic()
+        self.next_run = now if run_now else self._following(now)
+        self.due_at = self.next_run
+        self.running = False
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error = ""
+    
+    def _following(self, now: float) -> float:
+        """now之后的下一个计划时间（首次调度）"""
+        if self.interval is not None:
+            return now + self.interval
+        return now + self._seconds_until_daily()
+    
+    def _seconds_until_daily(self) -> float:
+        """距离下一个每日执行时刻的秒数，按墙上时间计算"""
+        current = datetime.now()
+        target = datetime.combine(current.date(), self.at)
+        if target <= current:
+            target += timedelta(days=1)
+        return (target - current).total_seconds()
+    
+    def advance(self, now: float):
+        """
+        推进到下一个计划时间
+        
+        间隔任务在上一个计划时间上加 interval；错过的周期（例如进程被挂起）直接跳过，不补跑。
+        """
+        if self.interval is not None:
+            self.next_run += self.interval
+            if self.next_run <= now:
+                self.next_run += math.ceil((now - self.next_run) / self.interval + 1e-9) * self.interval
+        else:
+            # 至少推进一分钟，避免同一分钟内重复触发
+            self.next_run = now + max(self._seconds_until_daily(), 60)
+        self.due_at = self.next_run + (random.uniform(0, self.jitter) if self.jitter else 0)
+    
+    def status(self) -> Dict:
+        """任务运行状态"""
+        return {
+            "name": self.name,
+            "schedule": f"every {self.interval}s" if self.interval is not None else f"daily at {self.at.strftime('%H:%M')}",
+            "running": self.running,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_started": datetime.fromtimestamp(self.last_started).isoformat() if self.last_started else None,
+            "last_duration_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "last_error": self.last_error,
+            "next_run_in_seconds": round(max(0.0, self.due_at - time.monotonic()), 1)
+        }
+
+class Scheduler:
+    """
+    事件驱动的调度器
+    
+    调度线程在条件变量上等待到最近一个任务的触发时间（添加任务时立即唤醒），
+    到期的任务提交给线程池执行。调度线程至少每 HEARTBEAT_INTERVAL 秒醒来一次更新心跳，
+    存活检查据此判断调度线程是否卡住。on_change 在任务开始和结束时调用（不持有调度器的锁）。
+    """
+    
+    HEARTBEAT_INTERVAL = 5.0
+    
+    def __init__(self, max_workers: int = 4, on_change: Optional[Callable[[], None]] = None):
+        self.max_workers = max_workers
+        self.on_change = on_change
+        self.jobs: List[Job] = []
+        self._condition = threading.Condition()
+        self._stop = False
+        # 调度线程最近一次醒来的时间（time.monotonic）
+        self.heartbeat: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def every(self, seconds: float, func: Callable, name: Optional[str] = None,
+              jitter: float = 0.0, run_now: bool = False) -> Job:
+        """每 seconds 秒执行一次，jitter 为每次触发额外随机延迟的上限（秒）"""
+        return self.add(Job(name or func.__name__, func, interval=seconds, jitter=jitter, run_now=run_now))
+    
+    def daily(self, at: str, func: Callable, name: Optional[str] = None, jitter: float = 0.0) -> Job:
+        """每天在 at（"HH:MM"）执行一次"""
+        return self.add(Job(name or func.__name__, func, at=at, jitter=jitter))
+    
+    def add(self, job: Job) -> Job:
+        with self._condition:
+            self.jobs.append(job)
+            self._condition.notify()
+        return job
+    
+    def reschedule(self, job: Job, interval: float, jitter: Optional[float] = None):
+        """
+        修改间隔任务的间隔，下一次执行时间按上一次计划时间加新间隔重新计算
+        
+        缩短间隔时立即唤醒调度线程，可以在任务自身执行过程中调用。
+        """
+        if job.interval is None:
+            raise ValueError("只能修改间隔任务的间隔")
+        with self._condition:
+            previous_run = job.next_run - job.interval
+            job.interval = interval
+            if jitter is not None:
+                job.jitter = jitter
+            job.next_run = max(previous_run + interval, time.monotonic())
+            job.due_at = job.next_run + (random.uniform(0, job.jitter) if job.jitter else 0)
+            self._condition.notify()
+    
+    def trigger(self, job: Job):
+        """立即执行一次任务，之后按间隔重新计时；任务正在执行时与定时触发一样跳过"""
+        with self._condition:
+            job.next_run = job.due_at = time.monotonic()
+            self._condition.notify()
+    
+    def heartbeat_age(self) -> Optional[float]:
+        """距调度线程最近一次心跳的秒数，调度线程未运行时返回None；不加锁，可在任何线程中调用"""
+        if self._thread is None or not self._thread.is_alive() or self.heartbeat is None:
+            return None
+        return time.monotonic() - self.heartbeat
+    
+    def status(self) -> List[Dict]:
+        """所有任务的运行状态"""
+        with self._condition:
+            return [job.status() for job in self.jobs]
+    
+    def start(self):
+        """启动调度线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = False
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="monitor-job")
+        self._thread = threading.Thread(target=self._loop, name="monitor-scheduler", daemon=True)
+        self._thread.start()
+    
+    def stop(self, wait: bool = True):
+        """停止调度，wait为True时等待正在执行的任务结束"""
+        with self._condition:
+            self._stop = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+    
+    def run_forever(self):
+        """启动并阻塞当前线程，Ctrl+C 时停止"""
+        self.start()
+        try:
+            while self._thread is not None and self._thread.is_alive():
+                self._thread.join(1)
+        except KeyboardInterrupt:
+            print(f"[{datetime.now()}] 收到中断信号，停止监控")
+        finally:
+            self.stop(wait=False)
+    
+    def _loop(self):
+        with self._condition:
+            while not self._stop:
+                now = time.monotonic()
+                self.heartbeat = now
+                for job in self.jobs:
+                    if job.due_at <= now:
+                        self._dispatch(job)
+                        job.advance(now)
+                timeout = min(min((job.due_at for job in self.jobs), default=now + 60) - time.monotonic(),
+                              self.HEARTBEAT_INTERVAL)
+                if timeout > 0:
+                    self._condition.wait(timeout)
+    
+    def _dispatch(self, job: Job):
+        """提交任务，上一次还在执行时跳过；调用方持有条件变量的锁"""
+        if job.running:
+            job.skipped += 1
+            print(f"[{datetime.now()}] ⏭️ 任务 {job.name} 上一次尚未结束，跳过本次执行")
+            return
+        job.running = True
+        job.last_started = time.time()
+        self._executor.submit(self._run, job)
+    
+    def _notify_change(self):
+        if self.on_change is None:
+            return
+        try:
+            self.on_change()
+        except Exception as e:
+            print(f"[{datetime.now()}] 任务状态回调出错: {type(e).__name__}: {e}")
+    
+    def _run(self, job: Job):
+        self._notify_change()
+        start = time.perf_counter()
+        try:
+            job.func()
+            error = ""
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"[{datetime.now()}] 任务 {job.name} 执行出错: {error}")
+        with self._condition:
+            job.running = False
+            job.runs += 1
+            job.last_duration = time.perf_counter() - start
+            job.last_finished = time.time()
+            if error:
+                job.failures += 1
+                job.last_error = error
+        self._notify_change()
+
+class AdaptiveInterval:
+    """
+    按健康状态调整的探测间隔
+    
+    健康时从 base 开始，每连续 healthy_streak 次正常翻倍，最多到 healthy_max；
+    一旦异常立即降到 degraded_min 快速探测，持续异常时按指数退避，最多到 degraded_max；
+    恢复后回到 base。每次状态切换记录精确时间。
+    """
+    
+    def __init__(self, base: float, healthy_max: float, degraded_min: float, degraded_max: float,
+                 healthy_streak: int = 4, max_transitions: int = 100):
+        self.base = base
+        self.healthy_max = max(healthy_max, base)
+        self.degraded_min = degraded_min
+        self.degraded_max = max(degraded_max, degraded_min)
+        self.healthy_streak = max(1, healthy_streak)
+        self.interval = base
+        self.healthy: Optional[bool] = None
+        # 当前状态下连续探测的次数，以及进入当前状态的时间
+        self.streak = 0
+        self.since: Optional[float] = None
+        self.transitions = deque(maxlen=max_transitions)
+    
+    def update(self, healthy: bool, timestamp: Optional[float] = None) -> float:
+        """记录一次探测结果，返回下一次探测的间隔"""
+        timestamp = time.time() if timestamp is None else timestamp
+        if healthy != self.healthy:
+            if self.healthy is not None:
+                self.transitions.append({
+                    "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                    "state": "up" if healthy else "down",
+                    "previous_state_seconds": round(timestamp - self.since, 3)
+                })
+            self.healthy = healthy
+            self.streak = 0
+            self.since = timestamp
+        self.streak += 1
+        
+        # 指数部分封顶，避免长时间稳定后整数过大
+        if healthy:
+            exponent = min((self.streak - 1) // self.healthy_streak, 30)
+            self.interval = min(self.healthy_max, self.base * 2 ** exponent)
+        else:
+            exponent = min(self.streak - 1, 30)
+            self.interval = min(self.degraded_max, self.degraded_min * 2 ** exponent)
+        return self.interval
+    
+    def status(self) -> Dict:
+        """当前状态、间隔和最近的状态切换"""
+        return {
+            "state": None if self.healthy is None else ("up" if self.healthy else "down"),
+            "interval_seconds": self.interval,
+            "since": datetime.fromtimestamp(self.since).isoformat() if self.since is not None else None,
+            "transitions": list(self.transitions)
+        }
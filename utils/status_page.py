@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+状态页 - 监控进程内存中的状态快照，渲染为JSON和HTML并缓存
+
+只有监控状态变化（新的探测或测试结果）时才重新渲染；ETag 由进程标识和状态版本组成，
+轮询的客户端带上 If-None-Match 即可得到304，不需要重新传输。
+"""
+
+import json
+import threading
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+STATUS_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+<meta charset="utf-8">
+<meta http-equiv="refresh" content="{{ refresh_seconds }}">
+<title>Kiosk API 状态</title>
+<style>
+body { font-family: -apple-system, "PingFang SC", "Microsoft YaHei", sans-serif; margin: 24px; color: #222; }
+h1 { font-size: 22px; }
+h2 { font-size: 17px; margin-top: 28px; }
+table { border-collapse: collapse; min-width: 480px; }
+th, td { border-bottom: 1px solid #ddd; padding: 4px 12px 4px 0; text-align: left; font-size: 14px; }
+.up { color: #1a7f37; font-weight: bold; }
+.down { color: #cf222e; font-weight: bold; }
+.muted { color: #777; font-size: 13px; }
+</style>
+</head>
+<body>
+<h1>Kiosk API 状态
+{% if status.api.available is none %}<span class="muted">尚未检查</span>
+{% elif status.api.available %}<span class="up">✅ 可用</span>
+{% else %}<span class="down">❌ 不可用</span>{% endif %}
+</h1>
+<p class="muted">{{ status.api.base_url }} · 更新于 {{ status.generated_at }} · 检查间隔 {{ status.api.interval_seconds }} 秒
+{% if status.api.since %} · 当前状态始于 {{ status.api.since }}{% endif %}</p>
+
+<h2>可用率</h2>
+<table>
+<tr><th>时间窗口</th><th>检查次数</th><th>可用率</th><th>平均延迟</th><th>p95延迟</th><th>故障次数</th></tr>
+{% for window, stats in status.availability.items() %}
+<tr><td>{{ window }}</td><td>{{ stats.checks }}</td>
+<td>{{ stats.uptime_percent if stats.uptime_percent is not none else "-" }}%</td>
+<td>{{ stats.latency_mean_ms if stats.latency_mean_ms is not none else "-" }} ms</td>
+<td>{{ stats.latency_p95_ms if stats.latency_p95_ms is not none else "-" }} ms</td>
+<td>{{ stats.outages|length }}</td></tr>
+{% endfor %}
+</table>
+
+<h2>端点探测</h2>
+{% if status.fleet %}
+<p class="muted">{{ status.fleet.ok }}/{{ status.fleet.total }} 正常 · {{ status.fleet.finished_at }}</p>
+<table>
+<tr><th>环境 [realm]</th><th>正常</th><th>总数</th></tr>
+{% for name, group in status.fleet.by_realm.items() %}
+<tr><td>{{ name }}</td><td>{{ group.ok }}</td><td>{{ group.total }}</td></tr>
+{% endfor %}
+</table>
+{% for failure in status.fleet.failed %}
+<p class="down">{{ failure.method }} {{ failure.base_url }}{{ failure.endpoint }} [{{ failure.realm_id }}]
+{{ failure.status_code or failure.error }}</p>
+{% endfor %}
+{% else %}<p class="muted">尚未探测</p>{% endif %}
+
+<h2>最近一次测试运行</h2>
+{% if status.tests %}
+<p>{{ status.tests.passed }} 通过 · {{ status.tests.failed }} 失败 · {{ status.tests.errors }} 错误 · {{ status.tests.skipped }} 跳过
+<span class="muted">· {{ status.tests.finished_at }}</span></p>
+{% for failure in status.tests.failures %}
+<p class="down">{{ failure.nodeid }} <span class="muted">{{ failure.endpoints|join(", ") }}</span><br>{{ failure.message }}</p>
+{% endfor %}
+{% else %}<p class="muted">尚未运行</p>{% endif %}
+
+<h2>状态切换</h2>
+{% for transition in status.api.transitions|reverse %}
+<p><span class="{{ transition.state }}">{{ "恢复" if transition.state == "up" else "故障" }}</span>
+{{ transition.timestamp }} <span class="muted">（此前持续 {{ transition.previous_state_seconds }} 秒）</span></p>
+{% else %}<p class="muted">无</p>{% endfor %}
+</body>
+</html>
+"""
+
+class StatusCache:
+    """
+    按状态版本缓存的状态快照
+    
+    build 返回当前状态的字典；监控状态变化时调用 invalidate，下一次读取才重新生成快照和HTML。
+    """
+    
+    def __init__(self, build: Callable[[], Dict], refresh_seconds: int = 10):
+        self.build = build
+        self.refresh_seconds = refresh_seconds
+        self._boot_id = uuid.uuid4().hex[:8]
+        self._version = 0
+        self._lock = threading.Lock()
+        # 已渲染的内容：格式 -> (版本, 内容)
+        self._rendered: Dict[str, Tuple[int, bytes]] = {}
+        self._snapshot: Optional[Tuple[int, Dict]] = None
+    
+    def invalidate(self):
+        """监控状态已变化"""
+        with self._lock:
+            self._version += 1
+    
+    @property
+    def etag(self) -> str:
+        return f"{self._boot_id}-{self._version}"
+    
+    def snapshot(self) -> Tuple[str, Dict]:
+        """返回 (ETag, 状态字典)，同一版本只生成一次"""
+        with self._lock:
+            version = self._version
+            if self._snapshot is None or self._snapshot[0] != version:
+                self._snapshot = (version, self.build())
+            return f"{self._boot_id}-{version}", self._snapshot[1]
+    
+    def render(self, fmt: str) -> Tuple[str, bytes]:
+        """返回 (ETag, 渲染后的内容)，fmt 为 "json" 或 "html"；需要在Flask应用上下文中调用"""
+        etag, status = self.snapshot()
+        version = int(etag.rsplit("-", 1)[1])
+        with self._lock:
+            cached = self._rendered.get(fmt)
+            if cached is not None and cached[0] == version:
+                return etag, cached[1]
+        if fmt == "json":
+            body = json.dumps(status, ensure_ascii=False, default=str).encode("utf-8")
+        else:
+            from flask import render_template_string
+            
+            body = render_template_string(STATUS_TEMPLATE, status=status,
+                                          refresh_seconds=self.refresh_seconds).encode("utf-8")
+        with self._lock:
+            self._rendered[fmt] = (version, body)
+        return etag, body
@@ -1,8 +1,312 @@
-def get_auth_headers(token: str = None):
+import json
+import os
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import requests
+
+from config.env_config import BASE_URL
+from config.settings import settings
+from utils.http_client import get_http_session
+
+try:
+    import fcntl
+except ImportError:  # Windows下没有fcntl，退化为仅进程内加锁
+    fcntl = None
+
+@lru_cache(maxsize=256)
+def build_auth_headers(realm_id: str, appz_id: str, token: Optional[str] = None) -> Mapping[str, str]:
+    """按 (realm, app, token) 构建一次并缓存的只读请求头"""
     headers = {
-        "X-Realm-ID": "dev-realm",
-        "X-Appz-ID": "kiosk-self-ordering"
+        "X-Realm-ID": realm_id,
+        "X-Appz-ID": appz_id
     }
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    return headers
+    return MappingProxyType(headers)
+
+def get_auth_headers(token: str = None, realm_id: Optional[str] = None,
+                     appz_id: Optional[str] = None) -> Mapping[str, str]:
+    """
+    获取请求头，默认使用 Settings.REALM_ID / Settings.APPZ_ID
+    
+    返回的是预先构建好的只读映射，同一组参数每次返回同一个对象；需要修改时先 dict(...) 复制。
+    """
+    return build_auth_headers(realm_id or settings.REALM_ID, appz_id or settings.APPZ_ID, token)
+
+def _extract_token(data: Dict) -> Tuple[Optional[str], Optional[float]]:
+    """从登录响应中取出 (token, 有效期秒数)，兼容 data 嵌套和驼峰命名"""
+    if isinstance(data.get("data"), dict):
+        data = {**data, **data["data"]}
+    token = data.get("token") or data.get("access_token") or data.get("accessToken")
+    expires_in = data.get("expires_in") or data.get("expiresIn")
+    try:
+        expires_in = float(expires_in) if expires_in is not None else None
+    except (TypeError, ValueError):
+        expires_in = None
+    return token, expires_in
+
+def _token_entry(token: str, ttl: float) -> Dict:
+    """
+    缓存条目：过期前 TOKEN_REFRESH_MARGIN 秒开始刷新；
+    有效期比刷新提前量还短时，在有效期过半时刷新，避免每次获取都重新登录
+    """
+    now = time.time()
+    return {
+        "token": token,
+        "expires_at": now + ttl,
+        "refresh_at": now + max(ttl - settings.TOKEN_REFRESH_MARGIN, ttl / 2)
+    }
+
+class TokenManager:
+    """
+    测试账号的登录token管理
+    
+    每个账号只登录一次，token和过期时间缓存在进程内和磁盘文件中（xdist worker之间、多次运行之间共享），
+    后台线程在过期前 Settings.TOKEN_REFRESH_MARGIN 秒主动刷新；同一账号的并发获取只触发一次登录。
+    """
+    
+    def __init__(self, base_url: str = BASE_URL, cache_file: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
+        self.base_url = base_url
+        self.cache_file = cache_file or settings.TOKEN_CACHE_FILE
+        self._session = session
+        self._cache_key = f"{base_url}|{settings.REALM_ID}"
+        # account -> {"token": ..., "expires_at": ..., "refresh_at": ...}
+        self._tokens: Dict[str, Dict] = {}
+        # account -> 最近一次登录失败的时间
+        self._failures: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._account_locks: Dict[str, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self.login_count = 0
+    
+    @property
+    def session(self) -> requests.Session:
+        return self._session or get_http_session()
+    
+    @staticmethod
+    def accounts() -> List[str]:
+        """所有测试账号：邮箱和手机号"""
+        return settings.TEST_EMAILS + settings.TEST_PHONES
+    
+    def get_token(self, account: Optional[str] = None) -> Optional[str]:
+        """
+        获取账号的token，默认使用第一个测试邮箱
+        
+        缓存的token未到刷新时间时直接返回；否则登录一次，
+        登录失败但旧token尚未过期时仍返回旧token。API不可用或登录失败时返回None。
+        """
+        account = account or settings.TEST_EMAILS[0]
+        entry = self._fresh_entry(account)
+        if entry is not None:
+            return entry["token"]
+        
+        with self._account_lock(account):
+            # 等锁期间其他线程可能已完成登录
+            entry = self._fresh_entry(account)
+            if entry is not None:
+                return entry["token"]
+            return self._refresh(account)
+    
+    def invalidate(self, account: Optional[str] = None):
+        """丢弃账号的token（例如接口返回401时），下次获取会重新登录"""
+        account = account or settings.TEST_EMAILS[0]
+        with self._lock:
+            self._tokens.pop(account, None)
+            self._failures.pop(account, None)
+        with self._file_lock():
+            tokens = self._read_disk()
+            if tokens.pop(account, None) is not None:
+                self._write_disk(tokens)
+    
+    def start_refresher(self, interval: Optional[float] = None):
+        """启动后台刷新线程，定期刷新即将过期的token"""
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        interval = settings.TOKEN_REFRESH_INTERVAL if interval is None else interval
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(interval,), name="token-refresher", daemon=True
+        )
+        self._refresher.start()
+    
+    def stop_refresher(self):
+        """停止后台刷新线程"""
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+    
+    def refresh_expiring(self):
+        """刷新所有即将过期的token"""
+        with self._lock:
+            accounts = list(self._tokens)
+        for account in accounts:
+            if self._fresh_entry(account) is None:
+                with self._account_lock(account):
+                    if self._fresh_entry(account) is None:
+                        self._refresh(account)
+    
+    def _refresh_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.refresh_expiring()
+            except Exception as e:
+                print(f"刷新token失败: {e}")
+    
+    def _account_lock(self, account: str) -> threading.Lock:
+        with self._lock:
+            return self._account_locks.setdefault(account, threading.Lock())
+    
+    def _fresh_entry(self, account: str) -> Optional[Dict]:
+        """返回未到刷新时间的token，优先使用进程内缓存，其次是磁盘缓存"""
+        now = time.time()
+        entry = self._tokens.get(account)
+        if entry is not None and now < entry["refresh_at"]:
+            return entry
+        
+        entry = self._read_disk().get(account)
+        if entry is not None and now < entry["refresh_at"]:
+            with self._lock:
+                self._tokens[account] = entry
+            return entry
+        return None
+    
+    def _refresh(self, account: str) -> Optional[str]:
+        """登录并更新缓存，调用方需持有账号锁"""
+        with self._file_lock():
+            # 等文件锁期间其他进程可能已完成登录
+            entry = self._read_disk().get(account)
+            if entry is not None and time.time() < entry["refresh_at"]:
+                with self._lock:
+                    self._tokens[account] = entry
+                return entry["token"]
+            
+            current = self._tokens.get(account)
+            fallback = current["token"] if current and current["expires_at"] > time.time() else None
+            if time.time() - self._failures.get(account, 0) < settings.TOKEN_LOGIN_RETRY_AFTER:
+                return fallback
+            
+            token, expires_in = self._login(account)
+            if token is None:
+                self._failures[account] = time.time()
+                return fallback
+            
+            entry = _token_entry(token, expires_in or settings.TOKEN_DEFAULT_TTL)
+            with self._lock:
+                self._tokens[account] = entry
+                self._failures.pop(account, None)
+            tokens = self._read_disk()
+            tokens[account] = entry
+            self._write_disk(tokens)
+            return token
+    
+    def _login(self, account: str) -> Tuple[Optional[str], Optional[float]]:
+        """用测试账号登录，返回 (token, 有效期秒数)"""
+        if "@" in account:
+            url = f"{self.base_url}/auth/login/email"
+            payload = {"email": account, "password": settings.TEST_PASSWORD}
+        else:
+            url = f"{self.base_url}/auth/login/phone"
+            payload = {"phone": account, "verificationCode": settings.TEST_VERIFICATION_CODE}
+        
+        self.login_count += 1
+        try:
+            response = self.session.post(url, json=payload, headers=get_auth_headers(), timeout=10)
+        except requests.exceptions.RequestException as e:
+            print(f"登录失败 {account}: {e}")
+            return None, None
+        if response.status_code not in [200, 201]:
+            print(f"登录失败 {account}: 状态码 {response.status_code}")
+            return None, None
+        try:
+            return _extract_token(response.json())
+        except ValueError:
+            return None, None
+    
+    def _file_lock(self):
+        """跨进程的文件锁，没有fcntl时只是空的上下文"""
+        return _FileLock(self.cache_file + ".lock")
+    
+    def _read_disk(self) -> Dict[str, Dict]:
+        """读取磁盘缓存中当前环境的token，文件不存在或损坏时返回空字典"""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            tokens = data.get(self._cache_key, {})
+            return {
+                account: {
+                    "token": str(entry["token"]),
+                    "expires_at": float(entry["expires_at"]),
+                    "refresh_at": float(entry["refresh_at"])
+                }
+                for account, entry in tokens.items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+    
+    def _write_disk(self, tokens: Dict[str, Dict]):
+        """把当前环境的token写回磁盘缓存，保留其他环境的记录"""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                data = {}
+        except (OSError, ValueError):
+            data = {}
+        data[self._cache_key] = tokens
+        
+        try:
+            directory = os.path.dirname(self.cache_file) or "."
+            os.makedirs(directory, exist_ok=True)
+            # mkstemp创建的文件只有当前用户可读写
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".kiosk_api_tokens_")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            pass
+
+class _FileLock:
+    """基于fcntl.flock的排他锁"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+    
+    def __enter__(self):
+        if fcntl is not None:
+            try:
+                self._file = open(self.path, "w")
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            except OSError:
+                self._file = None
+        return self
+    
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+_token_manager: Optional[TokenManager] = None
+_token_manager_lock = threading.Lock()
+
+def get_token_manager() -> TokenManager:
+    """获取进程内共享的token管理器"""
+    global _token_manager
+    if _token_manager is None:
+        with _token_manager_lock:
+            if _token_manager is None:
+                _token_manager = TokenManager()
+    return _token_manager
+
+def get_auth_token(account: Optional[str] = None) -> Optional[str]:
+    """获取测试账号的token（登录一次后复用）"""
+    return get_token_manager().get_token(account)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+常驻测试运行器 - 在长期运行的worker进程中预先导入pytest、插件并收集一次测试，
+每次运行从预热好的worker fork出子进程调用 pytest.main
+
+每次运行都在新的子进程中执行，运行之间互不影响；省掉解释器启动、插件加载和测试模块导入的固定开销。
+worker用spawn方式启动，监控进程本身是多线程的，不能直接fork。测试代码修改后自动重启worker，
+不支持fork的平台上退回为每次启动 python -m pytest 子进程。
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+# 预热时收集测试，导入测试模块和conftest（pytest会对其做断言改写）
+PRELOAD_ARGS = ["--collect-only", "-q", "--no-collection-cache"]
+# 这些目录下的 .py 文件修改后，预热的模块已过期，需要重启worker
+WATCH_DIRS = ("tests", "utils", "config")
+
+def code_signature(rootdir: str, watch_dirs: Sequence[str] = WATCH_DIRS) -> tuple:
+    """被监视目录下所有 .py 文件的 (路径, mtime)，以及pytest配置文件的mtime"""
+    entries = []
+    for name in watch_dirs:
+        for directory, dirnames, files in os.walk(os.path.join(rootdir, name)):
+            dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+            for filename in files:
+                if filename.endswith(".py"):
+                    path = os.path.join(directory, filename)
+                    try:
+                        entries.append((path, os.path.getmtime(path)))
+                    except OSError:
+                        pass
+    for filename in ("pytest.ini", "conftest.py"):
+        path = os.path.join(rootdir, filename)
+        if os.path.exists(path):
+            entries.append((path, os.path.getmtime(path)))
+    return tuple(sorted(entries))
+
+def _redirect_output(path: str) -> List[int]:
+    """把标准输出和标准错误重定向到文件，返回原来的文件描述符"""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = [os.dup(1), os.dup(2)]
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    os.close(fd)
+    return saved
+
+def _restore_output(saved: List[int]):
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(saved[0], 1)
+    os.dup2(saved[1], 2)
+    for fd in saved:
+        os.close(fd)
+
+def _serve(conn, rootdir: str, preload_args: List[str]):
+    """worker进程：预热后逐个执行运行请求，每个请求fork一个子进程"""
+    os.chdir(rootdir)
+    if rootdir not in sys.path:
+        sys.path.insert(0, rootdir)
+    start = time.perf_counter()
+    try:
+        import pytest
+        saved = _redirect_output(os.devnull)
+        try:
+            collect_status = int(pytest.main(list(preload_args)))
+        finally:
+            _restore_output(saved)
+        # 预热的对象移入永久代：子进程中的垃圾回收（pytest结束时会连续回收多次）不再扫描它们，
+        # 也不会因写入引用计数而复制这些内存页
+        gc.collect()
+        gc.freeze()
+        conn.send({"event": "ready", "preload_seconds": round(time.perf_counter() - start, 3),
+                   "collect_status": collect_status})
+    except Exception as e:
+        conn.send({"event": "ready", "error": f"{type(e).__name__}: {e}"})
+        return
+    
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        
+        pid = os.fork()
+        if pid == 0:
+            # 子进程：输出写入日志文件，运行结束直接退出，不执行父进程的清理逻辑
+            code = 1
+            try:
+                conn.close()
+                _redirect_output(request["log_path"])
+                code = int(pytest.main(list(request["args"])))
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        
+        conn.send({"event": "started", "pid": pid})
+        _, status = os.waitpid(pid, 0)
+        conn.send({"event": "finished", "returncode": os.waitstatus_to_exitcode(status)})
+
+class WarmRun:
+    """一次运行，接口与 subprocess.Popen 的 poll/wait/returncode 一致"""
+    
+    def __init__(self, runner: "WarmTestRunner", conn):
+        self._runner = runner
+        self._conn = conn
+        self.pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+    
+    def _receive(self, timeout: Optional[float]) -> bool:
+        """处理worker发来的消息，运行已结束时返回True"""
+        try:
+            while self.returncode is None and self._conn.poll(timeout):
+                message = self._conn.recv()
+                if message["event"] == "started":
+                    self.pid = message["pid"]
+                elif message["event"] == "finished":
+                    self.returncode = message["returncode"]
+        except (EOFError, OSError):
+            # worker意外退出
+            self.returncode = -1
+            self._runner._discard_worker()
+        if self.returncode is not None:
+            self._runner._finish_run(self)
+        return self.returncode is not None
+    
+    def poll(self) -> Optional[int]:
+        self._receive(0)
+        return self.returncode
+    
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        import subprocess
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._receive(0.5 if deadline is None else max(0.0, min(0.5, deadline - time.monotonic()))):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired("pytest", timeout)
+        return self.returncode
+    
+    def kill(self):
+        if self.pid is not None and self.returncode is None:
+            try:
+                os.kill(self.pid, 9)
+            except OSError:
+                pass
+
+class WarmTestRunner:
+    """
+    常驻的pytest运行器
+    
+    start() 在后台启动并预热worker；popen(args, log_path) 提交一次运行，同一时间只能有一次运行。
+    """
+    
+    def __init__(self, rootdir: str, preload_args: Optional[List[str]] = None,
+                 watch_dirs: Sequence[str] = WATCH_DIRS, enabled: bool = True):
+        self.rootdir = rootdir
+        self.preload_args = list(preload_args or PRELOAD_ARGS)
+        self.watch_dirs = watch_dirs
+        # 关闭或不支持fork时每次运行启动子进程
+        self.enabled = enabled and hasattr(os, "fork")
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._ready: Optional[Dict] = None
+        self._signature: Optional[tuple] = None
+        self._active: Optional[WarmRun] = None
+        self.runs = 0
+        self.restarts = 0
+        self.last_error = ""
+    
+    def start(self):
+        """启动worker，预热在worker中进行，不阻塞调用方"""
+        with self._lock:
+            self._ensure_worker()
+    
+    def _ensure_worker(self):
+        if not self.enabled:
+            return
+        signature = code_signature(self.rootdir, self.watch_dirs)
+        if self._process is not None and self._process.is_alive() and signature == self._signature:
+            return
+        if self._process is not None:
+            self.restarts += 1
+            reason = "测试代码已修改" if self._process.is_alive() else "worker已退出"
+            print(f"[{datetime.now()}] 🔄 {reason}，重启常驻测试运行器")
+            self._stop_worker()
+        import multiprocessing
+        
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child_conn, self.rootdir, self.preload_args),
+                                        name="warm-pytest", daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._ready = None
+        self._signature = signature
+    
+    def _wait_ready(self) -> bool:
+        if self._ready is None:
+            try:
+                self._ready = self._conn.recv()
+            except (EOFError, OSError):
+                self._ready = {"event": "ready", "error": "worker在预热时退出"}
+            if "error" in self._ready:
+                self.last_error = self._ready["error"]
+                print(f"[{datetime.now()}] 常驻测试运行器预热失败: {self.last_error}，改为启动子进程")
+            else:
+                print(f"[{datetime.now()}] 🔥 常驻测试运行器已预热 ({self._ready['preload_seconds']}秒)")
+        return "error" not in self._ready
+    
+    def popen(self, args: List[str], log_path: str):
+        """
+        提交一次运行，args 为pytest参数（不含 python -m pytest）
+        
+        worker不可用时退回为启动子进程，返回 subprocess.Popen。
+        """
+        import subprocess
+        
+        with self._lock:
+            if self._active is not None:
+                raise RuntimeError("上一次运行尚未结束")
+            self._ensure_worker()
+            if not self.enabled or not self._wait_ready():
+                log = open(log_path, "w", encoding="utf-8")
+                try:
+                    return subprocess.Popen([sys.executable, "-m", "pytest", *args], stdout=log,
+                                            stderr=subprocess.STDOUT, cwd=self.rootdir)
+                finally:
+                    log.close()
+            # 截断日志文件，子进程以追加方式写入
+            open(log_path, "w", encoding="utf-8").close()
+            self._conn.send({"args": list(args), "log_path": log_path})
+            self._active = WarmRun(self, self._conn)
+            self.runs += 1
+            return self._active
+    
+    def _finish_run(self, run: WarmRun):
+        if self._active is run:
+            self._active = None
+    
+    def _discard_worker(self):
+        """worker意外退出，下一次运行时重新启动"""
+        self._active = None
+        self._signature = None
+    
+    def _stop_worker(self):
+        if self._conn is not None:
+            try:
+                self._conn.send(None)
+            except (OSError, ValueError):
+                pass
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+    
+    def stop(self):
+        with self._lock:
+            if self._active is not None:
+                self._active.kill()
+                self._active = None
+            self._stop_worker()
+    
+    def status(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "worker_pid": self._process.pid if self._process is not None else None,
+            "preload_seconds": (self._ready or {}).get("preload_seconds"),
+            "runs": self.runs,
+            "restarts": self.restarts,
+            "last_error": self.last_error
+        }